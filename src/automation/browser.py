@@ -1,11 +1,22 @@
-import subprocess
 import time
 import logging
 import os
-import platform
 from pathlib import Path
 from src.models.ui_element import UIElement
 from src.automation.recognition import find_element, wait_for_visual_change
+from src.automation.timing import get_timing, note_actions, wait_until
+from src.automation.input_ack import acknowledge
+from src.automation.input_backend import get_input_backend
+from src.automation.browser_session import BrowserSession
+from src.automation.browser_process import BrowserProcess, browser_running, get_chrome_path, kill_browser
+from src.automation.readiness import browser_window_check
+
+# Process group of the launched browser; closing only targets it so browsers
+# of parallel workers and unrelated Chrome windows keep running
+_process = None
+
+# Profile of the last launched browser
+_profile_dir = None
 
 def launch_browser(url, config=None):
     """
@@ -18,16 +29,18 @@ def launch_browser(url, config=None):
     Returns:
         True if browser launched successfully, False otherwise
     """
+    global _process, _profile_dir
     try:
         # Use configuration if provided, otherwise use defaults
         if config:
             chrome_path = config.get("chrome_path", "")
             profile_dir = config.get("browser_profile", "")
-            startup_wait = config.get("browser_launch_wait", 10)
+            startup_wait = config.get("browser_launch_wait")
         else:
             chrome_path = ""
-            profile_dir = os.path.join(os.path.expanduser("~"), "ClaudeProfile")
-            startup_wait = 10
+            # Relaunches keep the profile of the previous launch
+            profile_dir = _profile_dir or os.path.join(os.path.expanduser("~"), "ClaudeProfile")
+            startup_wait = None
         
         # Determine browser path based on platform if not in config
         if not chrome_path:
@@ -36,98 +49,45 @@ def launch_browser(url, config=None):
                 logging.error("Could not find Chrome browser")
                 return False
         
-        # Ensure profile directory exists
-        os.makedirs(profile_dir, exist_ok=True)
+        _profile_dir = profile_dir
         
         # Launch browser with the specified profile
         logging.info(f"Launching browser: {chrome_path}")
         logging.info(f"Using profile: {profile_dir}")
         logging.info(f"Navigating to: {url}")
         
-        cmd = [
-            chrome_path,
-            f"--user-data-dir={profile_dir}",
-            "--start-maximized",
-            "--disable-extensions",
-            url
-        ]
-        
-        process = subprocess.Popen(cmd)
+        _process = BrowserProcess(chrome_path, profile_dir).start(url)
         
-        # Check if process started successfully
-        if process.poll() is not None:
-            logging.error(f"Browser process exited with code {process.returncode}")
-            return False
-        
-        # Wait for browser to initialize
-        logging.info(f"Waiting {startup_wait} seconds for browser to initialize")
-        time.sleep(startup_wait)
-        
-        return True
+        # Wait for the browser window (browser_launch_wait overrides the timing profile)
+        logging.info("Waiting for browser to initialize")
+        return _process.wait_ready(browser_window_check(), timeout=startup_wait)
     
     except Exception as e:
         logging.error(f"Failed to launch browser: {e}")
         return False
 
-def get_chrome_path():
-    """
-    Get the default Chrome browser path based on the operating system.
-    
-    Returns:
-        Path to Chrome executable or None if not found
-    """
-    system = platform.system()
-    
-    if system == "Windows":
-        paths = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            os.path.join(os.environ.get("LOCALAPPDATA", ""), r"Google\Chrome\Application\chrome.exe")
-        ]
-    elif system == "Darwin":  # macOS
-        paths = [
-            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            os.path.expanduser("~/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
-        ]
-    else:  # Linux and others
-        paths = [
-            "/usr/bin/google-chrome",
-            "/usr/bin/chromium-browser",
-            "/usr/bin/chromium"
-        ]
-    
-    # Return the first path that exists
-    for path in paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
-
 def close_browser():
     """
-    Close all Chrome browser instances.
+    Close the launched Chrome instance.
+    
+    The launched process group is terminated and its exit awaited. Browsers
+    this process did not launch (or that were handed off to an already
+    running instance) are matched by the last used profile instead. Without
+    a known profile nothing is closed, so other browsers keep running.
     
     Returns:
         True if successful, False otherwise
     """
     try:
         logging.info("Attempting to close browser")
-        system = platform.system()
+        if _process is not None and not _process.handed_off:
+            return _process.terminate()
         
-        if system == "Windows":
-            subprocess.run(["taskkill", "/f", "/im", "chrome.exe"], 
-                          stdout=subprocess.DEVNULL, 
-                          stderr=subprocess.DEVNULL)
-        else:
-            subprocess.run(["pkill", "-f", "chrome"], 
-                          stdout=subprocess.DEVNULL, 
-                          stderr=subprocess.DEVNULL)
-        
-        # Allow time for browsers to close
-        time.sleep(2)
+        if not kill_browser(_profile_dir):
+            return True
         
-        # Verify browser is closed
-        is_closed = verify_browser_closed()
+        # Allow time for browsers to close, verifying as soon as the profile allows
+        is_closed = bool(wait_until("browser_close", verify_browser_closed))
         if is_closed:
             logging.info("Browser closed successfully")
         else:
@@ -146,30 +106,10 @@ def verify_browser_closed():
     Returns:
         True if browser is closed, False if still running
     """
-    try:
-        system = platform.system()
-        
-        if system == "Windows":
-            # Check for chrome.exe process on Windows
-            result = subprocess.run(
-                ["tasklist", "/FI", "IMAGENAME eq chrome.exe"], 
-                capture_output=True, 
-                text=True
-            )
-            return "chrome.exe" not in result.stdout
-        else:
-            # Check for chrome process on Unix systems
-            result = subprocess.run(
-                ["pgrep", "-f", "chrome"], 
-                capture_output=True, 
-                text=True
-            )
-            return result.stdout.strip() == ""
-    
-    except Exception as e:
-        logging.error(f"Error verifying browser closure: {e}")
-        # If verification fails, assume browser may still be running
-        return False
+    if _process is not None:
+        return not _process.is_running()
+    # Only the browser with our profile counts; without one none is ours
+    return not browser_running(_profile_dir)
 
 def check_browser_ready(ui_element, timeout=30):
     """
@@ -191,16 +131,90 @@ def check_browser_ready(ui_element, timeout=30):
             return True
         
         logging.debug("Browser not ready yet, waiting...")
-        time.sleep(1)
+        time.sleep(get_timing().poll_interval)
     
     logging.warning("Browser ready check timed out")
     return False
 
-def refresh_page():
+def refresh_page(ready_check=None, ack=False):
     """
     Refresh the current page.
+    
+    Args:
+        ready_check: Optional callable returning a truthy value once the page
+                     is usable; verifying timing profiles stop waiting then
+        ack: Wait for the page to visibly start reloading before the ready
+             check: True to watch the middle of the screen, or a region.
+             A verifying profile always waits for it before polling the
+             ready check, since the page still passes the check until the
+             reload starts
+    
+    Returns:
+        Result of the ready check (True without one), or None on timeout
     """
-    from pyautogui import hotkey
+    import pyautogui
     logging.info("Refreshing page")
-    hotkey('f5')
-    time.sleep(5)  # Wait for page to reload
\ No newline at end of file
+    verify = ready_check is not None and get_timing().verify
+    if ack or verify:
+        if not ack or ack is True:
+            width, height = pyautogui.size()
+            ack = (0, height // 4, width, height // 2)
+        reloaded = acknowledge(lambda: get_input_backend().key('f5') or True, ack, timeout=5.0, name="page refresh")
+        if reloaded:
+            logging.info(f"Page refresh acknowledged after {reloaded.latency:.2f}s")
+        elif verify:
+            # The old page may still be showing; only check it after the fixed wait
+            logging.warning("Page refresh not acknowledged, waiting the fixed page load time")
+            wait_until("page_load")
+            return ready_check()
+    else:
+        get_input_backend().key('f5')
+        note_actions()
+    return wait_until("page_load", ready_check)  # Wait for page to reload
+
+_browser_session = None
+
+def configure_browser_session(settings=None):
+    """
+    Get the browser session shared by the sessions of this process.
+    
+    The session is created on first use and kept, so a browser launched for
+    one session is reused by the next.
+    
+    Args:
+        settings: "browser_session" configuration dictionary (reuse)
+    
+    Returns:
+        The shared BrowserSession
+    """
+    global _browser_session
+    settings = settings or {}
+    if _browser_session is None:
+        _browser_session = BrowserSession(launch_browser, close_browser, lambda: not verify_browser_closed())
+    _browser_session.reuse = settings.get("reuse", True)
+    return _browser_session
+
+def attach_browser_session(url, settings=None, profile_dir=None):
+    """
+    Use a browser started outside this process (e.g. by the warm browser pool).
+    
+    Args:
+        url: URL the browser shows
+        settings: "browser_session" configuration dictionary
+        profile_dir: Profile the browser runs with
+    
+    Returns:
+        The shared BrowserSession
+    """
+    global _profile_dir
+    _profile_dir = profile_dir
+    session = configure_browser_session(settings)
+    session.attach(url, profile=profile_dir)
+    return session
+
+def close_browser_session():
+    """Close the shared browser session's browser if it is still open and was launched here."""
+    if _browser_session is not None and _browser_session.launched:
+        logging.info(_browser_session.report())
+        if _browser_session.owned:
+            _browser_session.close()
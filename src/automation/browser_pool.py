@@ -0,0 +1,190 @@
+import collections
+import logging
+import os
+import threading
+import time
+from src.automation.browser_process import BrowserProcess, get_chrome_path
+from src.automation.readiness import browser_window_check
+from src.utils.browser_profile import prepare_profile
+
+class BrowserSlot:
+    """A standby display with its profile copy and the browser running on it."""
+    
+    def __init__(self, index, display, profile_dir):
+        self.index = index
+        self.display = display
+        self.profile_dir = profile_dir
+        self.process = None
+        self.url = None
+        self.uses = 0
+        self.failures = 0
+    
+    def __repr__(self):
+        return f"BrowserSlot({self.index}, {self.display.name}, {self.url})"
+
+class WarmBrowserPool:
+    """
+    Keeps browsers pre-launched on standby displays.
+    
+    Every slot runs a browser on its own virtual display with its own copy
+    of the browser profile, already showing the URL of an upcoming session.
+    acquire() hands out a warm slot at once (preferring one that shows the
+    requested URL); release() returns it and, per the recycling policy,
+    either keeps the browser for another session or closes it and launches
+    a fresh one in the background.
+    """
+    
+    def __init__(self, displays, base_profile, profiles_dir="profiles", chrome_path=None, default_url="https://claude.ai",
+                 recycle_after=1, refresh_profile=False, max_failures=3):
+        """
+        Initialize the pool.
+        
+        Args:
+            displays: Started VirtualDisplay instances, one per slot
+            base_profile: Browser profile cloned for every slot
+            profiles_dir: Directory for the slot profile copies
+            chrome_path: Chrome executable (default: detected)
+            default_url: URL preloaded when no upcoming session is known
+            recycle_after: Sessions a browser serves before it is relaunched
+            refresh_profile: Clone the base profile again when recycling
+            max_failures: Consecutive failed launches before a slot is retired
+        """
+        self.base_profile = base_profile
+        self.chrome_path = chrome_path or get_chrome_path()
+        if not self.chrome_path:
+            raise RuntimeError("Could not find Chrome browser")
+        self.default_url = default_url
+        self.recycle_after = max(1, recycle_after)
+        self.refresh_profile = refresh_profile
+        self.max_failures = max_failures
+        self.slots = [BrowserSlot(index, display, os.path.abspath(os.path.join(profiles_dir, f"warm{index}")))
+                      for index, display in enumerate(displays, start=1)]
+        self._ready = []
+        self._upcoming = collections.deque()
+        self._condition = threading.Condition()
+        self._threads = []
+        self.closed = False
+    
+    def start(self, upcoming_urls=()):
+        """
+        Launch a browser in every slot.
+        
+        Args:
+            upcoming_urls: Session URLs in the order they will be requested
+        """
+        with self._condition:
+            self._upcoming.extend(upcoming_urls)
+        for slot in self.slots:
+            self._recycle(slot, refresh=False)
+    
+    def _next_url(self):
+        with self._condition:
+            return self._upcoming.popleft() if self._upcoming else self.default_url
+    
+    def _recycle(self, slot, refresh=None):
+        """Relaunch a slot's browser in the background."""
+        thread = threading.Thread(target=self._warm, args=(slot, self.refresh_profile if refresh is None else refresh),
+                                  name=f"warm-{slot.index}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+    
+    def _warm(self, slot, refresh):
+        """Close the slot's browser, launch a new one and mark the slot ready."""
+        if slot.process is not None:
+            slot.process.terminate()
+            slot.process = None
+        if self.closed:
+            return
+        
+        start_time = time.perf_counter()
+        process = None
+        try:
+            prepare_profile(self.base_profile, slot.profile_dir, refresh)
+            url = self._next_url()
+            process = BrowserProcess(self.chrome_path, slot.profile_dir, env=slot.display.env()).start(url)
+            if not process.wait_ready(browser_window_check(slot.display.name)) or not process.is_running():
+                raise RuntimeError("browser exited during startup")
+        except Exception as e:
+            if process is not None:
+                process.terminate()
+            slot.failures += 1
+            logging.error(f"Warm browser {slot.index} failed to start ({slot.failures}/{self.max_failures}): {e}")
+            if slot.failures < self.max_failures and not self.closed:
+                self._recycle(slot, refresh=True)
+            else:
+                with self._condition:
+                    self._condition.notify_all()
+            return
+        
+        slot.process = process
+        slot.url = url
+        slot.uses = 0
+        slot.failures = 0
+        logging.info(f"Warm browser {slot.index} ready on {slot.display.name} with {url} "
+                     f"in {time.perf_counter() - start_time:.1f}s")
+        with self._condition:
+            if self.closed:
+                process.terminate()
+                return
+            self._ready.append(slot)
+            self._condition.notify_all()
+    
+    def _available(self):
+        """Check whether any slot may still become ready."""
+        return any(slot.failures < self.max_failures for slot in self.slots)
+    
+    def acquire(self, url=None, timeout=None):
+        """
+        Take a warm browser.
+        
+        Args:
+            url: URL the session needs; a slot already showing it is preferred
+            timeout: Maximum seconds to wait for a slot (None waits indefinitely)
+        
+        Returns:
+            BrowserSlot, or None if none became ready in time
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._condition:
+            while not self._ready:
+                remaining = deadline - time.time() if deadline is not None else None
+                if self.closed or not self._available() or (remaining is not None and remaining <= 0):
+                    return None
+                self._condition.wait(remaining)
+            slot = next((slot for slot in self._ready if slot.url == url), self._ready[0])
+            self._ready.remove(slot)
+        logging.info(f"Using warm browser {slot.index} on {slot.display.name}")
+        return slot
+    
+    def release(self, slot, url=None, healthy=True):
+        """
+        Return a slot after a session.
+        
+        Args:
+            slot: Slot from acquire()
+            url: URL the browser shows now (the session's URL)
+            healthy: False after a failed session; the browser is then
+                     relaunched whatever the recycling policy
+        """
+        slot.uses += 1
+        slot.url = url or slot.url
+        running = slot.process is not None and slot.process.is_running()
+        if healthy and running and slot.uses < self.recycle_after:
+            with self._condition:
+                self._ready.append(slot)
+                self._condition.notify_all()
+            return
+        logging.info(f"Recycling warm browser {slot.index} after {slot.uses} sessions")
+        self._recycle(slot)
+    
+    def close(self):
+        """Close every browser of the pool."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=30)
+        for slot in self.slots:
+            if slot.process is not None:
+                slot.process.terminate()
+                slot.process = None
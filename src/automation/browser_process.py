@@ -0,0 +1,294 @@
+import logging
+import os
+import platform
+import re
+import signal
+import subprocess
+import time
+from src.automation.timing import wait_until
+
+WINDOWS = platform.system() == "Windows"
+
+def browser_pids(profile_dir):
+    """
+    Find the processes of the Chrome instance using a user data directory.
+    
+    Processes are matched on the --user-data-dir argument of their command
+    line (pgrep on POSIX, a Win32_Process query through PowerShell on
+    Windows), so Chrome instances with other profiles are never matched.
+    
+    Args:
+        profile_dir: User data directory of the instance
+    
+    Returns:
+        List of process ids (empty without a profile or if the query failed)
+    """
+    if not profile_dir:
+        return []
+    pattern = f"--user-data-dir={profile_dir}"
+    try:
+        if WINDOWS:
+            # -like treats [ ] * ? as wildcards, and ' ends the string
+            escaped = re.sub(r"([\[\]*?`])", r"`\1", pattern).replace("'", "''")
+            script = ("Get-CimInstance Win32_Process -Filter \"Name = 'chrome.exe'\" | "
+                      f"Where-Object {{ $_.CommandLine -like '*{escaped}*' }} | "
+                      "ForEach-Object { $_.ProcessId }")
+            command = ["powershell", "-NoProfile", "-NonInteractive", "-Command", script]
+        else:
+            command = ["pgrep", "-f", "--", pattern]
+        result = subprocess.run(command, capture_output=True, text=True, timeout=30)
+        return [int(pid) for pid in result.stdout.split() if pid.isdigit()]
+    except Exception as e:
+        logging.error(f"Error looking for the browser with profile {profile_dir}: {e}")
+        return []
+
+def browser_running(profile_dir):
+    """
+    Check whether a Chrome instance with a user data directory is running.
+    
+    Only needed for browsers this process did not launch; a BrowserProcess
+    knows its own state.
+    
+    Args:
+        profile_dir: User data directory of the instance (without one, no
+                     browser counts as running)
+    
+    Returns:
+        True if a matching browser process exists
+    """
+    return bool(browser_pids(profile_dir))
+
+def kill_browser(profile_dir):
+    """
+    Kill the Chrome instance using a user data directory.
+    
+    Args:
+        profile_dir: User data directory of the instance
+    
+    Returns:
+        True if a kill was attempted, False if no profile is known (nothing
+        is closed then, so other Chrome instances keep running)
+    """
+    if not profile_dir:
+        logging.info("No browser profile known, not closing any browser")
+        return False
+    if WINDOWS:
+        for pid in browser_pids(profile_dir):
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        subprocess.run(["pkill", "-f", "--", f"--user-data-dir={profile_dir}"],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return True
+
+def get_chrome_path():
+    """
+    Get the default Chrome browser path based on the operating system.
+    
+    Returns:
+        Path to Chrome executable or None if not found
+    """
+    system = platform.system()
+    
+    if system == "Windows":
+        paths = [
+            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+            os.path.join(os.environ.get("LOCALAPPDATA", ""), r"Google\Chrome\Application\chrome.exe")
+        ]
+    elif system == "Darwin":  # macOS
+        paths = [
+            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+            os.path.expanduser("~/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
+        ]
+    else:  # Linux and others
+        paths = [
+            "/usr/bin/google-chrome",
+            "/usr/bin/chromium-browser",
+            "/usr/bin/chromium"
+        ]
+    
+    # Return the first path that exists
+    for path in paths:
+        if os.path.exists(path):
+            return path
+    
+    return None
+
+class BrowserProcess:
+    """
+    A launched Chrome instance and the process group it runs in.
+    
+    The browser is started in a new process group (a new session on POSIX),
+    so its renderer, GPU and zygote processes can be signalled together and
+    nothing outside the group is touched. terminate() asks the group to exit,
+    waits on the process handle and only then kills it.
+    
+    If Chrome finds an instance already running with the same profile, it
+    hands the URL over and exits at once; the process is then marked as
+    handed_off and the browser is not owned by this object.
+    """
+    
+    def __init__(self, chrome_path, profile_dir, extra_args=None, env=None):
+        """
+        Initialize the browser process.
+        
+        Args:
+            chrome_path: Chrome executable
+            profile_dir: User data directory
+            extra_args: Additional Chrome command line arguments
+            env: Environment of the browser, e.g. with DISPLAY set (default: inherited)
+        """
+        self.chrome_path = chrome_path
+        self.profile_dir = profile_dir
+        self.extra_args = list(extra_args or ["--start-maximized", "--disable-extensions"])
+        self.env = env
+        self.process = None
+        self.handed_off = False
+        self.ready = False
+        self.start_time = None
+        self.launch_time = None
+        self.teardown_time = None
+    
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+    
+    def command(self, url):
+        """Get the Chrome command line for a URL."""
+        return [self.chrome_path, f"--user-data-dir={self.profile_dir}"] + self.extra_args + [url]
+    
+    def start(self, url):
+        """
+        Start the browser in its own process group.
+        
+        Args:
+            url: URL to open
+        
+        Returns:
+            self
+        """
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if WINDOWS:
+            options = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            options = {"start_new_session": True}
+        self.start_time = time.perf_counter()
+        self.ready = False
+        self.handed_off = False
+        self.process = subprocess.Popen(self.command(url), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                        env=self.env, **options)
+        logging.info(f"Started browser process {self.pid}")
+        return self
+    
+    def is_running(self):
+        """Check whether the browser is running (by handle, or by profile after a hand-off)."""
+        if self.process is None:
+            return False
+        if self.handed_off:
+            return browser_running(self.profile_dir)
+        return self.process.poll() is None
+    
+    def wait_ready(self, check=None, timeout=None):
+        """
+        Wait until the browser is ready for input.
+        
+        Uses the "browser_start" timing wait. A readiness check (e.g. the
+        browser window or the prompt box being found) lets verifying timing
+        profiles stop early; the wait also ends as soon as the process exits.
+        
+        Args:
+            check: Optional callable returning a truthy value once the browser is usable
+            timeout: Optional override of the wait duration
+        
+        Returns:
+            True if the browser is running; ready tells whether the check
+            also passed (a failed check only logs a warning)
+        """
+        state = {}
+        
+        def ready():
+            if self.process.poll() is not None:
+                state["exited"] = True
+                return True
+            if check is None:
+                return True
+            state["result"] = check()
+            return state["result"]
+        
+        # Without a check the fixed wait applies; polling only the process would end it at once
+        wait_until("browser_start", ready if check is not None else None, timeout=timeout)
+        if check is None:
+            ready()
+        
+        if state.get("exited"):
+            if self.process.returncode == 0 and browser_running(self.profile_dir):
+                logging.warning(f"Browser handed off to an instance already running with {self.profile_dir}")
+                self.handed_off = True
+            else:
+                logging.error(f"Browser process exited with code {self.process.returncode}")
+                return False
+        self.launch_time = time.perf_counter() - self.start_time
+        if check is not None and not state.get("exited") and not state.get("result"):
+            logging.warning(f"Browser running but not ready after {self.launch_time:.1f}s")
+            return True
+        
+        self.ready = True
+        logging.info(f"Browser ready after {self.launch_time:.1f}s")
+        return True
+    
+    def _signal_group(self, force):
+        """Send the terminate (or kill) signal to the browser's process group."""
+        if WINDOWS:
+            command = ["taskkill", "/T", "/PID", str(self.pid)] + (["/F"] if force else [])
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return
+        try:
+            # start_new_session makes the browser the group leader, so the group id is its pid
+            os.killpg(self.pid, signal.SIGKILL if force else signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    
+    def terminate(self, timeout=5.0):
+        """
+        Close the browser: terminate the process group, wait, then kill it.
+        
+        Args:
+            timeout: Seconds to wait for a graceful exit before killing
+        
+        Returns:
+            True if the browser process has exited
+        """
+        if self.process is None:
+            return True
+        if self.handed_off:
+            logging.warning("Browser was handed off to another instance and is not owned by this process")
+            return False
+        
+        start_time = time.perf_counter()
+        forced = False
+        if self.process.poll() is None:
+            self._signal_group(force=False)
+            try:
+                self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                logging.warning(f"Browser did not exit within {timeout:.1f}s, killing it")
+                forced = True
+                self._signal_group(force=True)
+                try:
+                    self.process.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    logging.error(f"Browser process {self.pid} did not exit")
+                    return False
+        if not WINDOWS:
+            # The main process is gone; kill helpers still left in its group
+            self._signal_group(force=True)
+        
+        self.teardown_time = time.perf_counter() - start_time
+        self.ready = False
+        logging.info(f"Browser closed in {self.teardown_time:.2f}s ({'forced' if forced else 'graceful'})")
+        return True
+    
+    def timings(self):
+        """Get the launch and teardown durations in seconds (None if not measured)."""
+        return {"launch": self.launch_time, "teardown": self.teardown_time}
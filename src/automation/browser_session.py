@@ -0,0 +1,181 @@
+import logging
+import platform
+import time
+import pyautogui
+from src.automation.timing import get_timing, note_actions, wait_until
+from src.automation.input_backend import get_input_backend
+from src.automation.input_ack import acknowledge
+
+class BrowserSession:
+    """
+    Keeps one browser alive across automation sessions.
+    
+    open() launches the browser for the first session. Later sessions
+    navigate the running browser to their URL through the address bar
+    instead of closing and relaunching it; the browser is relaunched only
+    if it is no longer running (a crash) or the session uses a different
+    profile. end_session() closes the browser only when reuse is disabled,
+    which restores the old launch-per-session behavior.
+    
+    attach() adopts a browser started by someone else (a warm browser pool);
+    such a browser is navigated and checked like a launched one but never
+    closed here: close() only detaches from it, leaving it to its owner.
+    """
+    
+    def __init__(self, launch, close, is_running, reuse=True):
+        """
+        Initialize the browser session.
+        
+        Args:
+            launch: Callable (url, *launch_args) starting the browser, returning True on success
+            close: Callable closing the browser, returning True on success
+            is_running: Callable returning True while the launched browser runs
+            reuse: Keep the browser open between sessions
+        """
+        self.launch = launch
+        self.close_browser = close
+        self.is_running = is_running
+        self.reuse = reuse
+        self.launched = False
+        self.owned = True
+        self.profile = None
+        self.url = None
+        self.reused = False
+        self.preloaded = False
+        self.stats = {"launches": 0, "reuses": 0, "crashes": 0}
+        self.modifier = "command" if platform.system() == "Darwin" else "ctrl"
+    
+    def open(self, url, *launch_args, profile=None, ready_check=None):
+        """
+        Show a URL in the browser, launching it if needed.
+        
+        Args:
+            url: URL to open
+            *launch_args: Extra arguments for the launch callable
+            profile: Browser profile of the session; a running browser with a
+                     different profile is replaced
+            ready_check: Optional callable returning a truthy value once the
+                         page is usable after navigating in place
+        
+        Returns:
+            True if the browser shows the URL, False if launching failed
+        """
+        start_time = time.perf_counter()
+        self.reused = False
+        
+        if self.reuse and self.launched:
+            if profile != self.profile:
+                logging.info(f"Session uses profile {profile}, replacing the browser")
+                self.close()
+            elif not self.is_running():
+                logging.warning("Browser is no longer running, relaunching it")
+                self.stats["crashes"] += 1
+                self.close()
+            else:
+                if self.preloaded and url == self.url:
+                    # An attached browser loaded the URL itself and was not used yet
+                    wait_until("navigate", ready_check)
+                else:
+                    self.navigate(url, ready_check)
+                self.preloaded = False
+                self.reused = True
+                self.stats["reuses"] += 1
+                logging.info(f"Reused browser for {url} in {time.perf_counter() - start_time:.1f}s")
+                return True
+        
+        self.launched = bool(self.launch(url, *launch_args))
+        self.owned = True
+        self.profile = profile
+        self.url = url
+        if self.launched:
+            self.stats["launches"] += 1
+            logging.info(f"Launched browser for {url} in {time.perf_counter() - start_time:.1f}s")
+        return self.launched
+    
+    def navigate(self, url, ready_check=None):
+        """
+        Navigate the running browser to a URL through the address bar.
+        
+        Under a verifying timing profile the ready check is only polled once
+        the screen changed, since the previous page still passes it until the
+        navigation commits.
+        
+        Returns:
+            Result of the ready check (True without one), or None on timeout
+        """
+        logging.info(f"Navigating to: {url}")
+        self.url = url
+        backend = get_input_backend()
+        
+        def send():
+            with backend.batch():
+                backend.hotkey(self.modifier, "l")
+                backend.write(url)
+                backend.key("enter")
+            return True
+        
+        if ready_check is None or not get_timing().verify:
+            send()
+            note_actions(3)
+            return wait_until("navigate", ready_check)
+        
+        width, height = pyautogui.size()
+        navigated = acknowledge(send, (0, height // 4, width, height // 2), timeout=5.0, name="navigation")
+        if not navigated:
+            logging.warning("Navigation not acknowledged, waiting the fixed navigate time")
+            wait_until("navigate")
+            return ready_check()
+        logging.info(f"Navigation acknowledged after {navigated.latency:.2f}s")
+        return wait_until("navigate", ready_check)
+    
+    def attach(self, url, profile=None):
+        """
+        Adopt a running browser that already shows a URL.
+        
+        Args:
+            url: URL the browser shows
+            profile: Browser profile it runs with
+        """
+        self.launched = True
+        self.owned = False
+        self.preloaded = True
+        self.profile = profile
+        self.url = url
+        logging.info(f"Attached to running browser showing {url}")
+    
+    def end_session(self, success=True):
+        """
+        Finish a session: close the browser unless the next session reuses it.
+        
+        A failed session always closes a launched browser; an attached browser
+        is left running either way.
+        
+        Args:
+            success: Whether the session succeeded
+        """
+        if self.owned and (not success or not self.reuse):
+            self.close()
+    
+    def close(self):
+        """
+        Close the browser, or only detach from an attached one.
+        
+        Returns:
+            Result of the close callable (True after detaching)
+        """
+        if self.owned:
+            closed = self.close_browser()
+        else:
+            logging.info("Detaching from the attached browser, leaving it running")
+            closed = True
+        self.launched = False
+        self.owned = True
+        self.preloaded = False
+        self.profile = None
+        self.url = None
+        return closed
+    
+    def report(self):
+        """Format the launch and reuse counts."""
+        return (f"Browser launches: {self.stats['launches']}, reused: {self.stats['reuses']}, "
+                f"relaunched after exit: {self.stats['crashes']}")
@@ -0,0 +1,186 @@
+import logging
+import time
+import numpy as np
+import pyautogui
+
+# Optional: mss grabs small regions much faster than pyautogui on Linux
+try:
+    import mss
+except ImportError:
+    mss = None
+
+_mss = None
+
+def grab(region):
+    """
+    Capture a screen region as a grayscale numpy array.
+    
+    Args:
+        region: Tuple (x, y, width, height)
+    
+    Returns:
+        Grayscale image as a uint8 numpy array
+    """
+    global _mss
+    x, y, width, height = region
+    if mss is not None:
+        if _mss is None:
+            _mss = mss.mss()
+        shot = np.asarray(_mss.grab({"left": x, "top": y, "width": width, "height": height}))
+        rgb = shot[:, :, 2::-1]
+    else:
+        rgb = np.asarray(pyautogui.screenshot(region=region))
+    return rgb.mean(axis=2).astype(np.uint8)
+
+def ack_region(target, radius=40):
+    """
+    Get the screen region watched for the response to an action.
+    
+    Args:
+        target: (x, y) point, (x, y, width, height) region or a UIElement
+                (its click coordinates, last match or region)
+        radius: Half size of the square around a point
+    
+    Returns:
+        Region tuple clipped to the screen, or None if it cannot be determined
+    """
+    if hasattr(target, "click_coordinates"):
+        target = target.click_coordinates or target.last_match_location or target.region
+    if not target:
+        return None
+    
+    screen_width, screen_height = pyautogui.size()
+    if len(target) >= 4:
+        x, y, width, height = (int(v) for v in target[:4])
+    else:
+        x, y = int(target[0]) - radius, int(target[1]) - radius
+        width = height = 2 * radius
+    
+    x, y = max(0, x), max(0, y)
+    width, height = min(width, screen_width - x), min(height, screen_height - y)
+    if width <= 0 or height <= 0:
+        return None
+    return (x, y, width, height)
+
+class Acknowledgement:
+    """
+    Outcome of waiting for the UI to respond to an input action.
+    
+    Truthy when the watched region changed. latency is the time in seconds
+    from issuing the action to the first frame that differed, or None if
+    nothing changed before the timeout.
+    """
+    
+    def __init__(self, changed, latency, elapsed, checks, changed_ratio=0.0):
+        self.changed = changed
+        self.latency = latency
+        self.elapsed = elapsed
+        self.checks = checks
+        self.changed_ratio = changed_ratio
+    
+    def __bool__(self):
+        return self.changed
+    
+    def __repr__(self):
+        if self.changed:
+            return f"Acknowledgement(changed, latency={self.latency * 1000:.0f}ms, checks={self.checks})"
+        return f"Acknowledgement(no change after {self.elapsed:.2f}s, checks={self.checks})"
+
+class InputAck:
+    """
+    Watches a small screen region for the response to an input action.
+    
+    The region is captured when the watcher is created, so create it right
+    before acting, call mark() when the action is issued and then wait()
+    until the region differs from the snapshot (a caret appears, the prompt
+    box clears, the page reflows). Pixels count as changed when their gray
+    value moved by more than pixel_delta, and the region as changed when
+    more than min_changed of its pixels did.
+    """
+    
+    def __init__(self, region, pixel_delta=16, min_changed=0.002):
+        """
+        Snapshot the region.
+        
+        Args:
+            region: Screen region (x, y, width, height) to watch
+            pixel_delta: Gray level difference for a pixel to count as changed
+            min_changed: Fraction of changed pixels for the region to count as changed
+        """
+        self.region = region
+        self.pixel_delta = pixel_delta
+        self.min_changed = min_changed
+        self.before = grab(region)
+        self.start_time = time.perf_counter()
+    
+    def mark(self):
+        """Record the moment the action was issued (the latency reference)."""
+        self.start_time = time.perf_counter()
+    
+    def changed_ratio(self, frame):
+        """Get the fraction of pixels that differ from the snapshot."""
+        if frame.shape != self.before.shape:
+            return 1.0
+        diff = np.abs(frame.astype(np.int16) - self.before.astype(np.int16))
+        return np.count_nonzero(diff > self.pixel_delta) / diff.size
+    
+    def wait(self, timeout=2.0, poll_interval=0.02):
+        """
+        Wait until the region changes.
+        
+        Args:
+            timeout: Maximum time to wait in seconds after the action
+            poll_interval: Time between captures in seconds
+        
+        Returns:
+            Acknowledgement
+        """
+        checks = 0
+        ratio = 0.0
+        while True:
+            frame = grab(self.region)
+            now = time.perf_counter()
+            checks += 1
+            ratio = self.changed_ratio(frame)
+            if ratio > self.min_changed:
+                return Acknowledgement(True, now - self.start_time, now - self.start_time, checks, ratio)
+            if now - self.start_time >= timeout:
+                return Acknowledgement(False, None, now - self.start_time, checks, ratio)
+            time.sleep(poll_interval)
+
+def acknowledge(action, region, timeout=2.0, name="action", **ack_options):
+    """
+    Run an input action and wait for the UI to respond to it.
+    
+    pyautogui's fixed pause is disabled during the action, since waiting
+    for the response replaces it.
+    
+    Args:
+        action: Callable performing the input; a falsy result counts as failure
+        region: Screen region to watch (see ack_region)
+        timeout: Maximum time to wait for a change in seconds
+        name: Action description for logging
+        **ack_options: pixel_delta and min_changed passed to InputAck
+    
+    Returns:
+        Acknowledgement (falsy if the action failed or nothing changed)
+    """
+    watcher = InputAck(region, **ack_options)
+    previous_pause = pyautogui.PAUSE
+    pyautogui.PAUSE = 0
+    try:
+        watcher.mark()
+        result = action()
+    finally:
+        pyautogui.PAUSE = previous_pause
+    
+    if not result:
+        return Acknowledgement(False, None, time.perf_counter() - watcher.start_time, 0)
+    
+    ack = watcher.wait(timeout)
+    if ack:
+        logging.debug(f"{name} acknowledged after {ack.latency * 1000:.0f}ms "
+                      f"({ack.changed_ratio:.1%} of region changed)")
+    else:
+        logging.debug(f"No visible response to {name} within {timeout:.1f}s")
+    return ack
@@ -0,0 +1,382 @@
+import logging
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+import pyautogui
+
+# Optional: python-xlib (installed with pyautogui on Linux) for XTest events
+try:
+    from Xlib import X, XK, display as xdisplay
+    from Xlib.ext import xtest
+except ImportError:
+    xdisplay = None
+
+BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+# pyautogui key names that differ from X keysym names
+X_KEYS = {
+    "enter": "Return", "return": "Return", "esc": "Escape", "escape": "Escape",
+    "delete": "Delete", "del": "Delete", "backspace": "BackSpace", "tab": "Tab",
+    "space": "space", "end": "End", "home": "Home", "pageup": "Prior", "pgup": "Prior",
+    "pagedown": "Next", "pgdn": "Next", "up": "Up", "down": "Down", "left": "Left",
+    "right": "Right", "insert": "Insert", "ctrl": "Control_L", "ctrlleft": "Control_L",
+    "ctrlright": "Control_R", "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+    "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R", "win": "Super_L",
+    "winleft": "Super_L", "command": "Super_L"
+}
+
+def x_keysym_name(key):
+    """Get the X keysym name of a pyautogui key name."""
+    if key in X_KEYS:
+        return X_KEYS[key]
+    if len(key) > 1 and key[0] == "f" and key[1:].isdigit():
+        return key.upper()
+    return key
+
+def ease_out_path(start, end, duration, rate=60):
+    """
+    Get the intermediate points of an ease-out mouse movement.
+    
+    Args:
+        start: (x, y) start position
+        end: (x, y) end position
+        duration: Movement duration in seconds
+        rate: Points per second
+    
+    Returns:
+        List of (x, y) points ending at end, and the delay between points in seconds
+    """
+    steps = max(1, int(duration * rate))
+    points = []
+    for step in range(1, steps + 1):
+        t = step / steps
+        progress = -t * (t - 2)  # easeOutQuad, as pyautogui's humanized movement
+        points.append((round(start[0] + (end[0] - start[0]) * progress),
+                       round(start[1] + (end[1] - start[1]) * progress)))
+    return points, duration / steps
+
+class InputBackend:
+    """
+    Sends mouse and keyboard events.
+    
+    Backends queue events while a batch() block is open and send them in a
+    single call when it closes; outside a batch every method sends its
+    events immediately. After each send the backend pauses for
+    pyautogui.PAUSE, so the timing profile and the acknowledgement
+    primitive control the delay for every backend.
+    """
+    
+    name = "base"
+    
+    def __init__(self):
+        self._batch_depth = 0
+    
+    @contextmanager
+    def batch(self):
+        """Queue the events of the block and send them together."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+    
+    def _sent(self):
+        """Send queued events unless a batch is open."""
+        if self._batch_depth == 0:
+            self.flush()
+    
+    def flush(self):
+        """Send queued events and apply the action pause."""
+        if self._send() and pyautogui.PAUSE:
+            time.sleep(pyautogui.PAUSE)
+    
+    def _send(self):
+        """Send queued events. Returns True if anything was sent."""
+        return False
+    
+    def position(self):
+        """Get the mouse position."""
+        return tuple(pyautogui.position())
+    
+    def move(self, x, y, duration=0.0):
+        raise NotImplementedError
+    
+    def click(self, x=None, y=None, button="left", clicks=1):
+        raise NotImplementedError
+    
+    def key(self, key):
+        raise NotImplementedError
+    
+    def hotkey(self, *keys):
+        raise NotImplementedError
+    
+    def write(self, text):
+        raise NotImplementedError
+    
+    def scroll(self, clicks):
+        raise NotImplementedError
+
+class PyAutoGUIBackend(InputBackend):
+    """Default backend: every event goes through pyautogui as before."""
+    
+    name = "pyautogui"
+    
+    def move(self, x, y, duration=0.0):
+        pyautogui.moveTo(x, y, duration=duration, tween=pyautogui.easeOutQuad)
+    
+    def click(self, x=None, y=None, button="left", clicks=1):
+        pyautogui.click(x, y, clicks=clicks, button=button)
+    
+    def key(self, key):
+        pyautogui.press(key)
+    
+    def hotkey(self, *keys):
+        pyautogui.hotkey(*keys)
+    
+    def write(self, text):
+        pyautogui.write(text)
+    
+    def scroll(self, clicks):
+        pyautogui.scroll(clicks)
+
+class XdotoolBackend(InputBackend):
+    """
+    Linux backend that chains events into xdotool command lines.
+    
+    A batch becomes one xdotool process, e.g.
+    "xdotool mousemove 10 20 click 1 key ctrl+a type --delay 0 text".
+    xdotool's type command takes all remaining arguments as text, so the
+    chain is sent after every type and a batch continues in a new process.
+    """
+    
+    name = "xdotool"
+    
+    def __init__(self, type_delay=0):
+        """
+        Initialize the xdotool backend.
+        
+        Args:
+            type_delay: Delay between typed characters in milliseconds
+        """
+        super().__init__()
+        self.path = shutil.which("xdotool")
+        if self.path is None:
+            raise RuntimeError("xdotool is not installed")
+        self.type_delay = type_delay
+        self._commands = []
+    
+    def _send(self):
+        if not self._commands:
+            return False
+        commands, self._commands = self._commands, []
+        subprocess.run([self.path] + commands, check=True, timeout=30)
+        return True
+    
+    def position(self):
+        output = subprocess.run([self.path, "getmouselocation", "--shell"], capture_output=True,
+                                text=True, check=True, timeout=5).stdout
+        values = dict(line.split("=", 1) for line in output.split() if "=" in line)
+        return int(values["X"]), int(values["Y"])
+    
+    def move(self, x, y, duration=0.0):
+        if duration > 0:
+            points, delay = ease_out_path(self.position(), (x, y), duration)
+            for px, py in points[:-1]:
+                self._commands += ["mousemove", str(px), str(py), "sleep", f"{delay:.3f}"]
+        self._commands += ["mousemove", str(int(x)), str(int(y))]
+        self._sent()
+    
+    def click(self, x=None, y=None, button="left", clicks=1):
+        if x is not None and y is not None:
+            self._commands += ["mousemove", str(int(x)), str(int(y))]
+        self._commands += ["click", "--repeat", str(clicks), str(BUTTONS[button])]
+        self._sent()
+    
+    def key(self, key):
+        self._commands += ["key", x_keysym_name(key)]
+        self._sent()
+    
+    def hotkey(self, *keys):
+        self._commands += ["key", "+".join(x_keysym_name(key) for key in keys)]
+        self._sent()
+    
+    def write(self, text):
+        self._commands += ["type", "--delay", str(self.type_delay), "--", text]
+        if self._batch_depth:
+            self._send()
+        else:
+            self.flush()
+    
+    def scroll(self, clicks):
+        # Button 4 scrolls up and 5 down, one wheel click per press
+        button = "4" if clicks > 0 else "5"
+        self._commands += ["click", "--repeat", str(abs(clicks)), button]
+        self._sent()
+
+class XTestBackend(InputBackend):
+    """
+    Linux backend that sends events with the XTest extension over one
+    persistent X connection.
+    
+    Events are queued in the Xlib output buffer and a batch is sent with a
+    single flush. Mouse movement steps carry their delay as the XTest event
+    time, so the X server replays a humanized movement without Python
+    sleeping between steps.
+    """
+    
+    name = "xtest"
+    
+    def __init__(self, display_name=None):
+        """
+        Open the X connection.
+        
+        Args:
+            display_name: X display (default: $DISPLAY)
+        """
+        super().__init__()
+        if xdisplay is None:
+            raise RuntimeError("python-xlib is not installed")
+        self.display = xdisplay.Display(display_name)
+        if not self.display.has_extension("XTEST"):
+            raise RuntimeError("The X server does not support the XTEST extension")
+        self._pending = False
+    
+    def _send(self):
+        if not self._pending:
+            return False
+        self.display.sync()
+        self._pending = False
+        return True
+    
+    def _fake(self, event_type, detail=0, x=0, y=0, delay_ms=0):
+        xtest.fake_input(self.display, event_type, detail, time=delay_ms, x=x, y=y)
+        self._pending = True
+    
+    def position(self):
+        pointer = self.display.screen().root.query_pointer()
+        return pointer.root_x, pointer.root_y
+    
+    def move(self, x, y, duration=0.0):
+        if duration > 0:
+            points, delay = ease_out_path(self.position(), (x, y), duration)
+            for px, py in points:
+                self._fake(X.MotionNotify, x=px, y=py, delay_ms=int(delay * 1000))
+        else:
+            self._fake(X.MotionNotify, x=int(x), y=int(y))
+        self._sent()
+    
+    def click(self, x=None, y=None, button="left", clicks=1):
+        if x is not None and y is not None:
+            self._fake(X.MotionNotify, x=int(x), y=int(y))
+        for _ in range(clicks):
+            self._fake(X.ButtonPress, BUTTONS[button])
+            self._fake(X.ButtonRelease, BUTTONS[button])
+        self._sent()
+    
+    def _keycode(self, keysym):
+        """Get the keycode of a keysym and whether Shift selects it."""
+        keycode = self.display.keysym_to_keycode(keysym)
+        if not keycode:
+            return None, False
+        return keycode, self.display.keycode_to_keysym(keycode, 0) != keysym
+    
+    def _press_keysyms(self, keysyms):
+        """Press keysyms in order and release them in reverse order."""
+        keycodes = []
+        for keysym in keysyms:
+            keycode, _ = self._keycode(keysym)
+            if keycode is None:
+                raise ValueError(f"No keycode for keysym {keysym:#x}")
+            keycodes.append(keycode)
+        for keycode in keycodes:
+            self._fake(X.KeyPress, keycode)
+        for keycode in reversed(keycodes):
+            self._fake(X.KeyRelease, keycode)
+    
+    def key(self, key):
+        self._press_keysyms([XK.string_to_keysym(x_keysym_name(key))])
+        self._sent()
+    
+    def hotkey(self, *keys):
+        self._press_keysyms([XK.string_to_keysym(x_keysym_name(key)) for key in keys])
+        self._sent()
+    
+    def write(self, text):
+        shift = self.display.keysym_to_keycode(XK.string_to_keysym("Shift_L"))
+        for char in text:
+            # Latin-1 keysyms equal their code points; others are offset by 0x01000000
+            keysym = ord(char) if ord(char) < 0x100 else 0x01000000 + ord(char)
+            keycode, shifted = self._keycode(keysym)
+            if keycode is None:
+                # Characters without a key in the current layout go through pyautogui
+                self._send()
+                pyautogui.write(char)
+                continue
+            if shifted:
+                self._fake(X.KeyPress, shift)
+            self._fake(X.KeyPress, keycode)
+            self._fake(X.KeyRelease, keycode)
+            if shifted:
+                self._fake(X.KeyRelease, shift)
+        self._sent()
+    
+    def scroll(self, clicks):
+        button = 4 if clicks > 0 else 5
+        for _ in range(abs(clicks)):
+            self._fake(X.ButtonPress, button)
+            self._fake(X.ButtonRelease, button)
+        self._sent()
+
+BACKENDS = {
+    "pyautogui": PyAutoGUIBackend,
+    "xdotool": XdotoolBackend,
+    "xtest": XTestBackend
+}
+
+_backend = PyAutoGUIBackend()
+
+def create_input_backend(name="pyautogui", **options):
+    """
+    Create an input backend, falling back to pyautogui if it is unavailable.
+    
+    Args:
+        name: Backend name ("pyautogui", "xdotool" or "xtest")
+        **options: Backend constructor options
+    
+    Returns:
+        InputBackend instance
+    """
+    if name not in BACKENDS:
+        logging.warning(f"Unknown input backend '{name}', using pyautogui")
+        return PyAutoGUIBackend()
+    try:
+        return BACKENDS[name](**options)
+    except Exception as e:
+        logging.warning(f"Input backend '{name}' unavailable ({e}), using pyautogui")
+        return PyAutoGUIBackend()
+
+def configure_input_backend(settings=None):
+    """
+    Select the input backend used by the interaction functions.
+    
+    Args:
+        settings: "input_backend" configuration dictionary with a name and
+                  optional backend options (type_delay for xdotool,
+                  display_name for xtest)
+    
+    Returns:
+        The active InputBackend
+    """
+    global _backend
+    settings = dict(settings or {})
+    name = settings.pop("name", "pyautogui")
+    _backend = create_input_backend(name, **settings)
+    logging.info(f"Using {_backend.name} input backend")
+    return _backend
+
+def get_input_backend():
+    """Get the active input backend."""
+    return _backend
@@ -0,0 +1,280 @@
+import logging
+import platform
+import random
+import shutil
+import subprocess
+import time
+import pyautogui
+from src.automation.timing import note_actions
+from src.automation.input_backend import get_input_backend
+
+# Optional: pyperclip handles the clipboard on every platform when installed
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+class InputStrategy:
+    """
+    Base class for the ways of entering prompt text into the focused field.
+    
+    Subclasses implement _type. type_text times the input and logs the
+    typing time and rate per call.
+    """
+    
+    name = "base"
+    
+    def type_text(self, text):
+        """
+        Enter text into the focused input field.
+        
+        Args:
+            text: Text to enter
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        start_time = time.perf_counter()
+        success = self._type(text)
+        elapsed = time.perf_counter() - start_time
+        rate = len(text) / elapsed if elapsed > 0 else 0
+        logging.info(f"Typed {len(text)} characters in {elapsed:.2f}s using {self.name} input "
+                     f"({rate:.0f} chars/s){'' if success else ' - FAILED'}")
+        return success
+    
+    def _type(self, text):
+        raise NotImplementedError
+
+def write_lines(text):
+    """
+    Type text with the input backend, entering line breaks as Shift+Enter.
+    
+    A plain Enter would submit the prompt in the middle of the text. The
+    text is sent as one batch.
+    
+    Args:
+        text: Text to type
+    """
+    backend = get_input_backend()
+    with backend.batch():
+        for i, line in enumerate(text.split("\n")):
+            if i:
+                backend.hotkey("shift", "enter")
+            if line:
+                backend.write(line)
+
+class BulkInput(InputStrategy):
+    """Types text in chunks without per-character delays."""
+    
+    name = "bulk"
+    
+    def __init__(self, chunk_size=64, chunk_pause=0.02):
+        """
+        Initialize bulk input.
+        
+        Args:
+            chunk_size: Characters written per input backend batch
+            chunk_pause: Pause between chunks in seconds (lets the page keep up)
+        """
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_pause = chunk_pause
+    
+    def _type(self, text):
+        # The action pause would otherwise add its delay after every chunk
+        previous_pause = pyautogui.PAUSE
+        pyautogui.PAUSE = 0
+        try:
+            for start in range(0, len(text), self.chunk_size):
+                write_lines(text[start:start + self.chunk_size])
+                if self.chunk_pause:
+                    time.sleep(self.chunk_pause)
+            return True
+        finally:
+            pyautogui.PAUSE = previous_pause
+
+class HumanizedInput(InputStrategy):
+    """Types character by character with random delays and occasional pauses."""
+    
+    name = "humanized"
+    
+    def __init__(self, min_delay=0.02, max_delay=0.1, pause_chance=0.05, pause_range=(0.2, 0.5)):
+        """
+        Initialize humanized input.
+        
+        Args:
+            min_delay: Minimum delay after each character in seconds
+            max_delay: Maximum delay after each character in seconds
+            pause_chance: Probability of a longer pause after a character
+            pause_range: (min, max) length of the longer pauses in seconds
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.pause_chance = pause_chance
+        self.pause_range = tuple(pause_range)
+    
+    def _type(self, text):
+        note_actions(len(text))
+        backend = get_input_backend()
+        for char in text:
+            if char == "\n":
+                backend.hotkey("shift", "enter")
+            else:
+                backend.write(char)
+            
+            time.sleep(random.uniform(self.min_delay, self.max_delay))
+            
+            # Occasionally add a slightly longer pause (simulating thinking)
+            if random.random() < self.pause_chance:
+                time.sleep(random.uniform(*self.pause_range))
+        return True
+
+class ClipboardInput(InputStrategy):
+    """
+    Pastes text through the local clipboard.
+    
+    The clipboard is set and read back before pasting with Ctrl+V (Cmd+V on
+    macOS). With verify enabled the field is then selected and copied to
+    check that the pasted text arrived. If the clipboard is unavailable or
+    verification fails, the text is typed with the fallback strategy.
+    """
+    
+    name = "clipboard"
+    
+    def __init__(self, verify=True, settle_time=0.2, fallback=None):
+        """
+        Initialize clipboard input.
+        
+        Args:
+            verify: Copy the field content back after pasting and compare it
+            settle_time: Seconds to wait after pasting before verifying
+            fallback: InputStrategy used when pasting fails (default: BulkInput)
+        """
+        self.verify = verify
+        self.settle_time = settle_time
+        self.fallback = fallback or BulkInput()
+        self.modifier = "command" if platform.system() == "Darwin" else "ctrl"
+    
+    def _type(self, text):
+        if not set_clipboard(text) or not same_text(get_clipboard(), text):
+            logging.warning("Could not set the clipboard, typing the text instead")
+            return self.fallback._type(text)
+        
+        backend = get_input_backend()
+        backend.hotkey(self.modifier, "v")
+        note_actions(1 if not self.verify else 4)
+        if not self.verify:
+            return True
+        
+        time.sleep(self.settle_time)
+        with backend.batch():
+            backend.hotkey(self.modifier, "a")
+            backend.hotkey(self.modifier, "c")
+        time.sleep(0.05)
+        pasted = get_clipboard()
+        # Leave the cursor at the end of the text rather than on the selection
+        backend.key("end")
+        
+        if same_text(pasted, text):
+            return True
+        
+        logging.warning("Pasted text did not match the prompt, typing it instead")
+        with backend.batch():
+            backend.hotkey(self.modifier, "a")
+            backend.key("delete")
+        return self.fallback._type(text)
+
+def same_text(actual, expected):
+    """Compare clipboard text ignoring line ending and trailing whitespace differences."""
+    if actual is None:
+        return False
+    normalize = lambda value: value.replace("\r\n", "\n").strip()
+    return normalize(actual) == normalize(expected)
+
+def _clipboard_commands():
+    """Get the (copy, paste) commands of the platform's clipboard tool, if any."""
+    system = platform.system()
+    if system == "Darwin":
+        return ["pbcopy"], ["pbpaste"]
+    if system == "Windows":
+        return (["powershell", "-NoProfile", "-Command", "$input | Set-Clipboard"],
+                ["powershell", "-NoProfile", "-Command", "Get-Clipboard -Raw"])
+    if shutil.which("xclip"):
+        return ["xclip", "-selection", "clipboard"], ["xclip", "-selection", "clipboard", "-o"]
+    if shutil.which("xsel"):
+        return ["xsel", "--clipboard", "--input"], ["xsel", "--clipboard", "--output"]
+    if shutil.which("wl-copy"):
+        return ["wl-copy"], ["wl-paste", "--no-newline"]
+    return None, None
+
+def set_clipboard(text):
+    """
+    Put text on the clipboard.
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        if pyperclip is not None:
+            pyperclip.copy(text)
+            return True
+        
+        copy_command, _ = _clipboard_commands()
+        if copy_command is None:
+            logging.debug("No clipboard tool available (install pyperclip or xclip)")
+            return False
+        subprocess.run(copy_command, input=text.encode("utf-8"), check=True, timeout=5)
+        return True
+    except Exception as e:
+        logging.debug(f"Setting the clipboard failed: {e}")
+        return False
+
+def get_clipboard():
+    """
+    Read text from the clipboard.
+    
+    Returns:
+        Clipboard text, or None if it cannot be read
+    """
+    try:
+        if pyperclip is not None:
+            return pyperclip.paste()
+        
+        _, paste_command = _clipboard_commands()
+        if paste_command is None:
+            return None
+        result = subprocess.run(paste_command, capture_output=True, check=True, timeout=5)
+        return result.stdout.decode("utf-8", errors="replace")
+    except Exception as e:
+        logging.debug(f"Reading the clipboard failed: {e}")
+        return None
+
+STRATEGIES = {
+    "clipboard": ClipboardInput,
+    "bulk": BulkInput,
+    "humanized": HumanizedInput
+}
+
+def create_input_strategy(settings=None):
+    """
+    Create the input strategy described by a configuration section.
+    
+    Args:
+        settings: "text_input" configuration dictionary with a strategy name
+                  ("clipboard", "bulk" or "humanized") and optional clipboard,
+                  bulk and humanized sections with the strategy parameters
+    
+    Returns:
+        InputStrategy instance
+    """
+    settings = settings or {}
+    name = settings.get("strategy", "humanized")
+    if name not in STRATEGIES:
+        logging.warning(f"Unknown text input strategy '{name}', using humanized")
+        name = "humanized"
+    
+    bulk = BulkInput(**(settings.get("bulk") or {}))
+    if name == "clipboard":
+        return ClipboardInput(fallback=bulk, **(settings.get("clipboard") or {}))
+    if name == "bulk":
+        return bulk
+    return HumanizedInput(**(settings.get("humanized") or {}))
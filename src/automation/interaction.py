@@ -4,12 +4,41 @@ import logging
 import random
 from src.models.ui_element import UIElement
 from src.automation.recognition import find_element
+from src.automation.input_strategy import HumanizedInput
+from src.automation.timing import get_timing, note_actions, note_mouse_move, pause
+from src.automation.input_ack import ack_region, acknowledge
+from src.automation.input_backend import get_input_backend
 
-# Configure PyAutoGUI settings
-pyautogui.PAUSE = 0.5  # Default delay between actions
+# Configure PyAutoGUI settings (the pause also applies to the other input
+# backends, see src.automation.input_backend.configure_input_backend)
+pyautogui.PAUSE = get_timing().action_pause  # Delay between actions (set by the timing profile)
 pyautogui.FAILSAFE = True  # Move mouse to upper-left to abort
 
-def click_at_coordinates(x, y, right_click=False, double_click=False, element_name="coordinates"):
+def perform(action, ack=False, target=None, ack_timeout=2.0, name="action"):
+    """
+    Run an input action, optionally waiting for the UI to respond to it.
+    
+    Args:
+        action: Callable performing the input and returning True on success
+        ack: False, True (watch the area around target or the mouse) or a region
+        target: Point, region or UIElement the action is aimed at
+        ack_timeout: Maximum time to wait for the response in seconds
+        name: Action description for logging
+    
+    Returns:
+        Result of the action, or an Acknowledgement when ack is requested
+    """
+    if not ack:
+        return action()
+    
+    region = ack_region(ack if ack is not True else (target or pyautogui.position()))
+    if region is None:
+        logging.warning(f"No region to watch for {name}, running it without acknowledgement")
+        return action()
+    return acknowledge(action, region, ack_timeout, name)
+
+def click_at_coordinates(x, y, right_click=False, double_click=False, element_name="coordinates",
+                         ack=False, ack_timeout=2.0):
     """
     Click directly at the specified coordinates.
     
@@ -18,9 +47,13 @@ def click_at_coordinates(x, y, right_click=False, double_click=False, element_na
         right_click: Whether to perform a right click
         double_click: Whether to perform a double click
         element_name: Name for logging and debugging
+        ack: Wait for a visible response instead of the fixed pause: True to
+             watch the area around the target, or a region (x, y, width, height)
+        ack_timeout: Maximum time to wait for the response in seconds
     
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise. With ack, an Acknowledgement
+        with the response latency, falsy if the UI did not respond.
     """
     try:
         # Debug click location
@@ -31,23 +64,27 @@ def click_at_coordinates(x, y, right_click=False, double_click=False, element_na
         humanize_mouse_movement(x, y)
         
         # Perform the click
-        if right_click:
-            pyautogui.rightClick(x, y)
-            logging.debug(f"Right-clicked at coordinates ({x}, {y})")
-        elif double_click:
-            pyautogui.doubleClick(x, y)
-            logging.debug(f"Double-clicked at coordinates ({x}, {y})")
-        else:
-            pyautogui.click(x, y)
-            logging.debug(f"Clicked at coordinates ({x}, {y})")
+        def click():
+            if right_click:
+                get_input_backend().click(x, y, button="right")
+                logging.debug(f"Right-clicked at coordinates ({x}, {y})")
+            elif double_click:
+                get_input_backend().click(x, y, clicks=2)
+                logging.debug(f"Double-clicked at coordinates ({x}, {y})")
+            else:
+                get_input_backend().click(x, y)
+                logging.debug(f"Clicked at coordinates ({x}, {y})")
+            return True
         
-        return True
+        result = perform(click, ack, (x, y), ack_timeout, f"click on {element_name}")
+        note_actions(1 if ack else 2)
+        return result
     
     except Exception as e:
         logging.error(f"Click at coordinates failed: {e}")
         return False
 
-def click_element(location, right_click=False, double_click=False, offset=(0, 0)):
+def click_element(location, right_click=False, double_click=False, offset=(0, 0), ack=False, ack_timeout=2.0):
     """
     Click on a UI element at the specified location.
     
@@ -56,9 +93,13 @@ def click_element(location, right_click=False, double_click=False, offset=(0, 0)
         right_click: Whether to perform a right click
         double_click: Whether to perform a double click
         offset: (x, y) offset from center to click at
+        ack: Wait for a visible response instead of the fixed pause: True to
+             watch the area around the target, or a region (x, y, width, height)
+        ack_timeout: Maximum time to wait for the response in seconds
     
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise. With ack, an Acknowledgement
+        with the response latency, falsy if the UI did not respond.
     """
     try:
         element_name = "unknown"
@@ -73,7 +114,7 @@ def click_element(location, right_click=False, double_click=False, offset=(0, 0)
                 # Handle both tuple and list formats
                 x, y = coords if isinstance(coords, tuple) else tuple(coords)
                 logging.info(f"Using direct coordinates for {element_name}: ({x}, {y})")
-                return click_at_coordinates(x, y, right_click, double_click, element_name)
+                return click_at_coordinates(x, y, right_click, double_click, element_name, ack, ack_timeout)
             
             # Fall back to visual recognition
             element_location = find_element(location)
@@ -84,7 +125,7 @@ def click_element(location, right_click=False, double_click=False, offset=(0, 0)
                     # Handle both tuple and list formats
                     x, y = coords if isinstance(coords, tuple) else tuple(coords)
                     logging.info(f"Visual recognition failed. Using fallback coordinates for {element_name}: ({x}, {y})")
-                    return click_at_coordinates(x, y, right_click, double_click, element_name)
+                    return click_at_coordinates(x, y, right_click, double_click, element_name, ack, ack_timeout)
                     
                 logging.error(f"Could not find element {location.name} to click")
                 return False
@@ -107,33 +148,43 @@ def click_element(location, right_click=False, double_click=False, offset=(0, 0)
         humanize_mouse_movement(center_x, center_y)
         
         # Perform the click
-        if right_click:
-            pyautogui.rightClick(center_x, center_y)
-            logging.debug(f"Right-clicked at ({center_x}, {center_y})")
-        elif double_click:
-            pyautogui.doubleClick(center_x, center_y)
-            logging.debug(f"Double-clicked at ({center_x}, {center_y})")
-        else:
-            pyautogui.click(center_x, center_y)
-            logging.debug(f"Clicked at ({center_x}, {center_y})")
+        def click():
+            if right_click:
+                get_input_backend().click(center_x, center_y, button="right")
+                logging.debug(f"Right-clicked at ({center_x}, {center_y})")
+            elif double_click:
+                get_input_backend().click(center_x, center_y, clicks=2)
+                logging.debug(f"Double-clicked at ({center_x}, {center_y})")
+            else:
+                get_input_backend().click(center_x, center_y)
+                logging.debug(f"Clicked at ({center_x}, {center_y})")
+            return True
         
-        return True
+        result = perform(click, ack, location, ack_timeout, f"click on {element_name}")
+        note_actions(1 if ack else 2)
+        return result
     
     except Exception as e:
         logging.error(f"Click failed: {e}")
         return False
 
-def send_text(text, target=None, delay=0.01):
+def send_text(text, target=None, delay=0.01, strategy=None, ack=False, ack_timeout=2.0):
     """
-    Type text with a human-like delay between keystrokes.
+    Enter text into the target field.
     
     Args:
         text: Text to type
         target: Optional target element to click before typing
-        delay: Delay between keystrokes (randomized)
+        delay: Delay between keystrokes (randomized) when no strategy is given
+        strategy: InputStrategy used to enter the text (default: humanized
+                  typing with the given delay)
+        ack: Wait for a visible response instead of the fixed pause: True to
+             watch the area around the target, or a region (x, y, width, height)
+        ack_timeout: Maximum time to wait for the response in seconds
     
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise. With ack, an Acknowledgement
+        with the response latency, falsy if the UI did not respond.
     """
     try:
         # Click the target first if provided
@@ -143,68 +194,98 @@ def send_text(text, target=None, delay=0.01):
                 return False
         
         # Clear any existing text with Ctrl+A and Delete
-        pyautogui.hotkey('ctrl', 'a')
-        pyautogui.press('delete')
+        backend = get_input_backend()
+        with backend.batch():
+            backend.hotkey('ctrl', 'a')
+            backend.key('delete')
+        note_actions(2)
         
-        # Type the text with human-like delays
-        for char in text:
-            pyautogui.write(char, interval=delay * random.uniform(0.8, 1.2))
+        # Enter the text with the session's input strategy
+        if strategy is None:
+            strategy = HumanizedInput(min_delay=delay * 0.8, max_delay=delay * 1.2, pause_chance=0)
+        result = perform(lambda: strategy.type_text(text), ack, target, ack_timeout, "text input")
+        if not result:
+            return result
         
         logging.debug(f"Typed text: {text[:10]}..." if len(text) > 10 else f"Typed text: {text}")
-        return True
+        return result
     
     except Exception as e:
         logging.error(f"Text input failed: {e}")
         return False
 
-def press_key(key):
+def press_key(key, ack=False, ack_timeout=2.0):
     """
     Press a single key.
     
     Args:
         key: Key to press (e.g., 'enter', 'esc', 'tab')
+        ack: Wait for a visible response instead of the fixed pause: True to
+             watch the area around the target, or a region (x, y, width, height)
+        ack_timeout: Maximum time to wait for the response in seconds
     
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise. With ack, an Acknowledgement
+        with the response latency, falsy if the UI did not respond.
     """
     try:
-        pyautogui.press(key)
+        def press():
+            get_input_backend().key(key)
+            return True
+        
+        result = perform(press, ack, None, ack_timeout, f"key {key}")
+        if not ack:
+            note_actions()
         logging.debug(f"Pressed key: {key}")
-        return True
+        return result
     
     except Exception as e:
         logging.error(f"Key press failed: {e}")
         return False
 
-def press_hotkey(*keys):
+def press_hotkey(*keys, ack=False, ack_timeout=2.0):
     """
     Press a combination of keys.
     
     Args:
         *keys: Keys to press (e.g., 'ctrl', 'c' for copy)
+        ack: Wait for a visible response instead of the fixed pause: True to
+             watch the area around the target, or a region (x, y, width, height)
+        ack_timeout: Maximum time to wait for the response in seconds
     
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise. With ack, an Acknowledgement
+        with the response latency, falsy if the UI did not respond.
     """
     try:
-        pyautogui.hotkey(*keys)
+        def hotkey():
+            get_input_backend().hotkey(*keys)
+            return True
+        
+        result = perform(hotkey, ack, None, ack_timeout, f"hotkey {'+'.join(keys)}")
+        if not ack:
+            note_actions()
         logging.debug(f"Pressed hotkey: {'+'.join(keys)}")
-        return True
+        return result
     
     except Exception as e:
         logging.error(f"Hotkey press failed: {e}")
         return False
 
-def scroll(clicks, target=None):
+def scroll(clicks, target=None, ack=False, ack_timeout=2.0):
     """
     Scroll up or down.
     
     Args:
         clicks: Number of "clicks" to scroll (positive for down, negative for up)
         target: Optional target element to hover over before scrolling
+        ack: Wait for a visible response instead of the fixed pause: True to
+             watch the area around the target, or a region (x, y, width, height)
+        ack_timeout: Maximum time to wait for the response in seconds
     
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise. With ack, an Acknowledgement
+        with the response latency, falsy if the UI did not respond.
     """
     try:
         # Move to target first if provided
@@ -217,13 +298,17 @@ def scroll(clicks, target=None):
                 target = element_location
             
             x, y, width, height = target
-            pyautogui.moveTo(x + width // 2, y + height // 2)
+            get_input_backend().move(x + width // 2, y + height // 2)
         
         # Perform scrolling
-        pyautogui.scroll(clicks)
+        def scroll_wheel():
+            get_input_backend().scroll(clicks)
+            return True
+        
+        result = perform(scroll_wheel, ack, target, ack_timeout, "scroll")
         direction = "down" if clicks < 0 else "up"
         logging.debug(f"Scrolled {direction} by {abs(clicks)} clicks")
-        return True
+        return result
     
     except Exception as e:
         logging.error(f"Scroll failed: {e}")
@@ -295,37 +380,39 @@ def drag_drop(start_location, end_location, duration=0.5):
         logging.error(f"Drag and drop failed: {e}")
         return False
 
-def humanize_mouse_movement(x, y, speed=0.5):
+def humanize_mouse_movement(x, y, speed=None):
     """
     Move mouse to coordinates with human-like movement.
     
     Args:
         x: Target x coordinate
         y: Target y coordinate
-        speed: Movement speed (lower is faster)
+        speed: Movement duration in seconds (default: the timing profile's mouse_move)
     """
-    # Get current position
-    current_x, current_y = pyautogui.position()
+    if speed is None:
+        speed = get_timing().mouse_move
     
     # Add slight randomization to target (within 2 pixels)
     rand_x = x + random.randint(-2, 2)
     rand_y = y + random.randint(-2, 2)
     
-    # Use PyAutoGUI's built-in easing function for humanized movement
-    pyautogui.moveTo(rand_x, rand_y, duration=speed, tween=pyautogui.easeOutQuad)
+    # Ease-out movement (the X11 backends replay it without Python-side sleeps)
+    get_input_backend().move(rand_x, rand_y, duration=speed)
+    note_mouse_move(speed)
 
-def wait_and_click(ui_element, timeout=10, interval=0.5):
+def wait_and_click(ui_element, timeout=10, interval=None):
     """
     Wait for an element to appear and then click it.
     
     Args:
         ui_element: UIElement to wait for and click
         timeout: Maximum time to wait in seconds
-        interval: Check interval in seconds
+        interval: Check interval in seconds (default: the timing profile's poll_interval)
     
     Returns:
         True if found and clicked, False otherwise
     """
+    interval = interval or get_timing().poll_interval
     start_time = time.time()
     while time.time() - start_time < timeout:
         # Check if we should use coordinates first
@@ -374,6 +461,6 @@ def retry_interaction(interaction_func, max_retries=3, *args, **kwargs):
         
         retries += 1
         logging.warning(f"Retry {retries}/{max_retries} for interaction")
-        time.sleep(1)  # Wait before retrying
+        pause("retry")  # Wait before retrying
     
     return False
\ No newline at end of file
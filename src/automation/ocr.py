@@ -4,9 +4,160 @@ import numpy as np
 import pyautogui
 import logging
 import os
-import tempfile
+import atexit
+import shlex
+import hashlib
+import subprocess
+import threading
+import json
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageEnhance
 
+# Word boxes returned by structured OCR
+WORD_BOX_DTYPE = np.dtype([
+    ('text', object),
+    ('x', np.int32),
+    ('y', np.int32),
+    ('width', np.int32),
+    ('height', np.int32),
+    ('conf', np.float32)
+])
+
+def empty_word_boxes():
+    """Return an empty word box array."""
+    return np.empty(0, dtype=WORD_BOX_DTYPE)
+
+class OCRCache:
+    """
+    LRU cache of OCR results keyed by a hash of the preprocessed image and
+    the Tesseract configuration, with an optional on-disk tier.
+    """
+    
+    def __init__(self, max_entries=256, disk=False, disk_dir="logs/ocr_cache"):
+        """
+        Initialize the OCR cache.
+        
+        Args:
+            max_entries: Maximum number of results kept in memory
+            disk: Whether to also persist results to disk
+            disk_dir: Directory for the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.disk = disk
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        if self.disk:
+            os.makedirs(self.disk_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(image, tesseract_config, kind):
+        """
+        Build a cache key for an image.
+        
+        Args:
+            image: PIL Image or numpy array (other inputs are not cacheable)
+            tesseract_config: Tesseract configuration string
+            kind: Type of result, e.g. "string" or "data"
+        
+        Returns:
+            Hex digest string, or None if the image cannot be hashed
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(image, Image.Image):
+            digest.update(f"{image.mode}{image.size}".encode())
+            digest.update(image.tobytes())
+        elif isinstance(image, np.ndarray):
+            digest.update(f"{image.dtype}{image.shape}".encode())
+            digest.update(np.ascontiguousarray(image).tobytes())
+        else:
+            return None
+        digest.update(f"{kind}|{tesseract_config}".encode())
+        return digest.hexdigest()
+    
+    def _disk_path(self, key):
+        """Path of the on-disk entry for a key."""
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+    
+    def get(self, key):
+        """
+        Look up a cached result.
+        
+        Returns:
+            Cached result or None on a miss
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        
+        if self.disk:
+            try:
+                with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                    result = json.load(f)
+                if isinstance(result, dict) and "word_boxes" in result:
+                    result = np.array([tuple(row) for row in result["word_boxes"]], dtype=WORD_BOX_DTYPE)
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, result)
+                return result
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.debug(f"Could not read OCR cache entry {key}: {e}")
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def put(self, key, result):
+        """Store a result in the cache (and on disk if enabled)."""
+        self._remember(key, result)
+        
+        if self.disk:
+            path = self._disk_path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.tmp"
+                if isinstance(result, np.ndarray):
+                    result = {"word_boxes": [list(row) for row in result.tolist()]}
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, default=float)
+                os.replace(temp_path, path)
+            except Exception as e:
+                logging.debug(f"Could not write OCR cache entry {key}: {e}")
+    
+    def _remember(self, key, result):
+        """Insert into the in-memory tier, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def stats(self):
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with hit, miss and size counters and the hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
 class OCREngine:
     """OCR Engine class that handles text extraction from images."""
     
@@ -27,7 +178,164 @@ class OCREngine:
         if not hasattr(pytesseract.pytesseract, "tesseract_cmd") or not os.path.exists(pytesseract.pytesseract.tesseract_cmd):
             self._set_default_tesseract_path()
         
-        logging.info(f"OCR Engine initialized with Tesseract path: {pytesseract.pytesseract.tesseract_cmd}")
+        # Loaded in-process Tesseract APIs keyed by (lang, oem, variables)
+        self.backend = "pytesseract"
+        self._apis = {}
+        self._lock = threading.Lock()
+        if self.config.get("in_process", True):
+            self._init_in_process_backend()
+        
+        # Cache of results for identical preprocessed images
+        cache_config = self.config.get("cache", {})
+        self.cache = None
+        if cache_config.get("enabled", True):
+            self.cache = OCRCache(
+                max_entries=cache_config.get("max_entries", 256),
+                disk=cache_config.get("disk", False),
+                disk_dir=cache_config.get("disk_dir", os.path.join("logs", "ocr_cache"))
+            )
+        
+        logging.info(f"OCR Engine initialized with Tesseract path: {pytesseract.pytesseract.tesseract_cmd} "
+                     f"(backend: {self.backend})")
+    
+    def _init_in_process_backend(self):
+        """Use tesserocr to keep the Tesseract model loaded in this process, if available."""
+        try:
+            import tesserocr
+            self._tesserocr = tesserocr
+            self.backend = "tesserocr"
+        except ImportError:
+            logging.debug("tesserocr not installed, falling back to pytesseract")
+    
+    def _get_api(self, options):
+        """
+        Get (or lazily create) a loaded tesserocr API for parsed Tesseract options.
+        
+        An API keeps the variables set on it, so one is kept per language,
+        engine mode and set of -c variables; that way a variable of one
+        configuration never applies to another.
+        """
+        lang, oem, variables = options["lang"], options["oem"], options["variables"]
+        key = (lang, oem, tuple(sorted(variables.items())))
+        if key not in self._apis:
+            kwargs = {"lang": lang}
+            if oem is not None:
+                kwargs["oem"] = oem
+            if self.config.get("tessdata_path"):
+                kwargs["path"] = self.config["tessdata_path"]
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            for name, value in variables.items():
+                api.SetVariable(name, value)
+            self._apis[key] = api
+            logging.debug(f"Loaded in-process Tesseract model (lang: {lang}, oem: {oem}, variables: {variables})")
+        return self._apis[key]
+    
+    def _cached(self, kind, image, tesseract_config, recognize):
+        """Return a cached result for the image, or compute and cache it."""
+        key = self.cache.make_key(image, tesseract_config, kind) if self.cache else None
+        if key:
+            result = self.cache.get(key)
+            if result is not None:
+                # Word box arrays are mutable, hand out copies
+                return result.copy() if isinstance(result, np.ndarray) else result
+        
+        result = recognize(image, tesseract_config)
+        if key:
+            self.cache.put(key, result.copy() if isinstance(result, np.ndarray) else result)
+        return result
+    
+    def image_to_string(self, image, tesseract_config="--psm 6"):
+        """
+        Run OCR on an image.
+        
+        Args:
+            image: PIL Image or numpy array
+            tesseract_config: Tesseract command line style configuration string
+        
+        Returns:
+            Extracted text as string
+        """
+        return self._cached("string", image, tesseract_config, self._image_to_string)
+    
+    def _image_to_string(self, image, tesseract_config):
+        """Run OCR on an image without consulting the cache."""
+        if self.backend == "tesserocr":
+            options = parse_tesseract_config(tesseract_config)
+            if isinstance(image, np.ndarray):
+                image = Image.fromarray(image)
+            
+            with self._lock:
+                api = self._get_api(options)
+                api.SetPageSegMode(options["psm"])
+                api.SetImage(image)
+                return api.GetUTF8Text()
+        
+        return pytesseract.image_to_string(image, config=tesseract_config)
+    
+    def image_to_data(self, image, tesseract_config="--psm 6"):
+        """
+        Run OCR on an image and return word boxes.
+        
+        The image is handed to Tesseract in memory: through tesserocr's
+        SetImage when available, otherwise as raw PNM piped to the tesseract
+        executable's stdin.
+        
+        Args:
+            image: PIL Image or numpy array
+            tesseract_config: Tesseract command line style configuration string
+        
+        Returns:
+            Structured numpy array with WORD_BOX_DTYPE fields, one row per word
+        """
+        return self._cached("data", image, tesseract_config, self._image_to_data)
+    
+    def _image_to_data(self, image, tesseract_config):
+        """Run word level OCR on an image without consulting the cache."""
+        if self.backend == "tesserocr":
+            return self._image_to_data_in_process(image, tesseract_config)
+        return self._image_to_data_cli(image, tesseract_config)
+    
+    def _image_to_data_in_process(self, image, tesseract_config):
+        """Collect word boxes from the loaded tesserocr API."""
+        options = parse_tesseract_config(tesseract_config)
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        
+        rows = []
+        with self._lock:
+            api = self._get_api(options)
+            api.SetPageSegMode(options["psm"])
+            api.SetImage(image)
+            api.Recognize()
+            
+            level = self._tesserocr.RIL.WORD
+            iterator = api.GetIterator()
+            if iterator is not None:
+                for word in self._tesserocr.iterate_level(iterator, level):
+                    text = word.GetUTF8Text(level)
+                    if not text or not text.strip():
+                        continue
+                    x1, y1, x2, y2 = word.BoundingBox(level)
+                    rows.append((text, x1, y1, x2 - x1, y2 - y1, word.Confidence(level)))
+        
+        return np.array(rows, dtype=WORD_BOX_DTYPE)
+    
+    def _image_to_data_cli(self, image, tesseract_config):
+        """Pipe the image as PNM to the tesseract executable and parse its TSV output."""
+        cmd = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout"]
+        cmd += shlex.split(tesseract_config or "") + ["tsv"]
+        result = subprocess.run(cmd, input=encode_pnm(image), capture_output=True, check=True)
+        return parse_tsv_word_boxes(result.stdout.decode("utf-8", errors="replace"))
+    
+    def close(self):
+        """Release any loaded in-process Tesseract models."""
+        with self._lock:
+            for api in self._apis.values():
+                try:
+                    api.End()
+                except Exception as e:
+                    logging.debug(f"Error releasing Tesseract API: {e}")
+            self._apis = {}
     
     def _set_default_tesseract_path(self):
         """Set the default Tesseract path based on operating system."""
@@ -58,38 +366,173 @@ class OCREngine:
         
         logging.warning("Could not find Tesseract executable. Please install Tesseract or set path manually.")
 
-def extract_text_from_region(region, config=None):
+_engine = None
+_engine_key = None
+
+def get_ocr_engine(ocr_config=None):
+    """
+    Get the OCR engine shared by this run, creating it on first use.
+    
+    The engine is only rebuilt if the Tesseract location or backend settings
+    change, so the executable lookup and model loading happen once per run.
+    
+    Args:
+        ocr_config: OCR configuration dictionary
+    
+    Returns:
+        OCREngine instance
+    """
+    global _engine, _engine_key
+    ocr_config = ocr_config or {}
+    key = (
+        ocr_config.get("tesseract_cmd"),
+        ocr_config.get("tessdata_path"),
+        ocr_config.get("in_process", True),
+        json.dumps(ocr_config.get("cache", {}), sort_keys=True)
+    )
+    
+    if _engine is None or key != _engine_key:
+        if _engine is not None:
+            _engine.close()
+        _engine = OCREngine(ocr_config)
+        _engine_key = key
+    
+    return _engine
+
+def get_ocr_cache_stats():
+    """
+    Get hit/miss statistics for the shared engine's OCR cache.
+    
+    Returns:
+        Dictionary with hit, miss and size counters and the hit ratio
+    """
+    if _engine is None or _engine.cache is None:
+        return {"hits": 0, "disk_hits": 0, "misses": 0, "entries": 0, "hit_ratio": 0.0}
+    return _engine.cache.stats()
+
+@atexit.register
+def _close_ocr_engine():
+    """Release the shared OCR engine at interpreter exit."""
+    if _engine is not None:
+        stats = get_ocr_cache_stats()
+        logging.debug(f"OCR cache: {stats['hits'] + stats['disk_hits']} hits, {stats['misses']} misses "
+                      f"(hit ratio {stats['hit_ratio']:.0%})")
+        _engine.close()
+
+def encode_pnm(image):
+    """
+    Encode an image as uncompressed PGM/PPM bytes.
+    
+    Args:
+        image: PIL Image or numpy array
+    
+    Returns:
+        PNM file contents as bytes
+    """
+    img = np.array(image) if isinstance(image, Image.Image) else image
+    if img.dtype == bool:
+        img = img.astype(np.uint8) * 255
+    
+    height, width = img.shape[:2]
+    magic = b"P6" if len(img.shape) == 3 else b"P5"
+    if len(img.shape) == 3 and img.shape[2] == 4:
+        img = img[:, :, :3]
+    
+    header = magic + f"\n{width} {height}\n255\n".encode()
+    return header + np.ascontiguousarray(img, dtype=np.uint8).tobytes()
+
+def parse_tsv_word_boxes(tsv):
+    """
+    Parse Tesseract TSV output into word boxes.
+    
+    Args:
+        tsv: TSV text as produced by "tesseract ... tsv"
+    
+    Returns:
+        Structured numpy array with WORD_BOX_DTYPE fields, one row per word
+    """
+    rows = []
+    for line in tsv.splitlines()[1:]:
+        fields = line.split("\t")
+        if len(fields) < 12 or fields[0] != "5" or not fields[11].strip():
+            continue
+        left, top, width, height = (int(value) for value in fields[6:10])
+        rows.append((fields[11], left, top, width, height, float(fields[10])))
+    return np.array(rows, dtype=WORD_BOX_DTYPE)
+
+def parse_tesseract_config(tesseract_config):
+    """
+    Parse a Tesseract command line style configuration string.
+    
+    Args:
+        tesseract_config: String such as "--psm 6 -l eng -c key=value"
+    
+    Returns:
+        Dictionary with psm, oem, lang and variables
+    """
+    options = {"psm": 3, "oem": None, "lang": "eng", "variables": {}}
+    tokens = shlex.split(tesseract_config or "")
+    
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else None
+        
+        if token == "--psm" and value is not None:
+            options["psm"] = int(value)
+            i += 1
+        elif token == "--oem" and value is not None:
+            options["oem"] = int(value)
+            i += 1
+        elif token == "-l" and value is not None:
+            options["lang"] = value
+            i += 1
+        elif token == "-c" and value is not None and "=" in value:
+            name, var_value = value.split("=", 1)
+            options["variables"][name] = var_value
+            i += 1
+        else:
+            logging.debug(f"Ignoring unsupported Tesseract option: {token}")
+        i += 1
+    
+    return options
+
+def extract_text_from_region(region, config=None, parallel=None):
     """
     Extract text from a screen region using OCR.
     
     Args:
         region: Tuple (x, y, width, height) defining screen region
         config: Optional OCR configuration
+        parallel: Split the region into bands and OCR them on a process pool
+                  (defaults to the "parallel" OCR setting)
     
     Returns:
         Extracted text as string
     """
     try:
-        # Initialize OCR engine with config
+        # Get the shared OCR engine for this run
         ocr_config = config.get("ocr", {}) if config else {}
-        engine = OCREngine(ocr_config)
+        engine = get_ocr_engine(ocr_config)
         
         # Take screenshot of region
         screenshot = pyautogui.screenshot(region=region)
         
+        if parallel is None:
+            parallel = ocr_config.get("parallel", False)
+        if parallel:
+            text = recognize_parallel(screenshot, ocr_config)
+            logging.debug(f"Extracted text from region {region} in parallel: {text[:50]}...")
+            return text.strip()
+        
         # Process image for better OCR results
-        processed_image = preprocess_image(
-            screenshot, 
-            preprocess=ocr_config.get("preprocess", True),
-            contrast_enhance=ocr_config.get("contrast_enhance", True),
-            denoise=ocr_config.get("denoise", True)
-        )
+        processed_image = preprocess_for_config(screenshot, ocr_config)
         
         # Get OCR configuration parameters
         tesseract_config = ocr_config.get("config", "--psm 6")
         
         # Perform OCR
-        text = pytesseract.image_to_string(processed_image, config=tesseract_config)
+        text = engine.image_to_string(processed_image, tesseract_config)
         
         logging.debug(f"Extracted text from region {region}: {text[:50]}..." if len(text) > 50 else f"Extracted text: {text}")
         return text.strip()
@@ -98,7 +541,86 @@ def extract_text_from_region(region, config=None):
         logging.error(f"OCR extraction failed: {e}")
         return ""
 
-def preprocess_image(image, preprocess=True, contrast_enhance=True, denoise=True):
+# Named preprocessing profiles selectable with the "profile" OCR setting
+PREPROCESS_PROFILES = ("none", "fast", "quality", "auto")
+
+_profile_override_logged = False
+
+def preprocess_for_config(image, ocr_config):
+    """
+    Preprocess an image according to the OCR configuration.
+    
+    Uses the named "profile" if one is set, otherwise the individual
+    preprocess/contrast_enhance/denoise flags. When both are configured the
+    profile wins, which is logged once.
+    
+    Args:
+        image: PIL Image or numpy array
+        ocr_config: OCR configuration dictionary
+    
+    Returns:
+        Processed image
+    """
+    global _profile_override_logged
+    profile = ocr_config.get("profile")
+    if profile:
+        if not _profile_override_logged:
+            flags = [name for name in ("preprocess", "contrast_enhance", "denoise") if name in ocr_config]
+            if flags:
+                logging.info(f"OCR profile '{profile}' overrides the {', '.join(flags)} settings")
+            _profile_override_logged = True
+        return preprocess_image(
+            image,
+            profile=profile,
+            noise_threshold=ocr_config.get("auto_noise_threshold", 2.0)
+        )
+    
+    return preprocess_image(
+        image,
+        preprocess=ocr_config.get("preprocess", True),
+        contrast_enhance=ocr_config.get("contrast_enhance", True),
+        denoise=ocr_config.get("denoise", True)
+    )
+
+def estimate_noise(gray):
+    """
+    Estimate the noise level of a grayscale image (Immerkaer's method).
+    
+    Pixels on or next to strong edges are ignored so that the glyph outlines
+    of clean rendered text do not count as noise.
+    
+    Args:
+        gray: Grayscale image as a numpy array
+    
+    Returns:
+        Estimated noise standard deviation
+    """
+    height, width = gray.shape[:2]
+    if height < 3 or width < 3:
+        return 0.0
+    
+    gray = gray.astype(np.float32)
+    kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+    response = np.abs(cv2.filter2D(gray, -1, kernel))[1:-1, 1:-1]
+    
+    gradient = np.abs(cv2.Sobel(gray, -1, 1, 0)) + np.abs(cv2.Sobel(gray, -1, 0, 1))
+    edges = cv2.dilate((gradient > 100).astype(np.uint8), np.ones((3, 3), np.uint8))[1:-1, 1:-1]
+    flat = response[edges == 0]
+    if flat.size == 0:
+        flat = response
+    
+    return float(np.sqrt(np.pi / 2) * flat.mean() / 6)
+
+def _fast_threshold(gray):
+    """Binarize clean rendered text with a single global Otsu threshold."""
+    # Tesseract expects dark text on a light background
+    if np.median(gray) < 128:
+        gray = cv2.bitwise_not(gray)
+    _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thresh
+
+def preprocess_image(image, preprocess=True, contrast_enhance=True, denoise=True, profile=None,
+                     noise_threshold=2.0):
     """
     Preprocess an image for better OCR accuracy.
     
@@ -107,10 +629,20 @@ def preprocess_image(image, preprocess=True, contrast_enhance=True, denoise=True
         preprocess: Whether to apply preprocessing
         contrast_enhance: Whether to enhance contrast
         denoise: Whether to apply denoising
+        profile: Optional named profile ("none", "fast", "quality" or "auto")
+                 that overrides the individual flags
+        noise_threshold: Noise level above which the "auto" profile uses "quality"
     
     Returns:
         Processed PIL Image
     """
+    if profile == "none":
+        return image
+    elif profile == "quality":
+        preprocess, contrast_enhance, denoise = True, True, True
+    elif profile not in (None, "fast", "auto"):
+        logging.warning(f"Unknown OCR preprocessing profile '{profile}', using flags")
+    
     if not preprocess:
         return image
     
@@ -126,6 +658,14 @@ def preprocess_image(image, preprocess=True, contrast_enhance=True, denoise=True
             gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
         else:
             gray = img
+        
+        if profile == "auto":
+            noise = estimate_noise(gray)
+            profile = "fast" if noise < noise_threshold else "quality"
+            logging.debug(f"Auto preprocessing chose '{profile}' profile (noise: {noise:.2f})")
+        
+        if profile == "fast":
+            return Image.fromarray(_fast_threshold(gray))
             
         # Apply contrast enhancement
         if contrast_enhance:
@@ -168,26 +708,21 @@ def extract_text_from_file(image_path, config=None):
         Extracted text as string
     """
     try:
-        # Initialize OCR engine with config
+        # Get the shared OCR engine for this run
         ocr_config = config.get("ocr", {}) if config else {}
-        engine = OCREngine(ocr_config)
+        engine = get_ocr_engine(ocr_config)
         
         # Read image
         image = Image.open(image_path)
         
         # Process image for better OCR results
-        processed_image = preprocess_image(
-            image, 
-            preprocess=ocr_config.get("preprocess", True),
-            contrast_enhance=ocr_config.get("contrast_enhance", True),
-            denoise=ocr_config.get("denoise", True)
-        )
+        processed_image = preprocess_for_config(image, ocr_config)
         
         # Get OCR configuration parameters
         tesseract_config = ocr_config.get("config", "--psm 6")
         
         # Perform OCR
-        text = pytesseract.image_to_string(processed_image, config=tesseract_config)
+        text = engine.image_to_string(processed_image, tesseract_config)
         
         logging.debug(f"Extracted text from {image_path}: {text[:50]}..." if len(text) > 50 else f"Extracted text: {text}")
         return text.strip()
@@ -196,69 +731,53 @@ def extract_text_from_file(image_path, config=None):
         logging.error(f"OCR extraction from file failed: {e}")
         return ""
 
-def extract_structured_text(region, config=None):
+def extract_structured_text(region, config=None, parallel=None):
     """
     Extract structured text with position information.
     
     Args:
         region: Tuple (x, y, width, height) defining screen region
         config: Optional OCR configuration
+        parallel: Split the region into bands and OCR them on a process pool
+                  (defaults to the "parallel" OCR setting)
     
     Returns:
-        List of dictionaries with text and position information
+        Structured numpy array of word boxes with fields text, x, y, width,
+        height and conf (coordinates are screen coordinates)
     """
     try:
-        # Initialize OCR engine with config
+        # Get the shared OCR engine for this run
         ocr_config = config.get("ocr", {}) if config else {}
-        engine = OCREngine(ocr_config)
+        engine = get_ocr_engine(ocr_config)
         
         # Take screenshot of region
         screenshot = pyautogui.screenshot(region=region)
         
-        # Process image for better OCR results
-        processed_image = preprocess_image(
-            screenshot, 
-            preprocess=ocr_config.get("preprocess", True),
-            contrast_enhance=ocr_config.get("contrast_enhance", True),
-            denoise=ocr_config.get("denoise", True)
-        )
-        
-        # Save processed image to temp file (required for some pytesseract functions)
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp:
-            temp_filename = temp.name
-            processed_image.save(temp_filename)
-        
-        # Get OCR configuration parameters
-        tesseract_config = ocr_config.get("config", "--psm 6")
-        
-        # Extract data including bounding box info
-        data = pytesseract.image_to_data(
-            temp_filename,
-            config=tesseract_config,
-            output_type=pytesseract.Output.DICT
-        )
+        if parallel is None:
+            parallel = ocr_config.get("parallel", False)
+        if parallel:
+            # Extract word boxes band by band
+            boxes = recognize_parallel(screenshot, ocr_config, structured=True)
+        else:
+            # Process image for better OCR results
+            processed_image = preprocess_for_config(screenshot, ocr_config)
+            
+            # Get OCR configuration parameters
+            tesseract_config = ocr_config.get("config", "--psm 6")
+            
+            # Extract word boxes straight from the in-memory image
+            boxes = engine.image_to_data(processed_image, tesseract_config)
         
-        # Clean up temp file
-        os.unlink(temp_filename)
-        
-        # Format results
-        result = []
-        for i in range(len(data['text'])):
-            if data['text'][i].strip():
-                result.append({
-                    'text': data['text'][i],
-                    'x': data['left'][i] + region[0] if region else data['left'][i],
-                    'y': data['top'][i] + region[1] if region else data['top'][i],
-                    'width': data['width'][i],
-                    'height': data['height'][i],
-                    'conf': data['conf'][i]
-                })
+        # Convert to screen coordinates
+        if region:
+            boxes['x'] += region[0]
+            boxes['y'] += region[1]
         
-        return result
+        return boxes
         
     except Exception as e:
         logging.error(f"Structured OCR extraction failed: {e}")
-        return []
+        return empty_word_boxes()
 
 def verify_text_presence(region, expected_text, config=None):
     """
@@ -273,4 +792,299 @@ def verify_text_presence(region, expected_text, config=None):
         True if text is found, False otherwise
     """
     extracted_text = extract_text_from_region(region, config)
-    return expected_text.lower() in extracted_text.lower()
\ No newline at end of file
+    return expected_text.lower() in extracted_text.lower()
+
+def find_line_bands(gray, min_gap=2, padding=2, ink_delta=40):
+    """
+    Split a grayscale image into horizontal bands, one per text line.
+    
+    Rows are considered part of a line when they contain pixels that differ
+    noticeably from the background (the median intensity), so both light and
+    dark themes are handled.
+    
+    Args:
+        gray: Grayscale image as a numpy array
+        min_gap: Minimum number of blank rows that separates two lines
+        padding: Rows of padding added above and below each band
+        ink_delta: Intensity difference from background that counts as ink
+    
+    Returns:
+        List of (top, bottom) row ranges, bottom exclusive
+    """
+    if gray.size == 0:
+        return []
+    
+    background = int(np.median(gray))
+    ink = np.abs(gray.astype(np.int16) - background) > ink_delta
+    inked_rows = np.flatnonzero(ink.any(axis=1))
+    if inked_rows.size == 0:
+        return []
+    
+    # Group inked rows into runs, joining runs separated by small gaps
+    bands = []
+    start = prev = int(inked_rows[0])
+    for row in inked_rows[1:]:
+        row = int(row)
+        if row - prev > min_gap:
+            bands.append((start, prev + 1))
+            start = row
+        prev = row
+    bands.append((start, prev + 1))
+    
+    height = gray.shape[0]
+    return [(max(0, top - padding), min(height, bottom + padding)) for top, bottom in bands]
+
+class IncrementalOCR:
+    """
+    Incrementally OCR a screen region whose text changes over time.
+    
+    Each pass splits the region into text line bands and hashes them. Only
+    bands that were not seen on the previous pass are sent to Tesseract, and
+    the visible lines are spliced into a running transcript so text that has
+    scrolled out of view is kept.
+    """
+    
+    def __init__(self, region, config=None):
+        """
+        Initialize incremental OCR for a region.
+        
+        Args:
+            region: Tuple (x, y, width, height) defining screen region
+            config: Optional configuration containing an "ocr" section
+        """
+        self.region = region
+        self.ocr_config = config.get("ocr", {}) if config else {}
+        self.line_config = self.ocr_config.get("line_config", "--psm 7")
+        self.transcript_lines = []  # List of (band_hash, text)
+        self.window_start = 0  # Index in transcript_lines of the first visible line
+        self.band_texts = {}  # band_hash -> text for the currently visible bands
+        self.passes = 0
+        self.bands_seen = 0
+        self.bands_recognized = 0
+        self.engine = get_ocr_engine(self.ocr_config)
+    
+    def reset(self):
+        """Forget the transcript and all cached bands."""
+        self.transcript_lines = []
+        self.window_start = 0
+        self.band_texts = {}
+    
+    def update(self, image=None):
+        """
+        Capture the region and bring the transcript up to date.
+        
+        Args:
+            image: Optional pre-captured image of the region (PIL Image or numpy array)
+        
+        Returns:
+            Current transcript as a string
+        """
+        try:
+            if image is None:
+                image = pyautogui.screenshot(region=self.region)
+            
+            img = np.array(image) if isinstance(image, Image.Image) else image
+            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY) if len(img.shape) == 3 else img
+            
+            visible = []
+            band_texts = {}
+            for top, bottom in find_line_bands(gray):
+                band = np.ascontiguousarray(gray[top:bottom])
+                band_hash = hashlib.sha1(band.tobytes() + str(band.shape).encode()).hexdigest()
+                
+                text = band_texts.get(band_hash, self.band_texts.get(band_hash))
+                if text is None:
+                    text = self._recognize_band(band)
+                    self.bands_recognized += 1
+                
+                band_texts[band_hash] = text
+                visible.append((band_hash, text))
+            
+            self.passes += 1
+            self.bands_seen += len(visible)
+            self.band_texts = band_texts
+            self._splice(visible)
+            
+            logging.debug(f"Incremental OCR pass {self.passes}: {len(visible)} bands visible, "
+                          f"{self.bands_recognized}/{self.bands_seen} recognized so far")
+        
+        except Exception as e:
+            logging.error(f"Incremental OCR update failed: {e}")
+        
+        return self.transcript
+    
+    @property
+    def transcript(self):
+        """Full transcript of all lines seen so far."""
+        return "\n".join(text for _, text in self.transcript_lines if text)
+    
+    def _recognize_band(self, band):
+        """OCR a single line band."""
+        processed = preprocess_for_config(band, self.ocr_config)
+        return self.engine.image_to_string(processed, self.line_config).strip()
+    
+    def _splice(self, visible):
+        """
+        Replace the visible window of the transcript with the latest lines.
+        
+        The new window is aligned against the previous one by band hash so
+        that lines which scrolled off the top stay in the transcript.
+        """
+        previous = [band_hash for band_hash, _ in self.transcript_lines[self.window_start:]]
+        current = [band_hash for band_hash, _ in visible]
+        
+        best_shift, best_score = None, 0
+        for shift in range(len(previous)):
+            score = sum(1 for a, b in zip(previous[shift:], current) if a == b)
+            if score > best_score:
+                best_shift, best_score = shift, score
+        
+        if best_shift is not None:
+            self.window_start += best_shift
+        elif previous and current:
+            # No overlap with the previous window: the view moved past it entirely
+            self.window_start = len(self.transcript_lines)
+        
+        self.transcript_lines = self.transcript_lines[:self.window_start] + visible
+
+_pool = None
+_pool_workers = 0
+
+def _get_ocr_pool(workers):
+    """Get the shared OCR process pool, creating it on first use."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+        logging.debug(f"Started OCR process pool with {workers} workers")
+    return _pool
+
+@atexit.register
+def shutdown_ocr_pool():
+    """Shut down the shared OCR process pool, if one was started."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+        _pool_workers = 0
+
+def plan_parallel_bands(gray, band_count, overlap_lines=1):
+    """
+    Split an image into horizontal bands for parallel OCR.
+    
+    Bands are cut in the gaps between text lines and extended by
+    overlap_lines lines on each side. Each band also records the range it
+    owns exclusively, which is used to de-duplicate words in the overlap.
+    
+    Args:
+        gray: Grayscale image as a numpy array
+        band_count: Desired number of bands
+        overlap_lines: Number of text lines shared with each neighbouring band
+    
+    Returns:
+        List of (top, bottom, own_top, own_bottom) row ranges
+    """
+    height = gray.shape[0]
+    lines = find_line_bands(gray, padding=0)
+    if len(lines) < 2 or band_count < 2:
+        return [(0, height, 0, height)]
+    
+    # Cut halfway through the gap between consecutive lines
+    cuts = [0] + [(lines[i - 1][1] + lines[i][0]) // 2 for i in range(1, len(lines))] + [height]
+    
+    band_count = min(band_count, len(lines))
+    lines_per_band = len(lines) / band_count
+    bounds = [round(k * lines_per_band) for k in range(band_count + 1)]
+    
+    bands = []
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        top = cuts[max(0, first - overlap_lines)]
+        bottom = cuts[min(len(lines), last + overlap_lines)]
+        bands.append((top, bottom, cuts[first], cuts[last]))
+    return bands
+
+def _ocr_band_task(band, ocr_config, structured):
+    """Preprocess and OCR one band inside a pool worker."""
+    engine = get_ocr_engine(ocr_config)
+    processed = preprocess_for_config(band, ocr_config)
+    tesseract_config = ocr_config.get("config", "--psm 6")
+    if structured:
+        return engine.image_to_data(processed, tesseract_config)
+    return engine.image_to_string(processed, tesseract_config)
+
+def word_boxes_to_text(boxes):
+    """
+    Join word boxes into text lines.
+    
+    Words are ordered by their vertical centre; a word starts a new line
+    when its centre lies below the current line's first word by more than
+    half that word's height. Words within a line are ordered left to right.
+    
+    Args:
+        boxes: Word box array (see WORD_BOX_DTYPE)
+    
+    Returns:
+        Text with one line per text row
+    """
+    lines = []
+    current = []
+    for box in np.sort(boxes, order=['y', 'x']) if len(boxes) else boxes:
+        center = box['y'] + box['height'] / 2
+        if current and center - (current[0]['y'] + current[0]['height'] / 2) > current[0]['height'] / 2:
+            lines.append(current)
+            current = []
+        current.append(box)
+    if current:
+        lines.append(current)
+    return "\n".join(" ".join(str(box['text']) for box in sorted(line, key=lambda box: box['x'])) for line in lines)
+
+def recognize_parallel(image, ocr_config=None, structured=False, workers=None):
+    """
+    OCR an image by splitting it into overlapping bands recognized in parallel.
+    
+    Args:
+        image: PIL Image or numpy array
+        ocr_config: OCR configuration dictionary
+        structured: Return word data instead of plain text
+        workers: Number of worker processes (defaults to the "parallel_workers"
+                 setting, then the CPU count)
+    
+    Returns:
+        Extracted text as string, or a word box array (see WORD_BOX_DTYPE)
+        with coordinates relative to the whole image
+    """
+    ocr_config = ocr_config or {}
+    workers = workers or ocr_config.get("parallel_workers") or os.cpu_count() or 1
+    overlap_lines = ocr_config.get("parallel_overlap_lines", 1)
+    
+    img = np.array(image) if isinstance(image, Image.Image) else image
+    gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY) if len(img.shape) == 3 else img
+    
+    bands = plan_parallel_bands(gray, workers, overlap_lines)
+    if len(bands) > 1:
+        # Bands share lines, so even text mode needs word positions to tell
+        # which band owns each line
+        pool = _get_ocr_pool(workers)
+        futures = [
+            pool.submit(_ocr_band_task, np.ascontiguousarray(gray[top:bottom]), ocr_config, True)
+            for top, bottom, _, _ in bands
+        ]
+        results = [future.result() for future in futures]
+    else:
+        results = [_ocr_band_task(gray, ocr_config, structured)]
+    
+    logging.debug(f"Parallel OCR used {len(bands)} bands on {workers} workers")
+    if len(bands) == 1:
+        return results[0]
+    
+    # Shift word boxes into image coordinates and keep each word only in the
+    # band that owns its vertical centre
+    merged = []
+    for (top, _, own_top, own_bottom), boxes in zip(bands, results):
+        boxes['y'] += top
+        centers = boxes['y'] + boxes['height'] / 2
+        merged.append(boxes[(centers >= own_top) & (centers < own_bottom)])
+    boxes = np.concatenate(merged) if merged else empty_word_boxes()
+    return boxes if structured else word_boxes_to_text(boxes)
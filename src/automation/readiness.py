@@ -0,0 +1,246 @@
+import logging
+import os
+import platform
+import re
+import shutil
+import subprocess
+import time
+import numpy as np
+import pyautogui
+from src.automation.input_ack import ack_region, grab
+from src.automation.timing import get_timing, wait_until
+
+def _run(command, display=None):
+    """Run an X11 query tool on a display (default: $DISPLAY) and return its output, or "" if it fails."""
+    if display:
+        command = command[:1] + ["-display", display] + command[1:]
+    try:
+        return subprocess.run(command, capture_output=True, text=True, timeout=5).stdout
+    except Exception as e:
+        logging.debug(f"{command[0]} failed: {e}")
+        return ""
+
+def x11_supported(display=None):
+    """Check whether X11 windows can be queried (xprop and xwininfo on a display)."""
+    return (platform.system() == "Linux" and bool(display or os.environ.get("DISPLAY"))
+            and shutil.which("xprop") is not None and shutil.which("xwininfo") is not None)
+
+def x11_window_ids(display=None):
+    """
+    List the top-level windows of the X display.
+    
+    Uses the window manager's EWMH _NET_CLIENT_LIST; without a window
+    manager (a bare Xvfb display) the children of the root window are used.
+    
+    Returns:
+        List of window ids as hex strings
+    """
+    output = _run(["xprop", "-root", "_NET_CLIENT_LIST"], display)
+    if "window id #" in output:
+        return re.findall(r"0x[0-9a-fA-F]+", output.split("#", 1)[1])
+    output = _run(["xwininfo", "-root", "-children"], display)
+    return re.findall(r"^\s+(0x[0-9a-fA-F]+)\s", output, re.MULTILINE)
+
+def x11_window_properties(window_id, display=None):
+    """
+    Get the title and class of a window.
+    
+    Returns:
+        Tuple of (title, wm_class); empty strings for missing properties
+    """
+    output = _run(["xprop", "-id", window_id, "_NET_WM_NAME", "WM_NAME", "WM_CLASS"], display)
+    values = {}
+    for line in output.splitlines():
+        match = re.match(r"(\w+)\([^)]*\) = (.*)", line)
+        if match:
+            values[match.group(1)] = match.group(2)
+    title = values.get("_NET_WM_NAME") or values.get("WM_NAME") or ""
+    return title.strip('"'), values.get("WM_CLASS", "")
+
+def x11_window_geometry(window_id, display=None):
+    """
+    Get the screen rectangle of a mapped window.
+    
+    Returns:
+        Tuple (x, y, width, height), or None if the window is not viewable
+    """
+    output = _run(["xwininfo", "-id", window_id], display)
+    values = dict(re.findall(r"^\s*([A-Za-z -]+):\s+(\S+)", output, re.MULTILINE))
+    if values.get("Map State") != "IsViewable":
+        return None
+    try:
+        return (int(values["Absolute upper-left X"]), int(values["Absolute upper-left Y"]),
+                int(values["Width"]), int(values["Height"]))
+    except (KeyError, ValueError):
+        return None
+
+def find_x11_window(title=None, wm_class=None, display=None):
+    """
+    Find a viewable top-level X11 window.
+    
+    Args:
+        title: Text the window title must contain
+        wm_class: Text the WM_CLASS must contain (case-insensitive)
+        display: X display to search (default: $DISPLAY)
+    
+    Returns:
+        Tuple (x, y, width, height) of the first match, or None
+    """
+    for window_id in x11_window_ids(display):
+        window_title, window_class = x11_window_properties(window_id, display)
+        if title and title not in window_title:
+            continue
+        if wm_class and wm_class.lower() not in window_class.lower():
+            continue
+        rect = x11_window_geometry(window_id, display)
+        # Chrome keeps tiny helper windows; only a real browser window counts
+        if rect and rect[2] > 100 and rect[3] > 100:
+            return rect
+    return None
+
+def browser_window_check(display=None):
+    """
+    Get a readiness check that finds the browser window, if the platform allows.
+    
+    Args:
+        display: X display of the browser (default: $DISPLAY)
+    
+    Returns:
+        Callable returning the Chrome window rectangle or None, or None if
+        windows cannot be queried here
+    """
+    if x11_supported(display):
+        return lambda: find_x11_window(wm_class="chrom", display=display)
+    return None
+
+class PageStability:
+    """
+    Readiness check that passes once the page stopped changing.
+    
+    Each call captures the region; the check passes when the last
+    stable_frames captures differed from their predecessor in at most
+    max_changed of the pixels. Uniform frames (a blank page while loading)
+    never count as stable.
+    """
+    
+    def __init__(self, region=None, stable_frames=3, pixel_delta=8, max_changed=0.001, min_contrast=2.0):
+        """
+        Initialize the stability check.
+        
+        Args:
+            region: Screen region (x, y, width, height) to watch (default: the screen)
+            stable_frames: Consecutive unchanged captures required
+            pixel_delta: Gray level difference for a pixel to count as changed
+            max_changed: Fraction of changed pixels still counted as unchanged
+            min_contrast: Minimum gray standard deviation of a frame with content
+        """
+        region = ack_region(region) if region else None
+        if region is None:
+            width, height = pyautogui.size()
+            region = (0, 0, width, height)
+        self.region = region
+        self.stable_frames = stable_frames
+        self.pixel_delta = pixel_delta
+        self.max_changed = max_changed
+        self.min_contrast = min_contrast
+        self.previous = None
+        self.stable = 0
+    
+    def __call__(self):
+        # Every other pixel is plenty to see a page still rendering
+        frame = grab(self.region)[::2, ::2]
+        if self.previous is not None and frame.std() >= self.min_contrast:
+            diff = np.abs(frame.astype(np.int16) - self.previous.astype(np.int16))
+            changed = np.count_nonzero(diff > self.pixel_delta) / diff.size
+            self.stable = self.stable + 1 if changed <= self.max_changed else 0
+        else:
+            self.stable = 0
+        self.previous = frame
+        return self.stable >= self.stable_frames
+
+class ReadinessResult:
+    """
+    Outcome of a readiness probe.
+    
+    Truthy when every phase passed. timings maps each phase that ran to
+    the seconds it took, passed to whether its condition held, and window
+    holds the detected window rectangle.
+    """
+    
+    def __init__(self):
+        self.timings = {}
+        self.passed = {}
+        self.window = None
+    
+    def __bool__(self):
+        return all(self.passed.values())
+    
+    def __repr__(self):
+        phases = ", ".join(f"{name} {'%.1fs' % seconds if self.passed[name] else 'timed out'}"
+                           for name, seconds in self.timings.items())
+        return f"ReadinessResult({phases})"
+
+class ReadinessProbe:
+    """
+    Waits for a launched browser to be usable in three phases.
+    
+    1. window: the browser window appears ("window_detect" wait)
+    2. stable: the page stops changing ("page_settle" wait)
+    3. element: an element such as the prompt box is found ("page_load" wait)
+    
+    Each phase is a named timing wait with a readiness check, so verifying
+    timing profiles end it as soon as its condition holds and the human
+    profile keeps its fixed sleep. Phases without a check are skipped;
+    the stable phase watches the detected window, or the screen.
+    """
+    
+    def __init__(self, window_check=None, element_check=None, region=None, **stability_options):
+        """
+        Initialize the probe.
+        
+        Args:
+            window_check: Callable returning the window rectangle or None
+                          (default: the Chrome window where X11 can be queried)
+            element_check: Callable returning a truthy value once the element is found
+            region: Region watched for stability (default: the window, else the screen)
+            **stability_options: PageStability options
+        """
+        self.window_check = window_check or browser_window_check()
+        self.element_check = element_check
+        self.region = region
+        self.stability_options = stability_options
+    
+    def _phase(self, result, name, wait_name, check):
+        """Run one phase and record its duration."""
+        start_time = time.perf_counter()
+        value = wait_until(wait_name, check)
+        result.timings[name] = time.perf_counter() - start_time
+        result.passed[name] = bool(value)
+        return value
+    
+    def run(self):
+        """
+        Run the phases in order.
+        
+        Returns:
+            ReadinessResult
+        """
+        result = ReadinessResult()
+        if self.window_check is not None:
+            window = self._phase(result, "window", "window_detect", self.window_check)
+            if window and window is not True:
+                result.window = tuple(window)
+        
+        # Stability needs several captures, so without verification the fixed wait stands in for it
+        region = self.region or result.window
+        stability = PageStability(region, **self.stability_options) if get_timing().verify else None
+        self._phase(result, "stable", "page_settle", stability)
+        
+        if self.element_check is not None:
+            self._phase(result, "element", "page_load", self.element_check)
+        
+        if result:
+            logging.info(f"Browser ready: {result}")
+        else:
+            logging.warning(f"Browser readiness incomplete: {result}")
+        return result
@@ -126,13 +126,8 @@ def find_element(ui_element, confidence_override=None, use_advanced=True):
     import logging
     import glob
     import os
-    from src.utils.logging_util import log_with_screenshot
-    
-    # Log beginning of search
-    log_with_screenshot(
-        f"Searching for element: {ui_element.name}", 
-        stage_name=f"SEARCH_{ui_element.name}_START"
-    )
+    from src.utils.logging_util import log_with_screenshot, flush_flight_recorder
+    from src.utils.annotations import match_annotations
     
     confidence = confidence_override or ui_element.confidence
     min_confidence = max(0.4, confidence - 0.2)  # Set a minimum confidence threshold
@@ -146,6 +141,14 @@ def find_element(ui_element, confidence_override=None, use_advanced=True):
         screenshot = pyautogui.screenshot()
         x_offset, y_offset = 0, 0
     
+    # Log beginning of search with the frame being searched
+    log_with_screenshot(
+        f"Searching for element: {ui_element.name}", 
+        stage_name=f"SEARCH_{ui_element.name}_START",
+        image=screenshot,
+        image_origin=(x_offset, y_offset)
+    )
+    
     # Convert screenshot to CV2 format
     screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
     screenshot_gray = cv2.cvtColor(screenshot_cv, cv2.COLOR_BGR2GRAY)
@@ -327,23 +330,6 @@ def find_element(ui_element, confidence_override=None, use_advanced=True):
         except Exception as e:
             logging.warning(f"Error processing reference {reference_path}: {e}")
     
-    if all_matches:
-        all_matches.sort(key=lambda x: x['score'], reverse=True)
-        best_match = all_matches[0]
-        log_with_screenshot(
-            f"Found {ui_element.name} with score {best_match['score']:.2f}", 
-            stage_name=f"FOUND_{ui_element.name}",
-            region=best_match['location']
-        )
-        return best_match['location']
-    else:
-        log_with_screenshot(
-            f"Element {ui_element.name} not found", 
-            level=logging.WARNING,
-            stage_name=f"NOT_FOUND_{ui_element.name}"
-        )
-
-    # If we found any matches, return the best one
     if all_matches:
         # Sort by score, highest first
         all_matches.sort(key=lambda x: x['score'], reverse=True)
@@ -355,50 +341,30 @@ def find_element(ui_element, confidence_override=None, use_advanced=True):
             for i, match in enumerate(all_matches[:min(5, len(all_matches))]):
                 logging.debug(f"Match #{i+1}: score={match['score']:.2f}, method={match['method']}, location={match['location']}")
         
-        # Debug visualization - save image showing what was found
-        debug_dir = "logs/recognition_debug"
-        os.makedirs(debug_dir, exist_ok=True)
-        
-        try:
-            # Take a screenshot and mark all potential matches
-            full_screenshot = pyautogui.screenshot()
-            debug_img = cv2.cvtColor(np.array(full_screenshot), cv2.COLOR_RGB2BGR)
-            
-            # Draw rectangle for each potential match (up to 5)
-            for i, match in enumerate(all_matches[:min(5, len(all_matches))]):
-                x, y, w, h = match['location']
-                
-                # Use different colors based on rank
-                colors = [(0, 255, 0), (0, 255, 255), (0, 165, 255), (0, 0, 255), (128, 0, 255)]
-                color = colors[i] if i < len(colors) else (200, 200, 200)
-                
-                # Draw rectangle
-                cv2.rectangle(debug_img, (x, y), (x + w, y + h), color, 2)
-                
-                # Add text with score
-                cv2.putText(
-                    debug_img,
-                    f"#{i+1}: {match['score']:.2f}",
-                    (x, y - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    color,
-                    1
-                )
-            
-            # Save the debug image
-            import time
-            timestamp = int(time.time())
-            debug_path = f"{debug_dir}/{ui_element.name}_matches_{timestamp}.png"
-            cv2.imwrite(debug_path, debug_img)
-            logging.debug(f"Saved matches debug image to {debug_path}")
-        except Exception as e:
-            logging.error(f"Error saving debug image: {e}")
+        # Record the search frame with the best matches marked; the boxes are
+        # drawn only when the frame is viewed or exported
+        log_with_screenshot(
+            f"Found {ui_element.name} with score {best_match['score']:.2f}", 
+            stage_name=f"FOUND_{ui_element.name}",
+            region=best_match['location'],
+            image=screenshot,
+            image_origin=(x_offset, y_offset),
+            annotations=match_annotations(all_matches, origin=(x_offset, y_offset))
+        )
         
         logging.debug(f"Best match for {ui_element.name}: score={best_match['score']:.2f}, "
                      f"method={best_match['method']}, location={best_match['location']}")
         
         return best_match['location']
+    else:
+        log_with_screenshot(
+            f"Element {ui_element.name} not found", 
+            level=logging.WARNING,
+            stage_name=f"NOT_FOUND_{ui_element.name}",
+            image=screenshot,
+            image_origin=(x_offset, y_offset)
+        )
+        flush_flight_recorder(f"NOT_FOUND_{ui_element.name}")
     
     # If no match was found, return None
     return None
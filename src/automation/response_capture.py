@@ -0,0 +1,240 @@
+import os
+import time
+import logging
+from datetime import datetime
+import cv2
+import numpy as np
+import pyautogui
+from src.automation.interaction import scroll
+from src.automation.ocr import IncrementalOCR, find_line_bands, get_ocr_engine, preprocess_for_config
+
+def grab_gray(region):
+    """
+    Capture a screen region as a grayscale numpy array.
+    
+    Args:
+        region: Tuple (x, y, width, height) defining screen region
+    
+    Returns:
+        Grayscale image as a numpy array
+    """
+    screenshot = pyautogui.screenshot(region=region)
+    return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2GRAY)
+
+def row_signature(gray):
+    """
+    Compute a per-row signature of an image (mean and spread of each row).
+    
+    Args:
+        gray: Grayscale image as a numpy array
+    
+    Returns:
+        Array of shape (height, 2)
+    """
+    rows = gray.astype(np.float32)
+    return np.stack([rows.mean(axis=1), rows.std(axis=1)], axis=1)
+
+def find_scroll_offset(previous, current, min_overlap=20, tolerance=2.0):
+    """
+    Find how many pixels the content moved up between two frames.
+    
+    The bottom of the previous frame is correlated against the top of the
+    current frame using row signatures.
+    
+    Args:
+        previous: Grayscale image before scrolling
+        current: Grayscale image after scrolling (same size)
+        min_overlap: Minimum number of rows the two frames must share
+        tolerance: Maximum mean signature difference for a valid match
+    
+    Returns:
+        Offset in pixels (0 if nothing moved), or None if no overlap was found
+    """
+    prev_sig = row_signature(previous)
+    cur_sig = row_signature(current)
+    height = min(len(prev_sig), len(cur_sig))
+    
+    best_offset, best_error = None, None
+    for offset in range(0, height - min_overlap + 1):
+        error = float(np.abs(prev_sig[offset:height] - cur_sig[:height - offset]).mean())
+        if best_error is None or error < best_error:
+            best_offset, best_error = offset, error
+    
+    if best_error is None or best_error > tolerance:
+        logging.debug(f"No frame overlap found (best error: {best_error})")
+        return None
+    
+    return best_offset
+
+class ScrollCapture:
+    """
+    Capture a response taller than its region by scrolling and stitching frames.
+    
+    Each step scrolls the region, measures how far the content moved, appends
+    only the newly revealed rows to a stitched image and OCRs the text lines
+    that have become complete since the previous step.
+    """
+    
+    def __init__(self, region, config=None):
+        """
+        Initialize the scroll capture.
+        
+        Args:
+            region: Tuple (x, y, width, height) of the scrollable response area
+            config: Optional configuration with "ocr" and "response_capture" sections
+        """
+        self.region = region
+        self.ocr_config = config.get("ocr", {}) if config else {}
+        capture_config = config.get("response_capture", {}) if config else {}
+        self.scroll_clicks = capture_config.get("scroll_clicks", -5)
+        self.max_steps = capture_config.get("max_steps", 50)
+        self.settle_time = capture_config.get("settle_time", 0.3)
+        self.engine = get_ocr_engine(self.ocr_config)
+        
+        self.stitched = None
+        self.ocr_done = 0  # Rows of the stitched image already OCR'd
+        self.lines = []
+        self.ocr_calls = 0
+    
+    def capture(self):
+        """
+        Scroll through the region until the end and return the full transcript.
+        
+        Returns:
+            Transcript as a string
+        """
+        previous = grab_gray(self.region)
+        self.stitched = previous
+        self.ocr_done = 0
+        self.lines = []
+        self.ocr_calls = 0
+        
+        steps = 0
+        while steps < self.max_steps:
+            self._ocr_complete_lines(final=False)
+            
+            if not scroll(self.scroll_clicks, target=self.region):
+                break
+            time.sleep(self.settle_time)
+            steps += 1
+            
+            current = grab_gray(self.region)
+            offset = find_scroll_offset(previous, current)
+            if offset is None:
+                logging.warning("Lost track of the scroll position, stopping capture")
+                break
+            if offset == 0:
+                logging.debug("Content stopped moving, reached the end of the response")
+                break
+            
+            self.stitched = np.vstack([self.stitched, current[-offset:]])
+            previous = current
+        
+        self._ocr_complete_lines(final=True)
+        logging.info(f"Captured {len(self.lines)} lines ({self.stitched.shape[0]} px) "
+                     f"in {steps} scroll steps with {self.ocr_calls} OCR calls")
+        return "\n".join(self.lines)
+    
+    def _ocr_complete_lines(self, final):
+        """
+        OCR the stitched rows that have not been recognized yet.
+        
+        Unless this is the final pass, a line touching the bottom edge may be
+        cut off, so recognition stops at the gap after the last complete line.
+        """
+        strip = self.stitched[self.ocr_done:]
+        bands = find_line_bands(strip, padding=0)
+        if not bands:
+            return
+        
+        if final:
+            cut = strip.shape[0]
+        else:
+            complete = [band for band in bands if band[1] < strip.shape[0] - 1]
+            if not complete:
+                return
+            last_bottom = complete[-1][1]
+            following = [band[0] for band in bands if band[0] >= last_bottom]
+            cut = (last_bottom + following[0]) // 2 if following else strip.shape[0] - 1
+        
+        processed = preprocess_for_config(strip[:cut], self.ocr_config)
+        text = self.engine.image_to_string(processed, self.ocr_config.get("config", "--psm 6"))
+        self.ocr_calls += 1
+        self.lines.extend(line for line in text.splitlines() if line.strip())
+        self.ocr_done += cut
+
+def capture_long_response(region, config=None):
+    """
+    Capture the full text of a response that is taller than its region.
+    
+    Args:
+        region: Tuple (x, y, width, height) of the scrollable response area
+        config: Optional configuration
+    
+    Returns:
+        Transcript as a string, or an empty string on failure
+    """
+    try:
+        return ScrollCapture(region, config).capture()
+    except Exception as e:
+        logging.error(f"Scrolling response capture failed: {e}")
+        return ""
+
+class ResponseCapture:
+    """
+    Capture the response to a prompt while and after it is generated.
+    
+    In "incremental" mode the response area is OCR'd on every update() while
+    the response streams in, so lines scrolling out of view are kept; in
+    "scroll" mode the response is captured once at the end by scrolling
+    through it. Either way finish() saves the transcript to a text file.
+    """
+    
+    def __init__(self, region, config=None):
+        """
+        Initialize the response capture.
+        
+        Args:
+            region: Tuple (x, y, width, height) of the response area
+            config: Optional configuration with "ocr" and "response_capture" sections
+        """
+        self.region = region
+        self.config = config or {}
+        capture_config = self.config.get("response_capture", {}) or {}
+        self.mode = capture_config.get("mode", "scroll")
+        self.output_dir = capture_config.get("output_dir", os.path.join("logs", "responses"))
+        self.incremental = IncrementalOCR(region, self.config) if self.mode == "incremental" else None
+    
+    def update(self):
+        """Bring the transcript up to date (incremental mode only)."""
+        if self.incremental is not None:
+            self.incremental.update()
+    
+    def finish(self, name):
+        """
+        Capture the final transcript and save it.
+        
+        Args:
+            name: File name prefix, e.g. the session and prompt number
+        
+        Returns:
+            Path of the saved transcript, or None if nothing was captured
+        """
+        if self.incremental is not None:
+            text = self.incremental.update()
+        else:
+            text = capture_long_response(self.region, self.config)
+        if not text:
+            logging.warning(f"No response text captured for {name}")
+            return None
+        
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        except OSError as e:
+            logging.error(f"Failed to save the response of {name}: {e}")
+            return None
+        logging.info(f"Saved response of {name} ({len(text.splitlines())} lines) to {path}")
+        return path
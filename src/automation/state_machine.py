@@ -2,11 +2,17 @@ from enum import Enum, auto
 import logging
 import time
 import random
-from src.automation.browser import launch_browser, close_browser, refresh_page
+from src.automation.browser import close_browser, refresh_page, verify_browser_closed, configure_browser_session
 from src.automation.recognition import find_element
-from src.automation.interaction import click_element, send_text
+from src.automation.interaction import click_element, send_text, press_key
+from src.automation.input_ack import ack_region
+from src.automation.readiness import ReadinessProbe
+from src.automation.response_capture import ResponseCapture
+from src.automation.input_strategy import create_input_strategy
+from src.automation.timing import configure_timing, idle_tracker, pause, wait_until
+from src.automation.input_backend import configure_input_backend
 from src.models.ui_element import UIElement
-from src.utils.logging_util import log_with_screenshot
+from src.utils.logging_util import log_with_screenshot, flush_flight_recorder
 from src.utils.reference_manager import ReferenceImageManager
 from src.utils.region_manager import RegionManager
 
@@ -45,10 +51,43 @@ class SimpleAutomationMachine:
         self.reference_manager = ReferenceImageManager()
         # Initialize region manager
         self.region_manager = RegionManager()
+        # Clipboard, bulk or humanized prompt input (can be set per session)
+        self.input_strategy = create_input_strategy(config.get("text_input", {}))
+        # Fast, balanced or human delays between actions
+        self.timing = configure_timing(config.get("timing", {}))
+        # pyautogui, or xdotool/XTest for batched X11 events on Linux
+        self.input_backend = configure_input_backend(config.get("input_backend", {}))
+        # Browser kept open between sessions (shared by the machines of this process)
+        self.browser_session = configure_browser_session(config.get("browser_session", {}))
+        # Session tracker and id receiving a checkpoint per sent prompt (see enable_checkpoints)
+        self.checkpoint_tracker = None
+        self.session_id = None
+        # Optional transcript of each response (scrolling or incremental OCR of response_area)
+        self.response_capture = config.get("response_capture", {}) or {}
         
         # Add a new stage for detecting window positioning
         self.detected_window = False
     
+    def enable_checkpoints(self, tracker, session_id, resume=True):
+        """
+        Checkpoint every acknowledged prompt and resume after the last one sent.
+        
+        Args:
+            tracker: SessionTracker storing the checkpoints
+            session_id: Session the prompts belong to
+            resume: Start at the first prompt an earlier run did not send;
+                    False discards the checkpoint and sends every prompt
+        """
+        self.checkpoint_tracker = tracker
+        self.session_id = session_id
+        if not resume:
+            tracker.clear_prompt_checkpoint(session_id)
+            return
+        self.current_prompt_index = tracker.get_resume_index(session_id, self.prompts)
+        if self.current_prompt_index:
+            logging.info(f"Resuming session {session_id} at prompt {self.current_prompt_index + 1}/{len(self.prompts)} "
+                         f"({self.current_prompt_index} already sent)")
+    
     def run(self):
         """Run the automation state machine until completion or error."""
         while self.state not in [AutomationState.COMPLETE, AutomationState.ERROR]:
@@ -59,6 +98,7 @@ class SimpleAutomationMachine:
             logging.info(f"Automation completed successfully. Sent {self.current_prompt_index} prompts.")
         else:
             logging.error(f"Automation stopped with errors after sending {self.current_prompt_index} prompts.")
+        logging.info("\n" + idle_tracker.report())
     
     def _execute_current_state(self):
         """Execute the current state and transition to the next state."""
@@ -133,14 +173,18 @@ class SimpleAutomationMachine:
         """Launch the browser and navigate to Claude."""
         logging.info("Launching browser")
         
-        # Fix: Pass the entire config object as the second parameter
-        launch_browser(self.config.get("claude_url"), self.config)
-        
-        # Wait for browser to launch and detect window position
-        time.sleep(5)
+        # Navigates a browser left open by the previous session instead of relaunching
+        self.browser_session.open(self.config.get("claude_url"), self.config,
+                                  profile=self.config.get("browser_profile"), ready_check=self._find_prompt_box)
         
-        # Try to detect window position
-        window_rect = self.region_manager.detect_window_position("Claude")
+        # Wait for the Claude window, a stable page and the prompt box; a reused
+        # browser already waited for the prompt box while navigating
+        if self.browser_session.reused:
+            window_rect = self.region_manager.detect_window_position("Claude")
+        else:
+            readiness = ReadinessProbe(lambda: self.region_manager.detect_window_position("Claude"),
+                                       self._find_prompt_box).run()
+            window_rect = readiness.window
         if window_rect:
             logging.info(f"Detected Claude window at {window_rect}")
             # Set an anchor point at the top-left corner of the window
@@ -175,11 +219,13 @@ class SimpleAutomationMachine:
             logging.info("All prompts have been sent")
             log_with_screenshot("All prompts completed", stage_name="PROMPTS_COMPLETED")
             self.state = AutomationState.COMPLETE
-            # Close browser when all prompts are sent
-            self.close_browser()
+            # Close browser when all prompts are sent, unless the next session reuses it
+            if not self.browser_session.reuse:
+                self.close_browser()
             return
         
         current_prompt = self.prompts[self.current_prompt_index]
+        idle_tracker.begin_prompt()
         logging.info(f"Sending prompt {self.current_prompt_index + 1}/{len(self.prompts)}: {current_prompt[:50]}...")
         log_with_screenshot(f"Before sending prompt {self.current_prompt_index + 1}", stage_name="BEFORE_PROMPT")
         
@@ -229,23 +275,33 @@ class SimpleAutomationMachine:
                             stage_name=f"AFTER_{prompt_element_name.upper()}_CLICK")
             
             # Send the prompt text
-            send_text(current_prompt)
+            send_text(current_prompt, strategy=self.input_strategy)
             log_with_screenshot("After typing prompt", stage_name="AFTER_TYPE_PROMPT")
             
-            # Press Enter instead of clicking send button
-            from pyautogui import press
-            press("enter")
-            logging.info("Pressed Enter to send prompt")
+            # Press Enter instead of clicking send button, watching the prompt box
+            # clear as the acknowledgement that the prompt was submitted
+            submitted = press_key("enter", ack=self._prompt_ack_region(prompt_element))
+            if not submitted:
+                log_with_screenshot("Prompt box did not change after Enter", level=logging.ERROR,
+                                    stage_name="PROMPT_NOT_ACKNOWLEDGED")
+                raise Exception("Prompt submission not acknowledged: the prompt box did not change after Enter")
+            logging.info(f"Pressed Enter to send prompt (acknowledged after {submitted.latency * 1000:.0f}ms)")
+            # Checkpoint before the response wait, so a crash during it does not send the prompt again
+            if self.checkpoint_tracker is not None:
+                self.checkpoint_tracker.record_prompt_sent(self.session_id, self.current_prompt_index, self.prompts)
             log_with_screenshot("Prompt sent using Enter key", stage_name="PROMPT_SENT_ENTER")
             
             # Wait fixed 5 minutes (300 seconds) after sending prompt
             fixed_wait_time = 300  # 5 minutes in seconds
             logging.info(f"Waiting {fixed_wait_time} seconds (5 minutes) after sending prompt...")
+            capture = self._start_response_capture()
             
             # Log progress during the fixed wait time at 30-second intervals
             start_time = time.time()
             while time.time() - start_time < fixed_wait_time:
                 time.sleep(30)  # Check every 30 seconds
+                if capture is not None:
+                    capture.update()
                 waited_so_far = time.time() - start_time
                 remaining = fixed_wait_time - waited_so_far
                 if remaining > 0:
@@ -253,6 +309,8 @@ class SimpleAutomationMachine:
             
             logging.info("Completed mandatory 5-minute wait period after sending prompt")
             log_with_screenshot("Completed 5-minute wait period", stage_name="WAIT_COMPLETED")
+            if capture is not None:
+                capture.finish(f"{self.session_id or 'session'}_prompt{self.current_prompt_index + 1}")
             
             # Check for message limit reached notification
             limit_element = self.ui_elements.get("limit_reached")
@@ -267,6 +325,7 @@ class SimpleAutomationMachine:
                     return
             
             # Move to next prompt
+            idle_tracker.end_prompt(f"prompt {self.current_prompt_index + 1}")
             self.current_prompt_index += 1
             
         except Exception as e:
@@ -280,7 +339,8 @@ class SimpleAutomationMachine:
     def _handle_error(self, error):
         """Handle errors and decide whether to retry."""
         logging.error(f"Error in state {self.state}: {error}")
-        log_with_screenshot(f"Error: {error}")
+        log_with_screenshot(f"Error: {error}", level=logging.ERROR, stage_name="ERROR")
+        flush_flight_recorder(f"error_{self.state.name}")
         
         # Analyze error and set failure type if not already set
         if not self.failure_type:
@@ -343,6 +403,10 @@ class SimpleAutomationMachine:
         else:
             self._recover_from_unknown_error()
         
+        # Recovery gave up (an attached browser cannot be restarted here)
+        if self.state == AutomationState.ERROR:
+            return
+        
         # Reset failure type
         self.failure_type = None
         
@@ -355,11 +419,10 @@ class SimpleAutomationMachine:
         
         # Try refreshing the page
         logging.info("Refreshing page...")
-        refresh_page()
-        time.sleep(5)  # Wait for page to reload
+        refresh_page(self._find_prompt_box, ack=True)
         
         # Check if we're still logged in
-        logged_in_element = find_element(self.ui_elements["prompt_box"])
+        logged_in_element = wait_until("page_settle", self._find_prompt_box)
         if not logged_in_element:
             logging.warning("Not logged in after refresh, waiting for login...")
             self.state = AutomationState.WAIT_FOR_LOGIN
@@ -370,39 +433,89 @@ class SimpleAutomationMachine:
         
         # Try refreshing the page
         logging.info("Refreshing page...")
-        refresh_page()
-        time.sleep(7)  # Wait longer for network issues
+        refresh_page(self._find_prompt_box, ack=True)
+        wait_until("network_settle", self._find_prompt_box)  # Wait longer for network issues
     
     def _recover_from_browser_error(self):
         """Recovery strategy for browser errors."""
         logging.info("Recovering from browser error...")
         
-        # Close and relaunch browser
-        self.close_browser()
-        time.sleep(2)
-        logging.info("Relaunching browser...")
-        launch_browser(self.config.get("claude_url"))
-        time.sleep(5)
-        
-        # Wait for login
-        self.state = AutomationState.WAIT_FOR_LOGIN
+        # Close and relaunch browser, then wait for login
+        if self._restart_browser():
+            self.state = AutomationState.WAIT_FOR_LOGIN
     
     def _recover_from_unknown_error(self):
         """Recovery strategy for unknown errors."""
         logging.info("Recovering from unknown error...")
         
         # Try a page refresh first
-        refresh_page()
-        time.sleep(5)
+        refresh_page(self._find_prompt_box, ack=True)
+        wait_until("page_settle", self._find_prompt_box)
         
         # If that doesn't work after a couple of tries, restart the browser
         if self.retry_count > 2:
             logging.info("Multiple failures, restarting browser...")
-            self.close_browser()
-            time.sleep(2)
-            launch_browser(self.config.get("claude_url"))
-            time.sleep(5)
-            self.state = AutomationState.WAIT_FOR_LOGIN
+            if self._restart_browser():
+                self.state = AutomationState.WAIT_FOR_LOGIN
+    
+    def _restart_browser(self):
+        """
+        Close and relaunch the browser.
+        
+        A browser attached from the warm browser pool is not ours to restart:
+        the machine stops with an error instead, and the pool relaunches the
+        browser once the sender has exited.
+        
+        Returns:
+            True if the browser was relaunched, False if the machine stopped
+        """
+        if not self.browser_session.owned:
+            logging.error("Attached browser needs a restart; stopping so the browser pool can relaunch it")
+            self.state = AutomationState.ERROR
+            return False
+        self.close_browser()
+        wait_until("browser_close", verify_browser_closed)
+        logging.info("Relaunching browser...")
+        self.browser_session.open(self.config.get("claude_url"), self.config, profile=self.config.get("browser_profile"))
+        wait_until("browser_relaunch", self._find_prompt_box)
+        return True
+    
+    def _start_response_capture(self):
+        """
+        Start capturing the response to the prompt just sent, if enabled.
+        
+        Returns:
+            ResponseCapture for the response area, or None if capture is
+            disabled or the response area has no known region
+        """
+        if not self.response_capture.get("enabled", False):
+            return None
+        response_element = self.ui_elements.get("response_area")
+        region = response_element.region if response_element else None
+        if not region:
+            logging.warning("Response capture is enabled but response_area has no region, not capturing")
+            return None
+        return ResponseCapture(tuple(region), self.config)
+    
+    def _prompt_ack_region(self, prompt_element):
+        """
+        Get the region watched for a prompt submission.
+        
+        The prompt box itself when its location is known, otherwise the
+        bottom third of the screen, where the chat input is.
+        """
+        region = ack_region(prompt_element)
+        if region is None:
+            import pyautogui
+            width, height = pyautogui.size()
+            region = (0, height * 2 // 3, width, height - height * 2 // 3)
+            logging.warning(f"Prompt box location unknown, watching the bottom of the screen {region} for the submission")
+        return region
+    
+    def _find_prompt_box(self):
+        """Readiness check for timing waits: locate the prompt box, if one is defined."""
+        prompt_box = self.ui_elements.get("prompt_box")
+        return find_element(prompt_box) if prompt_box else None
     
     def _classify_error(self, error):
         """Classify the type of error based on the exception."""
@@ -438,27 +551,32 @@ class SimpleAutomationMachine:
     def cleanup(self):
         """Clean up resources before exit."""
         logging.info("Cleaning up resources")
-        self.close_browser()
+        # A reused browser stays open for the next session; close_browser_session ends it
+        if not self.browser_session.reuse or self.state != AutomationState.COMPLETE:
+            self.close_browser()
         
     def close_browser(self):
-        """Close browser with verification and retry."""
+        """Close browser with verification and retry (an attached browser is left to its owner)."""
+        if not self.browser_session.owned:
+            logging.info("Leaving the attached browser running for the browser pool")
+            return True
         logging.info("Closing browser...")
         
         # First attempt
-        if close_browser():
+        if self.browser_session.close():
             logging.info("Browser closed successfully")
             return True
             
         # Retry if first attempt fails
         logging.warning("First attempt to close browser failed, retrying...")
-        time.sleep(2)
+        pause("browser_close")
         
         # Second attempt with force
         from pyautogui import hotkey
         try:
             # Try to use Alt+F4 to force close
             hotkey('alt', 'f4')
-            time.sleep(1)
+            wait_until("browser_close", verify_browser_closed, timeout=1)
             
             # One more try with browser close function
             if close_browser():
@@ -0,0 +1,252 @@
+import logging
+import threading
+import time
+import pyautogui
+
+# Fixed waits of the original automation (seconds); the human profile keeps
+# them and they are the baseline for the idle time report
+HUMAN_WAITS = {
+    "browser_start": 10.0,    # After launching the browser process
+    "window_detect": 5.0,     # Before looking for the browser window
+    "page_load": 5.0,         # After a page refresh
+    "page_settle": 5.0,       # Before checking the page again after a refresh
+    "network_settle": 7.0,    # Extra wait after a refresh on network errors
+    "browser_close": 2.0,     # After closing the browser
+    "browser_relaunch": 5.0,  # After relaunching the browser
+    "navigate": 2.0,          # After navigating a reused browser to a session's URL
+    "login": 15.0,            # For the page to load and any login (simple_sender)
+    "clear_field": 0.5,       # After select all / delete in the prompt field (simple_sender)
+    "type_settle": 1.0,       # Between typing a prompt and pressing Enter (simple_sender)
+    "retry": 1.0              # Between interaction retries
+}
+
+class TimingProfile:
+    """
+    Named set of inter-action delays.
+    
+    action_pause is applied by pyautogui after every call, mouse_move is the
+    duration of the humanized mouse tween before clicks and waits holds the
+    durations of the named waits. With verify enabled a named wait that has
+    a readiness check polls it every poll_interval and returns as soon as it
+    passes, using the wait duration only as a timeout; named waits without
+    a check sleep for their duration scaled by unchecked_scale.
+    """
+    
+    def __init__(self, name, action_pause=0.5, mouse_move=0.5, verify=False, poll_interval=0.5,
+                 unchecked_scale=1.0, waits=None):
+        """
+        Initialize the timing profile.
+        
+        Args:
+            name: Profile name
+            action_pause: Seconds pyautogui pauses after each action
+            mouse_move: Seconds of mouse movement before a click (0 to jump)
+            verify: Poll readiness checks instead of sleeping fixed times
+            poll_interval: Seconds between readiness checks
+            unchecked_scale: Factor applied to named waits without a check
+            waits: Dictionary of named wait durations (default: HUMAN_WAITS)
+        """
+        self.name = name
+        self.action_pause = action_pause
+        self.mouse_move = mouse_move
+        self.verify = verify
+        self.poll_interval = poll_interval
+        self.unchecked_scale = unchecked_scale
+        self.waits = dict(HUMAN_WAITS)
+        self.waits.update(waits or {})
+    
+    def wait_time(self, name):
+        """Get the duration of a named wait in seconds."""
+        if name not in self.waits:
+            logging.warning(f"Unknown timing wait '{name}', using 1 second")
+        return self.waits.get(name, 1.0)
+
+PROFILES = {
+    "human": TimingProfile("human", action_pause=0.5, mouse_move=0.5, poll_interval=0.5),
+    "balanced": TimingProfile("balanced", action_pause=0.1, mouse_move=0.15, verify=True, poll_interval=0.5),
+    "fast": TimingProfile("fast", action_pause=0.02, mouse_move=0.0, verify=True, poll_interval=0.2,
+                          unchecked_scale=0.5)
+}
+
+class IdleTracker:
+    """
+    Accumulates the time spent in delays, per prompt and for the whole run.
+    
+    Every delay is recorded with the time it took and the time the human
+    profile would have spent on it, so the report shows how much idle time
+    the active profile eliminated.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.prompt = {}
+        self.total = {}
+        self.prompts = 0
+    
+    def record(self, name, actual, baseline):
+        """
+        Record a delay.
+        
+        Args:
+            name: Delay name (a named wait, "action_pause" or "mouse_move")
+            actual: Seconds actually spent
+            baseline: Seconds the human profile would have spent
+        """
+        with self._lock:
+            for totals in (self.prompt, self.total):
+                entry = totals.setdefault(name, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += actual
+                entry[2] += baseline
+    
+    def begin_prompt(self):
+        """Start counting the delays of a new prompt."""
+        with self._lock:
+            self.prompt = {}
+    
+    def end_prompt(self, label="prompt"):
+        """
+        Log and return the delays of the current prompt.
+        
+        Args:
+            label: Prompt description used in the log message
+        
+        Returns:
+            Tuple of (idle seconds, eliminated seconds)
+        """
+        with self._lock:
+            idle = sum(entry[1] for entry in self.prompt.values())
+            eliminated = sum(entry[2] - entry[1] for entry in self.prompt.values())
+            self.prompts += 1
+        logging.info(f"Idle time for {label}: {idle:.1f}s ({eliminated:.1f}s eliminated "
+                     f"by the {_profile.name} timing profile)")
+        return idle, eliminated
+    
+    def report(self):
+        """
+        Format the idle time of the run by delay name.
+        
+        Returns:
+            Multi-line report text
+        """
+        with self._lock:
+            rows = sorted(self.total.items(), key=lambda item: item[1][2] - item[1][1], reverse=True)
+            prompts = max(1, self.prompts)
+        lines = [f"=== IDLE TIME ({_profile.name} profile, {self.prompts} prompts) ===",
+                 f"{'Delay':<18} {'Count':>6} {'Idle s':>8} {'Human s':>8} {'Saved s':>8} {'Saved/prompt':>13}"]
+        for name, (count, actual, baseline) in rows:
+            lines.append(f"{name:<18} {count:>6} {actual:>8.1f} {baseline:>8.1f} {baseline - actual:>8.1f} "
+                         f"{(baseline - actual) / prompts:>13.1f}")
+        idle = sum(entry[1] for _, entry in rows)
+        baseline = sum(entry[2] for _, entry in rows)
+        lines.append(f"{'total':<18} {'':>6} {idle:>8.1f} {baseline:>8.1f} {baseline - idle:>8.1f} "
+                     f"{(baseline - idle) / prompts:>13.1f}")
+        return "\n".join(lines)
+
+_profile = PROFILES["human"]
+idle_tracker = IdleTracker()
+
+def configure_timing(settings=None):
+    """
+    Select the timing profile and apply its pyautogui pause.
+    
+    Args:
+        settings: "timing" configuration dictionary with a profile name
+                  ("fast", "balanced" or "human") and optional overrides of
+                  the profile's action_pause, mouse_move, verify,
+                  poll_interval, unchecked_scale and waits
+    
+    Returns:
+        The active TimingProfile
+    """
+    global _profile
+    settings = settings or {}
+    name = settings.get("profile", "human")
+    if name not in PROFILES:
+        logging.warning(f"Unknown timing profile '{name}', using human")
+        name = "human"
+    
+    base = PROFILES[name]
+    waits = dict(base.waits)
+    waits.update(settings.get("waits") or {})
+    _profile = TimingProfile(
+        name,
+        action_pause=settings.get("action_pause", base.action_pause),
+        mouse_move=settings.get("mouse_move", base.mouse_move),
+        verify=settings.get("verify", base.verify),
+        poll_interval=settings.get("poll_interval", base.poll_interval),
+        unchecked_scale=settings.get("unchecked_scale", base.unchecked_scale),
+        waits=waits
+    )
+    pyautogui.PAUSE = _profile.action_pause
+    logging.info(f"Using {name} timing profile (action pause {_profile.action_pause}s, "
+                 f"mouse move {_profile.mouse_move}s, verify {_profile.verify})")
+    return _profile
+
+def get_timing():
+    """Get the active timing profile."""
+    return _profile
+
+def note_actions(count=1):
+    """
+    Account for the pyautogui pause after a number of actions.
+    
+    pyautogui sleeps itself; this only records the time for the idle report.
+    """
+    idle_tracker.record("action_pause", count * _profile.action_pause,
+                        count * PROFILES["human"].action_pause)
+
+def note_mouse_move(duration):
+    """Account for a mouse movement tween in the idle report."""
+    idle_tracker.record("mouse_move", duration, PROFILES["human"].mouse_move)
+
+def pause(name):
+    """
+    Sleep for a named wait of the active profile.
+    
+    Args:
+        name: Wait name (see HUMAN_WAITS)
+    """
+    return wait_until(name)
+
+def wait_until(name, check=None, timeout=None):
+    """
+    Wait for a named wait of the active profile.
+    
+    With a readiness check and a verifying profile, the check is polled and
+    the wait ends as soon as it returns a truthy value; the named duration
+    (or timeout) bounds the wait. Otherwise the profile's fixed duration is
+    slept and the check, if any, is evaluated once afterwards.
+    
+    Args:
+        name: Wait name (see HUMAN_WAITS)
+        check: Optional callable returning a truthy value when ready
+        timeout: Optional override of the named duration
+    
+    Returns:
+        Result of the check (True if there is none), or None on timeout
+    """
+    duration = timeout if timeout is not None else _profile.wait_time(name)
+    baseline = timeout if timeout is not None else PROFILES["human"].wait_time(name)
+    start_time = time.perf_counter()
+    
+    try:
+        if check is not None and _profile.verify:
+            deadline = start_time + duration
+            while True:
+                result = check()
+                if result:
+                    logging.debug(f"{name} ready after {time.perf_counter() - start_time:.2f}s")
+                    return result
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    logging.debug(f"{name} not ready after {duration:.1f}s")
+                    return None
+                time.sleep(min(_profile.poll_interval, remaining))
+        
+        if check is None:
+            duration *= _profile.unchecked_scale if _profile.verify else 1.0
+        time.sleep(duration)
+        return check() if check is not None else True
+    finally:
+        idle_tracker.record(name, time.perf_counter() - start_time, baseline)
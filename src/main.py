@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 from src.automation.state_machine import SimpleAutomationMachine
+from src.automation.browser import attach_browser_session, close_browser_session
 from src.utils.config_manager import ConfigManager
-from src.utils.logging_util import setup_visual_logging
+from src.utils.logging_util import setup_visual_logging, configure_screenshot_logging
 from src.utils.session_tracker import SessionTracker
+from src.utils.log_retention import LogRetentionManager, configure_log_retention
 import argparse
 import logging
 import os
+import sys
 import time
 import copy
 from src.utils.region_manager import RegionManager
@@ -36,6 +39,8 @@ def parse_arguments():
                       help="Force run all sessions even if they've been completed")
     parser.add_argument("--session-delay", type=int, default=5,
                       help="Delay in seconds between running sessions")
+    parser.add_argument("--no-resume", action="store_false", dest="resume",
+                      help="Send every prompt again instead of resuming after the last prompt sent")
     # Config preservation 
     parser.add_argument("--preserve-config", action="store_true", 
                       help="Preserve original configuration (don't overwrite)")
@@ -46,6 +51,12 @@ def parse_arguments():
                       help="Show differences between original and current config")
     parser.add_argument("--cleanup-temp-configs", type=int, metavar="DAYS",
                       help="Remove temporary config files older than specified days")
+    parser.add_argument("--browser-profile", default=None,
+                       help="Chrome user data directory (overrides browser_profile; used by parallel workers)")
+    parser.add_argument("--attach-browser", metavar="URL", default=None,
+                       help="Use the browser already running with the profile and showing URL (warm browser pool)")
+    parser.add_argument("--prune-logs", action="store_true",
+                      help="Apply the log retention settings to the logs directory once and exit")
     # Coordinate options
     parser.add_argument("--use-coordinates", action="store_true",
                       help="Prioritize coordinate-based clicking over visual recognition")
@@ -81,7 +92,21 @@ def cleanup_temp_configs(days_old=7):
     
     logging.info(f"Removed {count} temporary config files")
 
-def run_session(session_id, config_manager, preserve_config=False, args=None):
+def prune_logs(settings, protected=None):
+    """Apply the log retention settings until nothing more is over the limits."""
+    max_size_mb = settings.get("max_size_mb", 2048)
+    manager = LogRetentionManager(
+        max_bytes=max_size_mb * 1024 * 1024 if max_size_mb else None,
+        max_age_days=settings.get("max_age_days", 14),
+        keep_errors=settings.get("keep_errors", True),
+        protected=protected
+    )
+    while manager.prune()[0]:
+        pass
+    logging.info(f"Removed {manager.removed} log artifacts ({manager.removed_bytes / 1e6:.1f} MB), "
+                 f"{manager.total_size() / 1e6:.1f} MB of logs remaining")
+
+def run_session(session_id, config_manager, preserve_config=False, args=None, tracker=None):
     """
     Run a single session.
     
@@ -90,6 +115,7 @@ def run_session(session_id, config_manager, preserve_config=False, args=None):
         config_manager: ConfigManager instance
         preserve_config: Whether to preserve original config
         args: Command line arguments
+        tracker: SessionTracker checkpointing the sent prompts (resumes an interrupted session)
         
     Returns:
         bool: True if successful, False if failed
@@ -202,6 +228,10 @@ def run_session(session_id, config_manager, preserve_config=False, args=None):
     if hasattr(state_machine, 'set_preserve_config') and callable(getattr(state_machine, 'set_preserve_config')):
         state_machine.set_preserve_config(preserve_config)
     
+    # Checkpoint each sent prompt and continue after the last one an earlier run sent
+    if tracker is not None:
+        state_machine.enable_checkpoints(tracker, session_id, resume=getattr(args, "resume", True))
+    
     # Start automation
     success = False
     try:
@@ -252,6 +282,22 @@ def main():
     # Load configuration
     config = ConfigManager(args.config)
     
+    if args.browser_profile:
+        config.set("browser_profile", args.browser_profile)
+    if args.attach_browser:
+        attach_browser_session(args.attach_browser, config.get("browser_session", {}), config.get("browser_profile"))
+    
+    # Start the background screenshot writer with the configured queue settings
+    configure_screenshot_logging(config.get("screenshot_logging", {}))
+    
+    # Keep the logs directory within its size and age limits
+    retention_settings = config.get("log_retention", {}) or {}
+    if args.prune_logs:
+        prune_logs(retention_settings, protected=[log_dir])
+        logging.info("Log pruning completed. Exiting.")
+        return
+    configure_log_retention(retention_settings, protected=[log_dir])
+    
     # Restore original configuration if requested
     if args.restore_original_config:
         if config.restore_original_config():
@@ -335,7 +381,7 @@ def main():
         elif session_id != "default" and session_id not in sessions:
             logging.error(f"Session '{session_id}' not found in configuration")
             print(f"Error: Session '{session_id}' not found. Use --list-sessions to see available sessions.")
-            return
+            return 1
         
         sessions_to_run.append(session_id)
     
@@ -390,7 +436,7 @@ def main():
             working_config = config
         
         # Run the session
-        success = run_session(session_id, working_config, preserve_config, args)
+        success = run_session(session_id, working_config, preserve_config, args, session_tracker)
         
         # Track session completion
         session_tracker.mark_completed(session_id, success)
@@ -401,6 +447,9 @@ def main():
             logging.info(f"Waiting {delay} seconds before next session...")
             time.sleep(delay)
     
+    # Close the browser the sessions shared
+    close_browser_session()
+    
     # Show completion summary
     if len(sessions_to_run) > 1:
         logging.info("All sessions completed")
@@ -422,6 +471,10 @@ def main():
             logging.error(f"Error saving preserved configuration: {e}")
     
     logging.info("Automation complete")
+    
+    # Non-zero exit status if any session failed (read by the parallel runner)
+    statuses = [session_tracker.get_session_status(session_id) for session_id in sessions_to_run]
+    return 0 if all(status.get('success', False) for status in statuses) else 1
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
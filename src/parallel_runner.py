@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Parallel Session Runner
+
+Runs the sessions of the configuration on several isolated virtual displays
+at once. Every worker owns a private Xvfb display and its own copy of the
+browser profile, and runs its sessions one after another as separate
+automation processes (src.main or src.simple_sender) with DISPLAY pointing
+at its display, so their input, screen capture and browser windows never
+see another worker's. Results are recorded in the shared session status
+file.
+
+With a warm browser pool, browsers are launched ahead of time on standby
+displays, already showing the URL of an upcoming session. A worker takes a
+warm browser for each session and runs the sender on that browser's display,
+attached to it, so the session does not wait for a browser launch; the pool
+recycles the browser in the background afterwards.
+
+Linux only (requires Xvfb).
+"""
+
+import argparse
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+import yaml
+from src.utils.session_tracker import SessionTracker
+from src.utils.virtual_display import start_displays
+from src.utils.browser_profile import prepare_profile
+
+SENDERS = {
+    "main": "src.main",
+    "simple": "src.simple_sender"
+}
+
+def setup_logging():
+    """Log to the console and to a timestamped directory for the worker output."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_dir = os.path.join("logs", f"parallel_{timestamp}")
+    os.makedirs(log_dir, exist_ok=True)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(log_dir, "runner.log")),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    return log_dir
+
+def load_config(config_path):
+    """Load the configuration file."""
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+class Worker(threading.Thread):
+    """
+    Runs sessions from a shared queue on one virtual display.
+    
+    Each session is a separate sender process started with the display's
+    environment and the worker's browser profile; its output goes to a log
+    file per session and its exit status decides the session's success.
+    """
+    
+    def __init__(self, index, display, profile_dir, sessions, tracker, command, log_dir,
+                 session_timeout=None, session_delay=0, browsers=None, urls=None):
+        """
+        Initialize the worker.
+        
+        Args:
+            index: Worker number
+            display: Started VirtualDisplay of this worker
+            profile_dir: Browser profile copy of this worker
+            sessions: queue.Queue of session ids shared by all workers
+            tracker: SessionTracker receiving the results
+            command: Sender command line without the session arguments
+            log_dir: Directory for the session output logs
+            session_timeout: Maximum seconds per session (None for no limit)
+            session_delay: Seconds to wait between sessions
+            browsers: WarmBrowserPool to take a running browser from per session
+                      (the worker's own display and profile are then unused)
+            urls: Dictionary mapping session ids to their URLs, for the pool
+        """
+        super().__init__(name=f"worker-{index}", daemon=True)
+        self.index = index
+        self.display = display
+        self.profile_dir = profile_dir
+        self.sessions = sessions
+        self.tracker = tracker
+        self.command = command
+        self.log_dir = log_dir
+        self.session_timeout = session_timeout
+        self.session_delay = session_delay
+        self.browsers = browsers
+        self.urls = urls or {}
+        self.results = {}
+        self.process = None
+        self.stopping = False
+    
+    def run(self):
+        first = True
+        while not self.stopping:
+            try:
+                session_id = self.sessions.get_nowait()
+            except queue.Empty:
+                break
+            if not first and self.session_delay:
+                time.sleep(self.session_delay)
+            first = False
+            self.results[session_id] = self.run_session(session_id)
+    
+    def run_session(self, session_id):
+        """
+        Run one session in a sender process on this worker's display.
+        
+        Returns:
+            True if the sender exited successfully, False otherwise
+        """
+        start_time = time.time()
+        display, profile_dir, slot = self.display, self.profile_dir, None
+        cmd = self.command + ["--session", session_id, "--run-one"]
+        if self.browsers is not None:
+            url = self.urls.get(session_id)
+            slot = self.browsers.acquire(url, timeout=self.session_timeout)
+            if slot is None:
+                logging.error(f"Worker {self.index} got no warm browser for session {session_id}")
+                self.tracker.mark_completed(session_id, False, notes=f"worker {self.index}, no warm browser")
+                return False
+            display, profile_dir = slot.display, slot.profile_dir
+            cmd += ["--attach-browser", slot.url]
+        cmd += ["--browser-profile", profile_dir]
+        log_path = os.path.join(self.log_dir, f"worker{self.index}_{session_id}.log")
+        logging.info(f"Worker {self.index} ({display.name}) starting session {session_id}")
+        
+        returncode = None
+        with open(log_path, "w") as log_file:
+            try:
+                self.process = subprocess.Popen(cmd, env=display.env(), stdout=log_file,
+                                                stderr=subprocess.STDOUT)
+                returncode = self.process.wait(timeout=self.session_timeout)
+            except subprocess.TimeoutExpired:
+                logging.error(f"Session {session_id} exceeded {self.session_timeout}s on worker {self.index}")
+                self.process.kill()
+                self.process.wait()
+            except Exception as e:
+                logging.error(f"Worker {self.index} failed to run session {session_id}: {e}")
+            finally:
+                self.process = None
+                if slot is not None:
+                    # A failed session may have left the browser in any state, so the pool relaunches it
+                    self.browsers.release(slot, url, healthy=returncode == 0)
+        
+        elapsed = time.time() - start_time
+        success = returncode == 0
+        self.tracker.mark_completed(session_id, success,
+                                    notes=f"worker {self.index} on {display.name}, "
+                                          f"exit code {returncode}, {elapsed:.0f}s")
+        logging.info(f"Worker {self.index} finished session {session_id} "
+                     f"{'successfully' if success else 'with failure'} in {elapsed:.0f}s (log: {log_path})")
+        return success
+    
+    def stop(self):
+        """Stop taking sessions and terminate the running sender."""
+        self.stopping = True
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+def run_parallel(config_path, session_ids, workers=2, sender="main", display_base=100,
+                 screen="1920x1080x24", profiles_dir="profiles", refresh_profiles=False,
+                 session_timeout=None, session_delay=0, sender_args=None, log_dir="logs",
+                 tracker=None, warm_pool=0, recycle_after=1, refresh_profile=False):
+    """
+    Run sessions on parallel workers, each on its own virtual display.
+    
+    Args:
+        config_path: Configuration file passed to the sender processes
+        session_ids: Sessions to run, in start order
+        workers: Number of workers (capped at the number of sessions)
+        sender: "main" (state machine) or "simple" (simple_sender)
+        display_base: Lowest X display number to use
+        screen: Screen size of the displays (WIDTHxHEIGHTxDEPTH)
+        profiles_dir: Directory for the worker profile copies
+        refresh_profiles: Copy the base profile again for every worker
+        session_timeout: Maximum seconds per session (None for no limit)
+        session_delay: Seconds each worker waits between sessions
+        sender_args: Extra arguments for the sender processes
+        log_dir: Directory for the session output logs
+        tracker: SessionTracker receiving the results
+        warm_pool: Extra browsers kept pre-launched on standby displays (0 disables the pool)
+        recycle_after: Sessions a warm browser serves before it is relaunched
+        refresh_profile: Copy the base profile again when a warm browser is relaunched
+    
+    Returns:
+        Dictionary mapping session ids to success
+    """
+    tracker = tracker or SessionTracker()
+    config = load_config(config_path)
+    base_profile = config.get("browser_profile") or os.path.join(os.path.expanduser("~"), "ClaudeProfile")
+    
+    command = [sys.executable, "-m", SENDERS[sender], "--config", config_path]
+    if sender == "main":
+        # Preprocessing saves the configuration file, which the workers share
+        command.append("--skip-preprocessing")
+    command += list(sender_args or [])
+    
+    pending = queue.Queue()
+    for session_id in session_ids:
+        pending.put(session_id)
+    
+    count = max(1, min(workers, len(session_ids)))
+    warm_pool = max(0, warm_pool)
+    # A warm pool needs a browser for every worker plus the standby ones
+    displays = start_displays(count + warm_pool if warm_pool else count, display_base, screen)
+    threads = []
+    browsers = None
+    try:
+        urls = {}
+        if warm_pool:
+            # Imported late: the input and capture modules connect to $DISPLAY on import. The
+            # runner itself never uses that connection; browsers get their display through env()
+            with displays[0].active():
+                from src.automation.browser_pool import WarmBrowserPool
+                from src.automation.timing import configure_timing
+            configure_timing(config.get("timing", {}))
+            
+            sessions = config.get("sessions", {}) or {}
+            default_url = config.get("claude_url", "https://claude.ai")
+            urls = {session_id: (sessions.get(session_id) or {}).get("claude_url", default_url)
+                    for session_id in session_ids}
+            browsers = WarmBrowserPool(displays, base_profile, profiles_dir, config.get("chrome_path"), default_url,
+                                       recycle_after=recycle_after, refresh_profile=refresh_profile)
+            browsers.start([urls[session_id] for session_id in session_ids])
+            logging.info(f"Warm browser pool of {len(displays)} browsers starting")
+        
+        for index in range(1, count + 1):
+            if browsers is not None:
+                threads.append(Worker(index, None, None, pending, tracker, command, log_dir,
+                                      session_timeout, session_delay, browsers=browsers, urls=urls))
+                continue
+            display = displays[index - 1]
+            profile_dir = prepare_profile(base_profile, os.path.abspath(os.path.join(profiles_dir, f"worker{index}")),
+                                          refresh_profiles)
+            threads.append(Worker(index, display, profile_dir, pending, tracker, command, log_dir,
+                                  session_timeout, session_delay))
+        
+        logging.info(f"Running {len(session_ids)} sessions on {len(threads)} workers")
+        for worker in threads:
+            worker.start()
+        for worker in threads:
+            # Join with a timeout so Ctrl+C reaches the main thread
+            while worker.is_alive():
+                worker.join(timeout=1.0)
+    except KeyboardInterrupt:
+        logging.info("Stopping workers")
+        for worker in threads:
+            worker.stop()
+        for worker in threads:
+            worker.join(timeout=10)
+    finally:
+        if browsers is not None:
+            browsers.close()
+        for display in displays:
+            display.stop()
+    
+    results = {}
+    for worker in threads:
+        results.update(worker.results)
+    return results
+
+def main():
+    log_dir = setup_logging()
+    
+    parser = argparse.ArgumentParser(
+        description="Run sessions in parallel on isolated Xvfb displays (unknown arguments go to the sender)")
+    parser.add_argument("--config", help="Path to config file", default="config/user_config.yaml")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel workers")
+    parser.add_argument("--sender", choices=sorted(SENDERS), default=None,
+                        help="Automation run by the workers: main (state machine) or simple (simple_sender)")
+    parser.add_argument("--sessions", nargs="+", default=None, help="Sessions to run (default: all)")
+    parser.add_argument("--no-skip-completed", action="store_false", dest="skip_completed",
+                        help="Also run sessions marked as completed")
+    parser.add_argument("--display-base", type=int, default=None, help="Lowest X display number to use")
+    parser.add_argument("--screen", default=None, help="Virtual screen size, e.g. 1920x1080x24")
+    parser.add_argument("--profiles-dir", default=None, help="Directory for the worker browser profiles")
+    parser.add_argument("--refresh-profiles", action="store_true",
+                        help="Copy the browser profile again for every worker")
+    parser.add_argument("--session-timeout", type=int, default=None, help="Maximum seconds per session")
+    parser.add_argument("--warm-pool", type=int, default=None,
+                        help="Extra browsers kept pre-launched on standby displays (0 disables the pool)")
+    args, sender_args = parser.parse_known_args()
+    
+    config = load_config(args.config)
+    settings = config.get("parallel", {}) or {}
+    warm_settings = settings.get("warm_pool", {}) or {}
+    sessions = config.get("sessions", {}) or {}
+    if not sessions:
+        logging.error("No sessions defined in configuration.")
+        return 1
+    
+    tracker = SessionTracker()
+    session_ids = args.sessions or sorted(sessions.keys())
+    unknown = [session_id for session_id in session_ids if session_id not in sessions]
+    if unknown:
+        logging.error(f"Sessions not found in configuration: {', '.join(unknown)}")
+        return 1
+    if args.skip_completed:
+        skipped = [session_id for session_id in session_ids if tracker.is_completed(session_id)]
+        if skipped:
+            logging.info(f"Skipping completed sessions: {', '.join(skipped)}")
+        session_ids = [session_id for session_id in session_ids if session_id not in skipped]
+    if not session_ids:
+        print("All sessions have been completed.")
+        return 0
+    
+    results = run_parallel(
+        args.config, session_ids,
+        workers=args.workers or settings.get("workers", 2),
+        sender=args.sender or settings.get("sender", "main"),
+        display_base=args.display_base or settings.get("display_base", 100),
+        screen=args.screen or settings.get("screen", "1920x1080x24"),
+        profiles_dir=args.profiles_dir or settings.get("profiles_dir", "profiles"),
+        refresh_profiles=args.refresh_profiles,
+        session_timeout=args.session_timeout or settings.get("session_timeout"),
+        session_delay=settings.get("session_delay", 0),
+        sender_args=sender_args,
+        log_dir=log_dir,
+        tracker=tracker,
+        warm_pool=args.warm_pool if args.warm_pool is not None else warm_settings.get("size", 0),
+        recycle_after=warm_settings.get("recycle_after", 1),
+        refresh_profile=warm_settings.get("refresh_profile", False)
+    )
+    
+    logging.info("=== SESSION RESULTS SUMMARY ===")
+    for session_id in session_ids:
+        status = "SUCCESS" if results.get(session_id) else ("FAILED" if session_id in results else "NOT RUN")
+        logging.info(f"Session '{session_id}': {status}")
+    successful = sum(1 for success in results.values() if success)
+    logging.info(f"{successful}/{len(session_ids)} sessions successful")
+    return 0 if successful == len(session_ids) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
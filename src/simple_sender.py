@@ -7,16 +7,26 @@ Launches the browser for each session, types prompts, presses Enter, and
 closes the browser before moving to the next session.
 """
 
-import subprocess
 import time
 import argparse
 import os
 import logging
 import yaml
-import pyautogui
 import sys
 from datetime import datetime
-import random
+import pyautogui
+# Only modules without OpenCV or recognition imports, so this sender runs without them
+from src.automation.input_strategy import HumanizedInput, create_input_strategy
+from src.automation.timing import configure_timing, idle_tracker, note_actions, pause
+from src.automation.input_backend import configure_input_backend, get_input_backend
+from src.automation.browser_session import BrowserSession
+from src.automation.browser_process import BrowserProcess, browser_running, get_chrome_path, kill_browser
+from src.automation.readiness import ReadinessProbe, browser_window_check
+from src.automation.input_ack import ack_region, acknowledge
+from src.utils.session_tracker import SessionTracker
+
+# The launched browser; closing it leaves other workers' browsers alone
+_process = None
 
 # Set up logging
 def setup_logging():
@@ -49,39 +59,9 @@ def load_config(config_path="config/user_config.yaml"):
         logging.error(f"Error loading configuration: {e}")
         return {}
 
-def get_chrome_path():
-    """Find Chrome browser path based on OS."""
-    import platform
-    
-    system = platform.system()
-    
-    if system == "Windows":
-        paths = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            os.path.join(os.environ.get("LOCALAPPDATA", ""), r"Google\Chrome\Application\chrome.exe")
-        ]
-    elif system == "Darwin":  # macOS
-        paths = [
-            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            os.path.expanduser("~/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
-        ]
-    else:  # Linux and others
-        paths = [
-            "/usr/bin/google-chrome",
-            "/usr/bin/chromium-browser",
-            "/usr/bin/chromium"
-        ]
-    
-    # Return the first path that exists
-    for path in paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
-
 def launch_browser(url, profile_dir=None):
     """Launch Chrome browser with specified URL and profile."""
+    global _process
     chrome_path = get_chrome_path()
     if not chrome_path:
         logging.error("Chrome browser not found.")
@@ -90,85 +70,112 @@ def launch_browser(url, profile_dir=None):
     if not profile_dir:
         profile_dir = os.path.join(os.path.expanduser("~"), "ClaudeProfile")
     
-    # Ensure profile directory exists
-    os.makedirs(profile_dir, exist_ok=True)
-    
-    cmd = [
-        chrome_path,
-        f"--user-data-dir={profile_dir}",
-        "--start-maximized",
-        "--disable-extensions",
-        url
-    ]
-    
     try:
         logging.info(f"Launching Chrome: {chrome_path}")
         logging.info(f"Using profile: {profile_dir}")
         logging.info(f"Navigating to: {url}")
         
-        process = subprocess.Popen(cmd)
-        
-        # Check if process started successfully
-        if process.poll() is not None:
-            logging.error(f"Browser process exited with code {process.returncode}")
-            return False
+        _process = BrowserProcess(chrome_path, profile_dir).start(url)
         
-        # Wait for browser to initialize
-        logging.info("Waiting for browser to initialize (10 seconds)")
-        time.sleep(10)
-        
-        return True
+        # Wait for the browser window to appear
+        logging.info("Waiting for browser to initialize")
+        return _process.wait_ready(browser_window_check())
     except Exception as e:
         logging.error(f"Failed to launch browser: {e}")
         return False
 
-def send_prompts(prompts, session_id=None, delay_between_prompts=300):
-    """Send each prompt and press Enter."""
+def prompt_box_regions(config):
+    """
+    Get the screen regions watched for prompt submissions.
+    
+    Uses the configured prompt box coordinates (Initial_prompt_box for the
+    first prompt, final_prompt_box for later ones, prompt_box for both),
+    otherwise the bottom third of the screen, where the chat input is.
+    
+    Returns:
+        Tuple of (first prompt region, later prompts region)
+    """
+    elements = config.get("ui_elements", {}) or {}
+    width, height = pyautogui.size()
+    fallback = (0, height * 2 // 3, width, height - height * 2 // 3)
+    
+    def region(*names):
+        for name in names:
+            element = elements.get(name) or {}
+            target = element.get("click_coordinates") or element.get("region")
+            found = ack_region(target) if target else None
+            if found:
+                return found
+        return fallback
+    
+    return region("Initial_prompt_box", "prompt_box"), region("final_prompt_box", "prompt_box")
+
+def send_prompts(prompts, session_id=None, delay_between_prompts=300, input_strategy=None, wait_for_login=True,
+                 tracker=None, prompt_regions=None):
+    """
+    Send each prompt and press Enter (wait_for_login=False skips the page readiness wait in a reused browser).
+    
+    Enter is acknowledged by watching the prompt box change (prompt_regions,
+    see prompt_box_regions). With a tracker, every acknowledged prompt is
+    checkpointed and prompts an earlier run of the session already sent are
+    skipped. Sending stops at the first prompt that fails, returning False.
+    """
     if not prompts:
         logging.error("No prompts to send.")
-        return
+        return False
     
     # Log session information
     if session_id:
         logging.info(f"Running session: {session_id}")
+    
+    start = tracker.get_resume_index(session_id, prompts) if tracker is not None else 0
+    if start:
+        logging.info(f"Resuming at prompt {start + 1}/{len(prompts)} ({start} already sent)")
+    prompt_regions = prompt_regions or prompt_box_regions({})
+    
+    # Type character by character with random delays unless configured otherwise
+    input_strategy = input_strategy or HumanizedInput()
         
-    # Wait for page to fully load and for user to handle any login/captcha
-    logging.info("Waiting 15 seconds for page to load and for user to handle any login...")
-    time.sleep(15)
+    # Wait until the browser window is shown and the page stopped changing
+    if wait_for_login:
+        logging.info("Waiting for page to load...")
+        ReadinessProbe().run()
     
     # Process each prompt
-    for i, prompt in enumerate(prompts):
+    for i, prompt in enumerate(prompts[start:], start=start):
         prompt_num = i + 1
         logging.info(f"Processing prompt {prompt_num}/{len(prompts)}")
+        idle_tracker.begin_prompt()
         
         try:
             # Clear any current content with Ctrl+A and Delete
-            pyautogui.hotkey('ctrl', 'a')
-            time.sleep(0.5)
-            pyautogui.press('delete')
-            time.sleep(0.5)
+            get_input_backend().hotkey('ctrl', 'a')
+            pause("clear_field")
+            get_input_backend().key('delete')
+            pause("clear_field")
+            note_actions(2)
             
-            # Type the prompt text character by character with random delays
+            # Enter the prompt text with the session's input strategy
             logging.info(f"Typing prompt: {prompt[:50]}..." if len(prompt) > 50 else f"Typing prompt: {prompt}")
+            if not input_strategy.type_text(prompt):
+                logging.error(f"Failed to enter prompt {prompt_num}, stopping the session")
+                return False
             
-            # Type each character with a random delay
-            for char in prompt:
-                # Type the character
-                pyautogui.write(char)
-                
-                # Random delay between 0.02 and 0.1 seconds for more human-like typing
-                typing_delay = random.uniform(0.02, 0.1)
-                time.sleep(typing_delay)
-                
-                # Occasionally add a slightly longer pause (simulating thinking)
-                if random.random() < 0.05:  # 5% chance
-                    time.sleep(random.uniform(0.2, 0.5))
-            
-            time.sleep(1)
+            pause("type_settle")
             
-            # Press Enter to send
+            # Press Enter to send, watching the prompt box clear as the acknowledgement
             logging.info("Pressing Enter to send prompt")
-            pyautogui.press('enter')
+            submitted = acknowledge(lambda: get_input_backend().key('enter') or True,
+                                    prompt_regions[0 if i == 0 else 1], name="prompt submission")
+            if not submitted:
+                logging.error(f"Prompt {prompt_num} was not acknowledged (the prompt box did not change), "
+                              f"stopping the session")
+                return False
+            logging.info(f"Prompt submission acknowledged after {submitted.latency * 1000:.0f}ms")
+            idle_tracker.end_prompt(f"prompt {prompt_num}")
+            # Checkpoint before the response wait, so a crash during it does not send the prompt again
+            if tracker is not None:
+                tracker.record_prompt_sent(session_id, i, prompts)
             
             # Wait for response (fixed time)
             wait_time = delay_between_prompts
@@ -186,27 +193,30 @@ def send_prompts(prompts, session_id=None, delay_between_prompts=300):
             logging.info(f"Completed prompt {prompt_num}/{len(prompts)}")
             
         except Exception as e:
-            logging.error(f"Error sending prompt {prompt_num}: {e}")
+            # Later prompts depend on this one; the checkpoint keeps it as the first unsent prompt
+            logging.error(f"Error sending prompt {prompt_num}, stopping the session: {e}")
+            return False
     
     logging.info("All prompts processed.")
+    return True
 
 def close_browser():
     """Close Chrome browser."""
     try:
         logging.info("Closing browser...")
-        import platform
         
-        if platform.system() == "Windows":
-            subprocess.run(["taskkill", "/f", "/im", "chrome.exe"], 
-                          stdout=subprocess.DEVNULL, 
-                          stderr=subprocess.DEVNULL)
-        else:
-            subprocess.run(["pkill", "-f", "chrome"], 
-                          stdout=subprocess.DEVNULL, 
-                          stderr=subprocess.DEVNULL)
+        # Terminate the launched process group and wait for it to exit
+        if _process is None:
+            logging.info("No launched browser to close.")
+            return True
+        if not _process.handed_off:
+            return _process.terminate()
+        
+        # Handed off to an instance already running with the profile: close that one
+        kill_browser(_process.profile_dir)
         
         # Wait for browser to close
-        time.sleep(2)
+        pause("browser_close")
         logging.info("Browser closed.")
         return True
         
@@ -214,8 +224,20 @@ def close_browser():
         logging.error(f"Error closing browser: {e}")
         return False
 
-def run_session(session_id, session_config, global_config, prompt_delay):
-    """Run a single session from start to finish."""
+def create_browser_session(config):
+    """Create the browser session shared by the sessions of a run."""
+    settings = config.get("browser_session", {}) or {}
+    profile_dir = config.get("browser_profile")
+    # An attached browser (warm pool) has no process handle here and is found by its profile
+    def is_running():
+        if _process is not None:
+            return _process.is_running()
+        return browser_running(profile_dir)
+    
+    return BrowserSession(launch_browser, close_browser, is_running, reuse=settings.get("reuse", True))
+
+def run_session(session_id, session_config, global_config, prompt_delay, browser=None, tracker=None):
+    """Run a single session, reusing the browser of the previous session if possible (tracker checkpoints prompts)."""
     logging.info(f"=== Starting session: {session_id} ===")
     
     # Get session URL and prompts
@@ -232,22 +254,32 @@ def run_session(session_id, session_config, global_config, prompt_delay):
     logging.info(f"Session name: {session_name}")
     logging.info(f"Number of prompts: {len(session_prompts)}")
     
+    # Without a shared session the browser is launched and closed for this session only
+    if browser is None:
+        browser = create_browser_session(global_config)
+        browser.reuse = False
+    
     success = False
     try:
-        # Launch browser for this session
-        if not launch_browser(session_url, profile_dir):
+        # Launch the browser, or navigate the one left open by the previous session
+        if not browser.open(session_url, profile_dir, profile=profile_dir):
             logging.error(f"Failed to launch browser for session '{session_id}'.")
             return False
         
-        # Send all prompts for this session
-        success = send_prompts(session_prompts, session_id, prompt_delay)
+        # Send all prompts for this session with its text input strategy
+        input_settings = session_config.get("text_input", global_config.get("text_input", {}))
+        success = send_prompts(session_prompts, session_id, prompt_delay, create_input_strategy(input_settings),
+                               wait_for_login=not browser.reused, tracker=tracker,
+                               prompt_regions=prompt_box_regions(global_config))
+        if success and tracker is not None:
+            tracker.clear_prompt_checkpoint(session_id)
         
     except Exception as e:
         logging.error(f"Error in session '{session_id}': {e}")
         success = False
     finally:
-        # Always close the browser before returning
-        close_browser()
+        # Close the browser unless the next session reuses it; a failed session closes a launched one
+        browser.end_session(success)
     
     status = "COMPLETED SUCCESSFULLY" if success else "FAILED"
     logging.info(f"=== Session {session_id} {status} ===")
@@ -271,6 +303,11 @@ def main():
     parser.add_argument("--run-one", action="store_true", help="Run only the specified session, not all")
     parser.add_argument("--delay", type=int, help="Delay between prompts in seconds", default=100)
     parser.add_argument("--session-delay", type=int, help="Delay between sessions in seconds", default=10)
+    parser.add_argument("--browser-profile", help="Chrome user data directory (overrides browser_profile)", default=None)
+    parser.add_argument("--attach-browser", metavar="URL", default=None,
+                        help="Use the browser already running with the profile and showing URL (warm browser pool)")
+    parser.add_argument("--no-resume", action="store_false", dest="resume",
+                        help="Send every prompt again instead of resuming after the last prompt sent")
     args = parser.parse_args()
     
     # Log startup information
@@ -283,6 +320,13 @@ def main():
         logging.error("Failed to load configuration. Exiting.")
         return 1
     
+    if args.browser_profile:
+        config["browser_profile"] = args.browser_profile
+    
+    # Fast, balanced or human delays between actions, sent through the configured backend
+    configure_timing(config.get("timing", {}))
+    configure_input_backend(config.get("input_backend", {}))
+    
     # Determine which sessions to run
     sessions_to_run = []
     
@@ -341,13 +385,21 @@ def main():
     
     logging.info(f"Will run {len(valid_sessions)} sessions: {', '.join(valid_sessions)}")
     
-    # Run each session with a separate browser instance
+    # Run the sessions in one browser, navigating it to each session's URL
+    browser = create_browser_session(config)
+    if args.attach_browser:
+        browser.attach(args.attach_browser, profile=config.get("browser_profile"))
+    # Prompt checkpoints let an interrupted session continue where it stopped
+    tracker = SessionTracker()
+    if not args.resume:
+        for session_id in valid_sessions:
+            tracker.clear_prompt_checkpoint(session_id)
     results = {}
     for i, session_id in enumerate(valid_sessions):
         session_config = config.get("sessions", {}).get(session_id, {})
         
         # Run the session
-        success = run_session(session_id, session_config, config, args.delay)
+        success = run_session(session_id, session_config, config, args.delay, browser, tracker)
         results[session_id] = success
         
         # Wait between sessions if there are more to process
@@ -367,6 +419,10 @@ def main():
         status = "SUCCESS" if success else "FAILED"
         logging.info(f"Session '{session_id}': {status}")
     
+    if browser.launched and browser.owned:
+        browser.close()
+    logging.info(browser.report())
+    logging.info("\n" + idle_tracker.report())
     logging.info("=== CLAUDE SIMPLE SENDER COMPLETED ===")
     return 0 if all(results.values()) else 1
 
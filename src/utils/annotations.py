@@ -0,0 +1,155 @@
+import cv2
+from src.utils.frame_store import load_frame
+
+# Annotations are plain JSON-serializable dictionaries stored with each frame
+# in the run manifest and drawn only when a frame is viewed or exported:
+#   {"type": "text", "text": str, "pos": [x, y], "color": [b, g, r], "scale": float, "thickness": int}
+#   {"type": "rect", "box": [x, y, w, h], "color": [b, g, r], "thickness": int}
+#   {"type": "marker", "point": [x, y], "color": [b, g, r], "size": int, "thickness": int}
+#   {"type": "circle", "point": [x, y], "radius": int, "color": [b, g, r], "thickness": int}
+# Coordinates are in frame pixels. An optional "role" ("match", "click")
+# lets tools read the marked positions back without parsing the image.
+
+MATCH_COLORS = [(0, 255, 0), (0, 255, 255), (0, 165, 255), (0, 0, 255), (128, 0, 255)]
+
+def text(value, pos, color, scale=0.6, thickness=1):
+    """Create a text annotation."""
+    return {"type": "text", "text": value, "pos": [int(pos[0]), int(pos[1])],
+            "color": list(color), "scale": scale, "thickness": thickness}
+
+def rect(box, color, thickness=2, role=None):
+    """Create a rectangle annotation from an (x, y, width, height) box."""
+    annotation = {"type": "rect", "box": [int(v) for v in box[:4]], "color": list(color), "thickness": thickness}
+    if role:
+        annotation["role"] = role
+    return annotation
+
+def marker(point, color, size=20, thickness=2, role=None):
+    """Create a cross marker annotation."""
+    annotation = {"type": "marker", "point": [int(point[0]), int(point[1])], "color": list(color),
+                  "size": size, "thickness": thickness}
+    if role:
+        annotation["role"] = role
+    return annotation
+
+def circle(point, radius, color, thickness=2):
+    """Create a circle annotation."""
+    return {"type": "circle", "point": [int(point[0]), int(point[1])], "radius": radius,
+            "color": list(color), "thickness": thickness}
+
+def to_frame(box, origin):
+    """Translate a screen (x, y[, width, height]) tuple into frame coordinates."""
+    return (box[0] - origin[0], box[1] - origin[1]) + tuple(box[2:])
+
+def stage_annotations(stage_name, time_info, message, region=None, origin=(0, 0)):
+    """
+    Build the stage, time and message labels of a logged screenshot.
+    
+    Args:
+        stage_name: Name of the execution stage
+        time_info: Capture time text
+        message: Log message
+        region: Optional screen region to outline
+        origin: Screen position of the frame's top-left corner
+    
+    Returns:
+        List of annotations
+    """
+    stage_info = f"Stage: {stage_name}" if stage_name else "Unnamed stage"
+    annotations = [
+        text(f"{stage_info} | {time_info}", (10, 30), (0, 0, 255), scale=0.7, thickness=2),
+        text(message[:100] + "..." if len(message) > 100 else message, (10, 70), (0, 255, 0))
+    ]
+    if region:
+        annotations.append(rect(to_frame(region, origin), (255, 0, 0), thickness=3))
+    return annotations
+
+def match_annotations(matches, origin=(0, 0), limit=5):
+    """
+    Build boxes and score labels for the best template matches.
+    
+    Args:
+        matches: Match dictionaries with "location" and "score", best first
+        origin: Screen position of the frame's top-left corner
+        limit: Maximum number of matches to mark
+    
+    Returns:
+        List of annotations
+    """
+    annotations = []
+    for i, match in enumerate(matches[:limit]):
+        x, y, w, h = to_frame(match["location"], origin)
+        color = MATCH_COLORS[i] if i < len(MATCH_COLORS) else (200, 200, 200)
+        annotations.append(rect((x, y, w, h), color, role="match"))
+        annotations.append(text(f"#{i+1}: {match['score']:.2f}", (x, y - 10), color, scale=0.5))
+    return annotations
+
+def click_annotations(location, center, name="element"):
+    """
+    Build the element box and click marker of a click debug screenshot.
+    
+    Args:
+        location: Location tuple (x, y, width, height) or (x, y)
+        center: (x, y) click position
+        name: Name of the element being clicked
+    
+    Returns:
+        List of annotations
+    """
+    annotations = []
+    if len(location) >= 4:
+        x, y = location[0], location[1]
+        annotations.append(rect(location, (0, 255, 0)))
+        annotations.append(text(f"Found: {name}", (x, y - 10), (0, 255, 0), scale=0.5))
+    
+    annotations.append(marker(center, (0, 0, 255), role="click"))
+    annotations.append(circle(center, 30, (0, 0, 255)))
+    annotations.append(text(f"Click: ({center[0]}, {center[1]})", (center[0] + 35, center[1]),
+                            (0, 0, 255), scale=0.7, thickness=2))
+    return annotations
+
+def render_annotations(img, annotations):
+    """
+    Draw annotations on an image.
+    
+    Args:
+        img: BGR image as a numpy array (modified in place)
+        annotations: List of annotation dictionaries
+    
+    Returns:
+        The annotated image
+    """
+    for annotation in annotations or []:
+        kind = annotation.get("type")
+        color = tuple(annotation.get("color", (0, 0, 255)))
+        thickness = annotation.get("thickness", 1)
+        
+        if kind == "text":
+            cv2.putText(img, annotation["text"], tuple(annotation["pos"]), cv2.FONT_HERSHEY_SIMPLEX,
+                        annotation.get("scale", 0.6), color, thickness)
+        elif kind == "rect":
+            x, y, w, h = annotation["box"]
+            cv2.rectangle(img, (x, y), (x + w, y + h), color, thickness)
+        elif kind == "marker":
+            cv2.drawMarker(img, tuple(annotation["point"]), color, markerType=cv2.MARKER_CROSS,
+                           markerSize=annotation.get("size", 20), thickness=thickness)
+        elif kind == "circle":
+            cv2.circle(img, tuple(annotation["point"]), annotation.get("radius", 30), color, thickness)
+    
+    return img
+
+def render_frame(run_dir, entry):
+    """
+    Load a stored frame and draw its manifest annotations.
+    
+    Args:
+        run_dir: Run directory the manifest belongs to
+        entry: Manifest entry
+    
+    Returns:
+        Annotated BGR image as a numpy array, or None if the frame is not available
+    """
+    frame = load_frame(run_dir, entry)
+    if frame is None:
+        return None
+    return render_annotations(frame, entry.get("annotations"))
@@ -0,0 +1,34 @@
+import logging
+import os
+import shutil
+
+# Chrome's per-instance lock files must not be copied into a profile copy
+PROFILE_IGNORE = shutil.ignore_patterns("Singleton*", "lockfile", "*.lock")
+
+def prepare_profile(base_profile, profile_dir, refresh=False):
+    """
+    Create a copy of the browser profile.
+    
+    The copy keeps the base profile's login. An existing copy is reused
+    unless refresh is set.
+    
+    Args:
+        base_profile: Chrome user data directory to copy (may be missing)
+        profile_dir: Directory of the copy
+        refresh: Replace an existing copy
+    
+    Returns:
+        Directory of the copy
+    """
+    if os.path.exists(profile_dir):
+        if not refresh:
+            return profile_dir
+        shutil.rmtree(profile_dir)
+    
+    if base_profile and os.path.isdir(base_profile):
+        logging.info(f"Copying browser profile {base_profile} to {profile_dir}")
+        shutil.copytree(base_profile, profile_dir, ignore=PROFILE_IGNORE, symlinks=True)
+    else:
+        logging.warning(f"Base browser profile {base_profile} not found, {profile_dir} starts empty")
+        os.makedirs(profile_dir, exist_ok=True)
+    return profile_dir
@@ -0,0 +1,167 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+import cv2
+import numpy as np
+from src.utils.frame_store import frame_key
+
+class FlightRecorderHandler(logging.Handler):
+    """Logging handler that keeps the most recent formatted records in memory."""
+    
+    def __init__(self, capacity=500):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    
+    def emit(self, record):
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+class FlightRecorder:
+    """
+    Ring buffer of the most recently captured frames.
+    
+    Frames are kept PNG-compressed in memory together with their log metadata
+    and are only written to disk when the recorder is flushed (on an error, a
+    missing element or an explicit request). After a flush the buffer starts
+    over, so the same frame is never written twice. A frame identical to one
+    already buffered shares its encoded PNG instead of being compressed again.
+    
+    Frames may be recorded while another thread flushes: flush() swaps in an
+    empty buffer under the recorder's lock and writes the frames it took,
+    and takes the log records under the handler's lock.
+    """
+    
+    def __init__(self, capacity=50, compression=1, log_capacity=500, dedupe="exact"):
+        """
+        Initialize the flight recorder.
+        
+        Args:
+            capacity: Maximum number of frames kept in memory
+            compression: PNG compression level (0-9) used for buffered frames
+            log_capacity: Maximum number of log records kept in memory
+            dedupe: Deduplication mode passed to frame_key ("off", "exact" or "signature")
+        """
+        self.frames = deque(maxlen=max(1, capacity))
+        self.compression = compression
+        self.dedupe = dedupe
+        self.log_handler = FlightRecorderHandler(log_capacity)
+        self.recorded = 0
+        self.flushed = 0
+        self._lock = threading.Lock()
+    
+    def record(self, image, metadata):
+        """
+        Compress and buffer a frame.
+        
+        Args:
+            image: Captured PIL Image (RGB)
+            metadata: Dictionary with frame_id, timestamp, stage, element, message,
+                      level, region and annotations
+        """
+        img = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        key = frame_key(img, self.dedupe)
+        
+        png = None
+        if key is not None:
+            with self._lock:
+                buffered = list(self.frames)
+            png = next((frame["png"] for frame in reversed(buffered) if frame["key"] == key), None)
+        
+        if png is None:
+            ok, encoded = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, self.compression])
+            if not ok:
+                logging.warning(f"Failed to encode frame for {metadata.get('stage')}")
+                return
+            png = encoded.tobytes()
+        
+        with self._lock:
+            self.frames.append({
+                "png": png,
+                "key": key,
+                "metadata": metadata
+            })
+            self.recorded += 1
+    
+    def memory_usage(self):
+        """Get the number of bytes held by buffered frames."""
+        with self._lock:
+            frames = list(self.frames)
+        return sum(len(png) for png in {id(frame["png"]): frame["png"] for frame in frames}.values())
+    
+    def flush(self, directory, reason="manual", frame_store=None, policy=None):
+        """
+        Write all buffered frames and recent log records to disk.
+        
+        Args:
+            directory: Parent directory for the dump
+            reason: Short reason included in the dump directory name
+            frame_store: Optional FrameStore used to write deduplicated frames
+                         and list them in its run's manifest
+            policy: Optional EncodingPolicy for the written frames
+        
+        Returns:
+            Path to the dump directory, or None if there was nothing to write
+        """
+        # Take the buffered frames and log records, leaving empty buffers to
+        # the threads that keep recording
+        with self._lock:
+            frames = self.frames
+            if not frames:
+                logging.debug(f"Flight recorder empty, nothing to flush ({reason})")
+                return None
+            self.frames = deque(maxlen=frames.maxlen)
+        self.log_handler.acquire()
+        try:
+            records = list(self.log_handler.records)
+            self.log_handler.records.clear()
+        finally:
+            self.log_handler.release()
+        
+        start_time = time.time()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        safe_reason = "".join(c if c.isalnum() or c in "-_" else "_" for c in reason)
+        dump_dir = os.path.join(directory, f"flight_{timestamp}_{safe_reason}")
+        os.makedirs(dump_dir, exist_ok=True)
+        
+        index_lines = []
+        for seq, frame in enumerate(frames):
+            metadata = frame["metadata"]
+            stage = metadata.get("stage") or "unnamed"
+            base = f"{seq:03d}_{stage}_{metadata.get('file_timestamp', '')}"
+            
+            if frame_store is not None:
+                stored = frame_store.save(dump_dir, f"{base}_screenshot", png=frame["png"],
+                                          key=frame["key"], frame_id=metadata.get("frame_id"),
+                                          policy=policy)
+            else:
+                with open(os.path.join(dump_dir, f"{base}_screenshot.png"), "wb") as f:
+                    f.write(frame["png"])
+                stored = None
+            
+            if frame_store is not None:
+                entry = {key: value for key, value in metadata.items() if key != "file_timestamp"}
+                entry.update(stored)
+                entry["flush_reason"] = reason
+                frame_store.run_context.append_manifest(entry)
+            
+            index_lines.append(f"{base}\t{metadata.get('level', 'INFO')}\t{metadata.get('message', '')}")
+        
+        with open(os.path.join(dump_dir, "frames.txt"), "w") as f:
+            f.write("\n".join(index_lines) + "\n")
+        
+        with open(os.path.join(dump_dir, "flight_recorder.log"), "w") as f:
+            f.write("\n".join(records) + "\n")
+        
+        count = len(frames)
+        with self._lock:
+            self.flushed += count
+        
+        logging.info(f"Flight recorder flushed {count} frames to {dump_dir} "
+                     f"({reason}, {time.time() - start_time:.2f}s)")
+        return dump_dir
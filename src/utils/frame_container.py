@@ -0,0 +1,202 @@
+import logging
+import mmap
+import os
+import cv2
+import numpy as np
+
+# Fixed-size index record: which chunk, where and how long each frame is
+INDEX_DTYPE = np.dtype([
+    ("chunk", "<u2"),
+    ("format", "u1"),
+    ("reserved", "u1"),
+    ("length", "<u4"),
+    ("offset", "<u8")
+])
+
+FORMATS = ["png", "webp", "jpeg", "npz"]
+
+class FrameContainerWriter:
+    """
+    Append-only container for the encoded frames of a run.
+    
+    Frames are appended to chunk files (frames_000.bin, frames_001.bin, ...)
+    and every frame gets a 16 byte record in frames.idx with its chunk,
+    offset, length and format, so a reader can seek to any frame without
+    scanning. Nothing is ever rewritten, which keeps a crash from corrupting
+    earlier frames.
+    
+    The writer is not thread-safe; it is only used from the screenshot
+    writer thread.
+    """
+    
+    def __init__(self, directory, name="frames", chunk_size=256 * 1024 * 1024):
+        """
+        Open (or continue) a frame container.
+        
+        Args:
+            directory: Directory holding the container files
+            name: Base name of the container files
+            chunk_size: Size in bytes after which a new chunk file is started
+        """
+        self.directory = directory
+        self.name = name
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+        
+        self.index_path = os.path.join(directory, f"{name}.idx")
+        index = read_index(self.index_path)
+        if os.path.exists(self.index_path) and os.path.getsize(self.index_path) != index.nbytes:
+            # Drop a partially written record so new records stay aligned
+            with open(self.index_path, "r+b") as f:
+                f.truncate(index.nbytes)
+        self.count = len(index)
+        self.chunk = int(index["chunk"][-1]) if self.count else 0
+        
+        self._index_file = open(self.index_path, "ab")
+        self._chunk_file = open(self.chunk_path(self.chunk), "ab")
+    
+    def chunk_path(self, chunk):
+        """Get the path of a chunk file."""
+        return chunk_path(self.directory, self.name, chunk)
+    
+    def append(self, data, format="png"):
+        """
+        Append an encoded frame.
+        
+        Args:
+            data: Encoded frame bytes
+            format: Encoding of the frame ("png", "webp", "jpeg" or "npz")
+        
+        Returns:
+            Record number of the frame
+        """
+        if self._chunk_file.tell() > 0 and self._chunk_file.tell() + len(data) > self.chunk_size:
+            self._chunk_file.close()
+            self.chunk += 1
+            self._chunk_file = open(self.chunk_path(self.chunk), "ab")
+        
+        offset = self._chunk_file.tell()
+        self._chunk_file.write(data)
+        self._chunk_file.flush()
+        
+        record = np.zeros(1, dtype=INDEX_DTYPE)
+        record["chunk"] = self.chunk
+        record["format"] = FORMATS.index(format)
+        record["length"] = len(data)
+        record["offset"] = offset
+        self._index_file.write(record.tobytes())
+        self._index_file.flush()
+        
+        self.count += 1
+        return self.count - 1
+    
+    def close(self):
+        """Close the container files."""
+        self._chunk_file.close()
+        self._index_file.close()
+
+class FrameContainerReader:
+    """
+    Random access to the frames of a container through memory maps.
+    
+    The index is loaded as a numpy array and chunk files are memory-mapped
+    on first use, so reading a frame is an index lookup and a slice. Frames
+    appended after the reader was opened are picked up on demand.
+    """
+    
+    def __init__(self, directory, name="frames"):
+        """
+        Open a frame container for reading.
+        
+        Args:
+            directory: Directory holding the container files
+            name: Base name of the container files
+        """
+        self.directory = directory
+        self.name = name
+        self.index_path = os.path.join(directory, f"{name}.idx")
+        self.index = read_index(self.index_path)
+        self._maps = {}
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def _map(self, chunk, end):
+        """Get a memory map of a chunk covering at least `end` bytes."""
+        mapped = self._maps.get(chunk)
+        if mapped is None or len(mapped) < end:
+            if mapped is not None:
+                mapped.close()
+            with open(chunk_path(self.directory, self.name, chunk), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[chunk] = mapped
+        return mapped
+    
+    def read(self, record):
+        """
+        Get the encoded bytes and format of a frame.
+        
+        Args:
+            record: Record number
+        
+        Returns:
+            Tuple of (bytes, format)
+        """
+        if record >= len(self.index):
+            self.index = read_index(self.index_path)
+        entry = self.index[record]
+        offset, length = int(entry["offset"]), int(entry["length"])
+        mapped = self._map(int(entry["chunk"]), offset + length)
+        return mapped[offset:offset + length], FORMATS[int(entry["format"])]
+    
+    def length(self, record):
+        """Get the stored size of a frame in bytes."""
+        if record >= len(self.index):
+            self.index = read_index(self.index_path)
+        return int(self.index[record]["length"])
+    
+    def decode(self, record):
+        """
+        Decode an image frame.
+        
+        Args:
+            record: Record number
+        
+        Returns:
+            BGR image as a numpy array
+        """
+        data, format = self.read(record)
+        if format == "npz":
+            raise ValueError(f"Record {record} holds delta tiles, not an image")
+        return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    
+    def close(self):
+        """Release the memory maps."""
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
+
+def chunk_path(directory, name, chunk):
+    """Get the path of a container chunk file."""
+    return os.path.join(directory, f"{name}_{chunk:03d}.bin")
+
+def read_index(path):
+    """
+    Read a container index.
+    
+    A partially written trailing record (e.g. after a crash) is ignored.
+    
+    Args:
+        path: Path of the .idx file
+    
+    Returns:
+        Structured numpy array with INDEX_DTYPE
+    """
+    if not os.path.exists(path):
+        return np.zeros(0, dtype=INDEX_DTYPE)
+    
+    data = np.fromfile(path, dtype=np.uint8)
+    usable = len(data) - len(data) % INDEX_DTYPE.itemsize
+    if usable != len(data):
+        logging.warning(f"Ignoring incomplete trailing record in {path}")
+    return data[:usable].view(INDEX_DTYPE)
@@ -0,0 +1,419 @@
+import hashlib
+import io
+import logging
+import os
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+from src.utils.frame_container import FrameContainerWriter, FrameContainerReader
+
+DEDUPE_MODES = ("off", "exact", "signature")
+
+class EncodingPolicy:
+    """
+    How a stored frame is encoded.
+    
+    PNG is lossless with a configurable compression level (lower is faster);
+    WebP and JPEG are lossy with a quality setting. A scale below 1.0 stores
+    a downscaled thumbnail, which load_frame scales back to the original size.
+    """
+    
+    FORMATS = {"png": ".png", "webp": ".webp", "jpeg": ".jpg"}
+    
+    def __init__(self, format="png", compression=1, quality=85, scale=1.0):
+        """
+        Initialize the encoding policy.
+        
+        Args:
+            format: Image format ("png", "webp" or "jpeg")
+            compression: PNG compression level (0-9)
+            quality: WebP/JPEG quality (1-100)
+            scale: Resolution factor in (0, 1]
+        """
+        if format not in self.FORMATS:
+            logging.warning(f"Unknown screenshot format '{format}', using png")
+            format = "png"
+        
+        self.format = format
+        self.compression = compression
+        self.quality = quality
+        self.scale = min(1.0, max(0.05, scale))
+    
+    @classmethod
+    def from_config(cls, settings):
+        """Create a policy from a configuration dictionary."""
+        settings = settings or {}
+        return cls(
+            format=settings.get("format", "png"),
+            compression=settings.get("compression", 1),
+            quality=settings.get("quality", 85),
+            scale=settings.get("scale", 1.0)
+        )
+    
+    @property
+    def lossless(self):
+        """Whether frames are stored pixel-exact."""
+        return self.format == "png" and self.scale == 1.0
+    
+    @property
+    def extension(self):
+        """File extension of encoded frames."""
+        return self.FORMATS[self.format]
+    
+    def describe(self):
+        """Short description such as "png/1" or "webp/q80@0.5"."""
+        setting = f"{self.compression}" if self.format == "png" else f"q{self.quality}"
+        scale = f"@{self.scale:g}" if self.scale != 1.0 else ""
+        return f"{self.format}/{setting}{scale}"
+    
+    def encode(self, pixels):
+        """
+        Encode a frame.
+        
+        Args:
+            pixels: BGR image as a numpy array
+        
+        Returns:
+            Tuple of (encoded bytes, file extension)
+        """
+        if self.scale != 1.0:
+            height, width = pixels.shape[:2]
+            size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+            pixels = cv2.resize(pixels, size, interpolation=cv2.INTER_AREA)
+        
+        if self.format == "png":
+            params = [cv2.IMWRITE_PNG_COMPRESSION, self.compression]
+        elif self.format == "webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, self.quality]
+        else:
+            params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        
+        try:
+            ok, encoded = cv2.imencode(self.extension, pixels, params)
+        except cv2.error:
+            ok = False
+        if ok:
+            return encoded.tobytes(), self.extension
+        
+        # OpenCV builds without WebP/JPEG support fall back to PNG
+        logging.warning(f"Failed to encode frame as {self.describe()}, writing PNG instead")
+        ok, encoded = cv2.imencode(".png", pixels, [cv2.IMWRITE_PNG_COMPRESSION, self.compression])
+        if not ok:
+            raise ValueError("Failed to encode frame")
+        return encoded.tobytes(), ".png"
+
+def frame_key(pixels, mode="exact"):
+    """
+    Compute the deduplication key of a frame.
+    
+    Args:
+        pixels: Image as a numpy array
+        mode: "exact" hashes every pixel, "signature" hashes a small
+              quantized grayscale thumbnail (ignores tiny changes such as
+              a blinking cursor)
+    
+    Returns:
+        Hex digest, or None when deduplication is off
+    """
+    if mode == "off":
+        return None
+    
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(str(pixels.shape).encode())
+    if mode == "signature":
+        gray = cv2.cvtColor(pixels, cv2.COLOR_BGR2GRAY) if pixels.ndim == 3 else pixels
+        thumbnail = cv2.resize(gray, (64, 36), interpolation=cv2.INTER_AREA) >> 3
+        hasher.update(np.ascontiguousarray(thumbnail).tobytes())
+    else:
+        hasher.update(np.ascontiguousarray(pixels).tobytes())
+    return hasher.hexdigest()
+
+class FrameStore:
+    """
+    Content-deduplicated screenshot storage for one run.
+    
+    A frame identical to one already stored is not written again; its
+    manifest entry references the earlier file instead. In delta mode a
+    frame that differs from the last keyframe in only a few tiles is stored
+    as those tiles (a compressed .npz) plus a reference to the keyframe;
+    this only applies to frames stored with a lossless policy. Each frame is
+    encoded with the EncodingPolicy passed to save(). With a container, all
+    data goes into the run's append-only frame container instead of one
+    file per frame, and manifest entries reference record numbers.
+    
+    The store is not thread-safe; it is only used from the screenshot writer
+    thread.
+    """
+    
+    def __init__(self, run_context, dedupe="exact", delta=False, tile_size=64,
+                 keyframe_interval=30, max_changed_ratio=0.5, policy=None, index_size=1024,
+                 container=False):
+        """
+        Initialize the frame store.
+        
+        Args:
+            run_context: RunContext the stored files belong to
+            dedupe: Deduplication mode ("off", "exact" or "signature")
+            delta: Store frames as changed tiles against a keyframe
+            tile_size: Tile edge length in pixels for delta mode
+            keyframe_interval: Maximum number of delta frames per keyframe
+            max_changed_ratio: Fraction of changed tiles above which a new
+                               keyframe is stored instead of a delta
+            policy: Default EncodingPolicy for full frames (PNG level 1)
+            index_size: Number of recent frame keys remembered for deduplication
+            container: Append frames to the run's frame container instead of
+                       writing individual files
+        """
+        if dedupe not in DEDUPE_MODES:
+            logging.warning(f"Unknown screenshot dedupe mode '{dedupe}', using exact")
+            dedupe = "exact"
+        
+        self.run_context = run_context
+        self.dedupe = dedupe
+        self.delta = delta
+        self.tile_size = tile_size
+        self.keyframe_interval = keyframe_interval
+        self.max_changed_ratio = max_changed_ratio
+        self.policy = policy or EncodingPolicy()
+        self.index_size = index_size
+        self.container = FrameContainerWriter(run_context.run_dir) if container else None
+        
+        self._index = OrderedDict()
+        self._keyframe = None  # (pixels, relative file)
+        self._since_keyframe = 0
+        
+        self.frames = 0
+        self.duplicates = 0
+        self.deltas = 0
+        self.bytes_written = 0
+        self.write_time = 0.0
+    
+    def save(self, directory, basename, pixels=None, png=None, key=None, frame_id=None, policy=None):
+        """
+        Store a frame unless an identical one is already stored.
+        
+        Args:
+            directory: Directory for new files
+            basename: Filename without extension for new files
+            pixels: BGR image as a numpy array (required unless png is given)
+            png: Already encoded PNG of the frame, written as is when the
+                 policy is full-resolution PNG
+            key: Precomputed deduplication key
+            frame_id: Frame id recorded for later duplicates
+            policy: EncodingPolicy for this frame (default: the store's policy)
+        
+        Returns:
+            Dictionary of manifest fields: file, delta_file, keyframe,
+            duplicate_of, encoding, size and write_ms
+        """
+        start_time = time.perf_counter()
+        self.frames += 1
+        policy = policy or self.policy
+        
+        # An already encoded PNG can only be written as is for full-resolution PNG
+        if png is not None and not policy.lossless:
+            if pixels is None:
+                pixels = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+            png = None
+        if pixels is None and ((key is None and self.dedupe != "off") or self.delta):
+            pixels = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+        
+        if key is None and self.dedupe != "off":
+            key = frame_key(pixels, self.dedupe)
+        
+        # A frame stored with another policy (e.g. as a thumbnail) is not a valid duplicate
+        if key is not None:
+            key = f"{key}:{policy.describe()}"
+        
+        if key is not None and key in self._index:
+            self._index.move_to_end(key)
+            self.duplicates += 1
+            fields = dict(self._index[key])
+            fields["write_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+            return fields
+        
+        if self.container is None:
+            os.makedirs(directory, exist_ok=True)
+        fields = None
+        if self.delta and policy.lossless:
+            fields = self._save_delta(directory, basename, pixels)
+        
+        if fields is None:
+            fields = self._save_full(directory, basename, pixels, png, policy)
+        
+        is_delta = fields["delta_file"] or fields.get("delta_record") is not None
+        fields["encoding"] = "delta" if is_delta else policy.describe()
+        if pixels is not None:
+            fields["size"] = [int(pixels.shape[1]), int(pixels.shape[0])]
+        
+        if key is not None:
+            self._index[key] = dict(fields, duplicate_of=frame_id)
+            if len(self._index) > self.index_size:
+                self._index.popitem(last=False)
+        
+        elapsed = time.perf_counter() - start_time
+        self.write_time += elapsed
+        fields["write_ms"] = round(elapsed * 1000, 3)
+        return fields
+    
+    def _write(self, directory, basename, data, extension):
+        """
+        Write encoded data to the frame container or to its own file.
+        
+        Returns:
+            Manifest location fields ({"record": n} or {"file": path})
+        """
+        self.bytes_written += len(data)
+        if self.container is not None:
+            format = {".png": "png", ".webp": "webp", ".jpg": "jpeg", ".npz": "npz"}[extension]
+            return {"record": self.container.append(data, format)}
+        
+        path = os.path.join(directory, f"{basename}{extension}")
+        with open(path, "wb") as f:
+            f.write(data)
+        return {"file": self.run_context.relative(path)}
+    
+    def _save_full(self, directory, basename, pixels, png, policy):
+        """Write a full frame and, if it is lossless, make it the current keyframe."""
+        if png is not None:
+            data, extension = png, ".png"
+        else:
+            data, extension = policy.encode(pixels)
+        
+        location = self._write(directory, basename, data, extension)
+        if self.delta and policy.lossless:
+            self._keyframe = (pixels, location)
+            self._since_keyframe = 0
+        
+        fields = {"file": None, "delta_file": None, "keyframe": None, "duplicate_of": None}
+        fields.update(location)
+        return fields
+    
+    def _save_delta(self, directory, basename, pixels):
+        """
+        Write the tiles that changed since the keyframe.
+        
+        Returns:
+            Manifest fields, or None if a new keyframe should be stored instead
+        """
+        if self._keyframe is None or self._since_keyframe >= self.keyframe_interval:
+            return None
+        
+        keyframe, keyframe_location = self._keyframe
+        if keyframe.shape != pixels.shape:
+            return None
+        
+        changed = changed_tiles(keyframe, pixels, self.tile_size)
+        tile_count = (-(-pixels.shape[0] // self.tile_size)) * (-(-pixels.shape[1] // self.tile_size))
+        if len(changed) > self.max_changed_ratio * tile_count:
+            return None
+        
+        tiles = {f"t{i}": pixels[y:y + self.tile_size, x:x + self.tile_size]
+                 for i, (y, x) in enumerate(changed)}
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, coords=np.array(changed, dtype=np.int32).reshape(-1, 2), **tiles)
+        location = self._write(directory, basename, buffer.getvalue(), ".npz")
+        
+        self.deltas += 1
+        self._since_keyframe += 1
+        fields = {"file": None, "delta_file": None, "keyframe": None, "duplicate_of": None}
+        if "record" in location:
+            fields["delta_record"] = location["record"]
+            fields["keyframe_record"] = keyframe_location["record"]
+        else:
+            fields["delta_file"] = location["file"]
+            fields["keyframe"] = keyframe_location["file"]
+        return fields
+    
+    def close(self):
+        """Close the frame container."""
+        if self.container is not None:
+            self.container.close()
+            self.container = None
+    
+    def stats(self):
+        """Get storage statistics."""
+        return {
+            "frames": self.frames,
+            "duplicates": self.duplicates,
+            "deltas": self.deltas,
+            "bytes_written": self.bytes_written,
+            "write_time": round(self.write_time, 3)
+        }
+
+def changed_tiles(previous, current, tile_size):
+    """
+    Find the tiles that differ between two frames of the same size.
+    
+    Args:
+        previous: Earlier frame as a numpy array
+        current: Later frame as a numpy array
+        tile_size: Tile edge length in pixels
+    
+    Returns:
+        List of (y, x) tile origins
+    """
+    diff = previous != current
+    if diff.ndim == 3:
+        diff = diff.any(axis=2)
+    
+    height, width = diff.shape
+    rows, cols = -(-height // tile_size), -(-width // tile_size)
+    padded = np.zeros((rows * tile_size, cols * tile_size), dtype=bool)
+    padded[:height, :width] = diff
+    changed = padded.reshape(rows, tile_size, cols, tile_size).any(axis=(1, 3))
+    return [(int(r) * tile_size, int(c) * tile_size) for r, c in zip(*np.nonzero(changed))]
+
+_readers = {}
+
+def get_container_reader(run_dir):
+    """Get a cached memory-mapped reader for the frame container of a run."""
+    reader = _readers.get(run_dir)
+    if reader is None:
+        reader = FrameContainerReader(run_dir)
+        _readers[run_dir] = reader
+    return reader
+
+def _decode(run_dir, file=None, record=None):
+    """Decode an image stored in a file or a container record."""
+    if record is not None:
+        return get_container_reader(run_dir).decode(record)
+    return cv2.imread(os.path.join(run_dir, file))
+
+def load_frame(run_dir, entry):
+    """
+    Load a stored frame from its manifest entry.
+    
+    Args:
+        run_dir: Run directory the manifest belongs to
+        entry: Manifest entry
+    
+    Returns:
+        BGR image as a numpy array, or None if the frame is not available
+    """
+    if entry.get("file") or entry.get("record") is not None:
+        frame = _decode(run_dir, entry.get("file"), entry.get("record"))
+        size = entry.get("size")
+        # Thumbnails are scaled back so annotation coordinates still apply
+        if frame is not None and size and (frame.shape[1], frame.shape[0]) != tuple(size):
+            frame = cv2.resize(frame, tuple(size), interpolation=cv2.INTER_LINEAR)
+        return frame
+    
+    if entry.get("delta_record") is not None:
+        frame = _decode(run_dir, record=entry["keyframe_record"])
+        tiles, _ = get_container_reader(run_dir).read(entry["delta_record"])
+        tiles = io.BytesIO(tiles)
+    elif entry.get("delta_file") and entry.get("keyframe"):
+        frame = _decode(run_dir, entry["keyframe"])
+        tiles = os.path.join(run_dir, entry["delta_file"])
+    else:
+        return None
+    
+    if frame is None:
+        return None
+    with np.load(tiles) as data:
+        for i, (y, x) in enumerate(data["coords"]):
+            tile = data[f"t{i}"]
+            frame[y:y + tile.shape[0], x:x + tile.shape[1]] = tile
+    return frame
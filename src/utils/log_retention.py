@@ -0,0 +1,337 @@
+import atexit
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from src.utils.run_context import MANIFEST_NAME
+
+INDEX_NAME = ".retention_index.json"
+
+# Directories below the log root whose files are pruned one by one; every
+# other subdirectory (run_*, ...) is pruned as a whole
+FILE_DIRS = ("recognition_debug", "click_debug", "screenshots", "ocr_cache", "reports", "simple_sender")
+
+ERROR_LEVELS = ("ERROR", "CRITICAL")
+
+class LogRetentionManager:
+    """
+    Enforces a size budget and a maximum age on the log directory.
+    
+    Log artifacts are run directories (pruned as a whole) and the files of
+    the legacy debug directories. Their sizes, ages and whether a run
+    recorded errors are kept in an index next to the logs, so a pass only
+    measures artifacts that are new or have changed since the last pass.
+    
+    Artifacts older than max_age_days are always removed. While the total
+    size exceeds max_bytes the oldest artifacts are removed, runs without
+    errors first. The current run and any protected paths are never removed.
+    """
+    
+    def __init__(self, base_dir="logs", max_bytes=2 * 1024 ** 3, max_age_days=14,
+                 keep_errors=True, max_deletions=20, protected=None):
+        """
+        Initialize the retention manager.
+        
+        Args:
+            base_dir: Log root directory
+            max_bytes: Total size budget in bytes (None for no budget)
+            max_age_days: Maximum artifact age in days (None for no limit)
+            keep_errors: Remove runs with errors only after all other artifacts
+            max_deletions: Maximum number of artifacts removed per pass
+            protected: Paths that are never removed (e.g. the current run)
+        """
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 24 * 60 * 60 if max_age_days else None
+        self.keep_errors = keep_errors
+        self.max_deletions = max(1, max_deletions)
+        self.protected = {os.path.abspath(path) for path in protected or []}
+        self.index_path = os.path.join(base_dir, INDEX_NAME)
+        self.index = self._load_index()
+        
+        self.removed = 0
+        self.removed_bytes = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _load_index(self):
+        """Load the artifact index, starting empty if it is missing or unreadable."""
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Could not read retention index {self.index_path}, rebuilding: {e}")
+            return {}
+    
+    def _save_index(self):
+        """Write the artifact index atomically."""
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(self.index, f)
+            os.replace(temp_path, self.index_path)
+        except Exception as e:
+            logging.error(f"Error saving retention index: {e}")
+    
+    def _is_protected(self, path):
+        """Check whether a path is or contains a protected path."""
+        path = os.path.abspath(path)
+        return any(protected == path or protected.startswith(path + os.sep) for protected in self.protected)
+    
+    def _list_artifacts(self):
+        """
+        List the current log artifacts.
+        
+        Returns:
+            Dictionary mapping index keys (paths relative to base_dir) to
+            (path, is_directory, mtime)
+        """
+        artifacts = {}
+        try:
+            entries = list(os.scandir(self.base_dir))
+        except FileNotFoundError:
+            return artifacts
+        
+        for entry in entries:
+            if entry.name.startswith(INDEX_NAME):
+                continue
+            if entry.is_dir(follow_symlinks=False) and entry.name in FILE_DIRS:
+                for child in os.scandir(entry.path):
+                    key = os.path.join(entry.name, child.name)
+                    artifacts[key] = (child.path, child.is_dir(follow_symlinks=False),
+                                      child.stat(follow_symlinks=False).st_mtime)
+            else:
+                artifacts[entry.name] = (entry.path, entry.is_dir(follow_symlinks=False),
+                                         entry.stat(follow_symlinks=False).st_mtime)
+        return artifacts
+    
+    def refresh(self):
+        """
+        Update the index with new and changed artifacts.
+        
+        Only artifacts that are not yet indexed, whose modification time
+        changed, or that are protected (still being written) are measured.
+        
+        Returns:
+            Number of artifacts measured
+        """
+        artifacts = self._list_artifacts()
+        measured = 0
+        
+        for key in list(self.index):
+            if key not in artifacts:
+                del self.index[key]
+        
+        for key, (path, is_dir, mtime) in artifacts.items():
+            known = self.index.get(key)
+            protected = self._is_protected(path)
+            if known is not None and known["mtime"] == mtime and not protected:
+                continue
+            self.index[key] = {
+                "size": directory_size(path) if is_dir else os.path.getsize(path),
+                "mtime": mtime,
+                "error": is_dir and run_has_errors(path)
+            }
+            measured += 1
+        
+        if measured:
+            self._save_index()
+        return measured
+    
+    def total_size(self):
+        """Get the indexed size of all log artifacts in bytes."""
+        return sum(info["size"] for info in self.index.values())
+    
+    def _candidates(self, now):
+        """
+        Get the artifacts to remove in removal order.
+        
+        Returns:
+            List of index keys: expired artifacts first, then (while over
+            budget) the oldest artifacts, runs with errors last
+        """
+        removable = [key for key in self.index
+                     if not self._is_protected(os.path.join(self.base_dir, key))]
+        expired = [key for key in removable
+                   if self.max_age is not None and now - self.index[key]["mtime"] > self.max_age]
+        
+        over_budget = []
+        if self.max_bytes is not None:
+            excess = self.total_size() - sum(self.index[key]["size"] for key in expired) - self.max_bytes
+            if excess > 0:
+                remaining = [key for key in removable if key not in expired]
+                remaining.sort(key=lambda key: (self.keep_errors and self.index[key]["error"],
+                                                self.index[key]["mtime"]))
+                for key in remaining:
+                    if excess <= 0:
+                        break
+                    over_budget.append(key)
+                    excess -= self.index[key]["size"]
+        
+        return sorted(expired, key=lambda key: self.index[key]["mtime"]) + over_budget
+    
+    def prune(self):
+        """
+        Run one retention pass.
+        
+        At most max_deletions artifacts are removed per pass, so pruning a
+        large backlog is spread over several passes.
+        
+        Returns:
+            Tuple of (artifacts removed, bytes removed)
+        """
+        with self._lock:
+            self.refresh()
+            removed = removed_bytes = 0
+            for key in self._candidates(time.time())[:self.max_deletions]:
+                path = os.path.join(self.base_dir, key)
+                info = self.index[key]
+                try:
+                    if os.path.isdir(path) and not os.path.islink(path):
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logging.error(f"Error removing log artifact {path}: {e}")
+                    continue
+                del self.index[key]
+                removed += 1
+                removed_bytes += info["size"]
+                logging.debug(f"Removed log artifact {key} ({info['size'] / 1e6:.1f} MB"
+                              f"{', had errors' if info['error'] else ''})")
+            
+            if removed:
+                self._save_index()
+                self.removed += removed
+                self.removed_bytes += removed_bytes
+                logging.info(f"Log retention removed {removed} artifacts ({removed_bytes / 1e6:.1f} MB), "
+                             f"{self.total_size() / 1e6:.1f} MB remaining")
+            return removed, removed_bytes
+    
+    def start(self, interval=300):
+        """
+        Run retention passes on a background thread.
+        
+        Args:
+            interval: Seconds between passes
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="LogRetention", daemon=True)
+        self._thread.start()
+    
+    def _run(self, interval):
+        while not self._stop.is_set():
+            try:
+                removed, _ = self.prune()
+            except Exception as e:
+                logging.error(f"Log retention pass failed: {e}")
+                removed = 0
+            # Continue right away while a backlog is being worked off
+            self._stop.wait(1 if removed >= self.max_deletions else interval)
+    
+    def stop(self, timeout=5):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+def directory_size(path):
+    """Get the total size of the files below a directory in bytes."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def run_has_errors(path):
+    """
+    Check whether a run directory recorded errors.
+    
+    A run has errors if the flight recorder dumped frames (errors, missing
+    elements) or its manifest contains ERROR or CRITICAL entries.
+    
+    Args:
+        path: Run directory
+    
+    Returns:
+        bool: True if the run recorded errors
+    """
+    try:
+        if any(name.startswith("flight_") for name in os.listdir(path)):
+            return True
+    except OSError:
+        return False
+    
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return False
+    try:
+        with open(manifest_path, "r") as f:
+            for line in f:
+                if '"level"' in line:
+                    try:
+                        if json.loads(line).get("level") in ERROR_LEVELS:
+                            return True
+                    except ValueError:
+                        continue
+    except OSError:
+        pass
+    return False
+
+_retention_manager = None
+
+def configure_log_retention(settings=None, base_dir="logs", protected=None):
+    """
+    Start background log retention.
+    
+    Args:
+        settings: "log_retention" configuration dictionary with optional
+                  enabled, max_size_mb, max_age_days, keep_errors,
+                  max_deletions_per_pass and interval
+        base_dir: Log root directory
+        protected: Paths that are never removed (e.g. the current run)
+    
+    Returns:
+        The LogRetentionManager instance, or None if retention is disabled
+    """
+    global _retention_manager
+    settings = settings or {}
+    stop_log_retention()
+    if not settings.get("enabled", True):
+        logging.debug("Log retention disabled")
+        return None
+    
+    max_size_mb = settings.get("max_size_mb", 2048)
+    _retention_manager = LogRetentionManager(
+        base_dir=base_dir,
+        max_bytes=max_size_mb * 1024 * 1024 if max_size_mb else None,
+        max_age_days=settings.get("max_age_days", 14),
+        keep_errors=settings.get("keep_errors", True),
+        max_deletions=settings.get("max_deletions_per_pass", 20),
+        protected=protected
+    )
+    _retention_manager.start(settings.get("interval", 300))
+    logging.debug(f"Log retention started (budget: {max_size_mb} MB, "
+                  f"max age: {settings.get('max_age_days', 14)} days)")
+    return _retention_manager
+
+@atexit.register
+def stop_log_retention():
+    """Stop background log retention if it is running."""
+    global _retention_manager
+    if _retention_manager is not None:
+        _retention_manager.stop()
+        _retention_manager = None
@@ -1,10 +1,18 @@
 import logging
 import os
 import time
+import atexit
+import signal
+import threading
 from datetime import datetime
 import pyautogui
 import cv2
 import numpy as np
+from src.utils.screenshot_writer import ScreenshotWriter
+from src.utils.flight_recorder import FlightRecorder
+from src.utils.annotations import stage_annotations
+from src.utils.frame_store import FrameStore, EncodingPolicy
+from src.utils.run_context import RunContext, get_run_context, set_run_context, element_from_stage
 
 def setup_visual_logging(debug=False):
     """
@@ -17,10 +25,10 @@ def setup_visual_logging(debug=False):
         Path to log directory
     """
     debug = True
-    # Create timestamped log directory
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_dir = os.path.join("logs", f"run_{timestamp}")
-    os.makedirs(log_dir, exist_ok=True)
+    # Create the timestamped run directory shared by all screenshot writers
+    run_context = RunContext.create()
+    set_run_context(run_context)
+    log_dir = run_context.run_dir
     
     # Set up file and console logging
     log_level = logging.DEBUG if debug else logging.INFO
@@ -39,95 +47,280 @@ def setup_visual_logging(debug=False):
     logging.info(f"Logging initialized in {log_dir}")
     return log_dir
 
-def log_with_screenshot(message, level=logging.INFO, region=None, stage_name=None):
+_screenshot_writer = None
+_flight_recorder = None
+_frame_store = None
+_storage_settings = {}
+_encoding_policies = {}
+
+def configure_screenshot_logging(settings=None):
+    """
+    Configure the background screenshot writer.
+    
+    Args:
+        settings: "screenshot_logging" configuration dictionary with optional
+                  queue_size, overflow_policy ("drop_oldest" or "coalesce"),
+                  mode ("flight_recorder" or "always"), a flight_recorder
+                  section (capacity, compression, log_capacity) and a storage
+                  section (container, dedupe, delta, tile_size,
+                  keyframe_interval, max_changed_ratio) and an encoding section mapping
+                  categories to encoding policies
+    
+    Returns:
+        The ScreenshotWriter instance
+    """
+    global _screenshot_writer, _flight_recorder, _frame_store, _storage_settings, _encoding_policies
+    settings = settings or {}
+    _storage_settings = settings.get("storage", {})
+    _encoding_policies = {
+        category: EncodingPolicy.from_config(policy)
+        for category, policy in (settings.get("encoding") or {}).items()
+    }
+    
+    if _screenshot_writer is not None:
+        _screenshot_writer.close()
+    if _flight_recorder is not None:
+        logging.getLogger().removeHandler(_flight_recorder.log_handler)
+        _flight_recorder = None
+    
+    _screenshot_writer = ScreenshotWriter(
+        max_queue=settings.get("queue_size", 64),
+        policy=settings.get("overflow_policy", "drop_oldest")
+    )
+    
+    mode = settings.get("mode", "flight_recorder")
+    if mode == "flight_recorder":
+        recorder_settings = settings.get("flight_recorder", {})
+        _flight_recorder = FlightRecorder(
+            capacity=recorder_settings.get("capacity", 50),
+            compression=recorder_settings.get("compression", 1),
+            log_capacity=recorder_settings.get("log_capacity", 500),
+            dedupe=_storage_settings.get("dedupe", "exact")
+        )
+        logging.getLogger().addHandler(_flight_recorder.log_handler)
+        _install_flush_signal()
+    elif mode != "always":
+        logging.warning(f"Unknown screenshot logging mode '{mode}', writing every screenshot")
+    
+    logging.debug(f"Screenshot writer started (mode: {mode}, queue: {_screenshot_writer.max_queue}, "
+                  f"policy: {_screenshot_writer.policy})")
+    return _screenshot_writer
+
+def get_frame_store(run_context=None):
+    """
+    Get the deduplicating frame store of a run (used on the writer thread).
+    
+    Args:
+        run_context: RunContext to store frames for (default: the current run)
+    
+    Returns:
+        FrameStore instance
+    """
+    global _frame_store
+    run_context = run_context or get_run_context()
+    if _frame_store is None or _frame_store.run_context is not run_context:
+        if _frame_store is not None:
+            _frame_store.close()
+        _frame_store = FrameStore(
+            run_context,
+            dedupe=_storage_settings.get("dedupe", "exact"),
+            delta=_storage_settings.get("delta", False),
+            tile_size=_storage_settings.get("tile_size", 64),
+            keyframe_interval=_storage_settings.get("keyframe_interval", 30),
+            max_changed_ratio=_storage_settings.get("max_changed_ratio", 0.5),
+            policy=_encoding_policies.get("default"),
+            container=_storage_settings.get("container", True)
+        )
+    return _frame_store
+
+def get_encoding_policy(category="stage", level=logging.INFO):
+    """
+    Get the encoding policy for a frame.
+    
+    Warnings and errors use the "error" policy so they keep full detail;
+    other frames use their category's policy, then the "default" policy.
+    
+    Args:
+        category: Frame category ("stage", "click_debug" or "flight_recorder")
+        level: Logging level of the frame's message
+    
+    Returns:
+        EncodingPolicy instance
+    """
+    if level >= logging.WARNING and "error" in _encoding_policies:
+        return _encoding_policies["error"]
+    return _encoding_policies.get(category) or _encoding_policies.get("default") or EncodingPolicy()
+
+def get_screenshot_writer():
+    """Get the background screenshot writer, starting one with defaults if needed."""
+    if _screenshot_writer is None:
+        configure_screenshot_logging()
+    return _screenshot_writer
+
+@atexit.register
+def close_screenshot_logging():
+    """Write out any queued screenshots and stop the writer thread."""
+    global _screenshot_writer, _frame_store
+    if _screenshot_writer is not None:
+        _screenshot_writer.close()
+        _screenshot_writer = None
+    if _frame_store is not None:
+        _frame_store.close()
+        _frame_store = None
+
+def flush_flight_recorder(reason="manual"):
+    """
+    Write the frames buffered by the flight recorder to the run directory.
+    
+    The flush is queued behind any frames already submitted, so the frame
+    that triggered it is included. Does nothing when every screenshot is
+    written directly.
+    
+    Args:
+        reason: Short reason included in the dump directory name
+    """
+    writer = get_screenshot_writer()
+    recorder = _flight_recorder
+    if recorder is None:
+        return
+    
+    run_context = get_run_context()
+    # Flushed frames document a failure, so they are stored like errors
+    policy = _encoding_policies.get("flight_recorder") or get_encoding_policy("flight_recorder", logging.ERROR)
+    writer.submit(lambda: recorder.flush(run_context.run_dir, reason, get_frame_store(run_context), policy),
+                  droppable=False)
+
+def _install_flush_signal():
+    """Flush the flight recorder on SIGUSR1 where the platform supports it."""
+    if not hasattr(signal, "SIGUSR1") or threading.current_thread() is not threading.main_thread():
+        return
+    
+    def handle_signal(signum, frame):
+        # Submit from another thread: the interrupted code may hold the queue lock
+        threading.Thread(target=flush_flight_recorder, args=("signal",), daemon=True).start()
+    
+    signal.signal(signal.SIGUSR1, handle_signal)
+
+def record_frame(image, stage_name, message, level=logging.INFO, region=None, annotations=None,
+                 category="stage", filename=None):
+    """
+    Hand a captured frame to the background writer.
+    
+    In flight recorder mode the frame is buffered in memory; otherwise it is
+    saved right away to the category's directory of the current run. Every
+    saved frame is listed in the run manifest together with its annotations,
+    which are only drawn when the frame is viewed or exported.
+    
+    Args:
+        image: Captured PIL Image
+        stage_name: Name of the execution stage
+        message: Log message describing the frame
+        level: Logging level of the message
+        region: Optional screen region the frame relates to
+        annotations: Optional list of annotations (see src.utils.annotations)
+        category: Kind of frame ("stage" or "click_debug"), also selects the directory
+        filename: Base filename (without extension) of the saved frame
+    """
+    file_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    writer = get_screenshot_writer()
+    recorder = _flight_recorder
+    run_context = get_run_context()
+    
+    metadata = {
+        "frame_id": run_context.next_frame_id(),
+        "timestamp": time.time(),
+        "file_timestamp": file_timestamp,
+        "category": category,
+        "stage": stage_name,
+        "element": element_from_stage(stage_name),
+        "message": message,
+        "level": logging.getLevelName(level),
+        "region": list(region) if region else None,
+        "annotations": annotations or []
+    }
+    
+    if recorder is not None:
+        writer.submit(lambda: recorder.record(image, metadata), key=stage_name)
+    else:
+        directory = run_context.screenshot_dir if category == "stage" else os.path.join(run_context.run_dir, category)
+        stage_prefix = f"{stage_name}_" if stage_name else ""
+        filename = filename or f"{stage_prefix}screenshot_{file_timestamp}"
+        policy = get_encoding_policy(category, level)
+        writer.submit(lambda: _save_screenshot(image, directory, filename, metadata, run_context, policy),
+                      key=stage_name)
+
+def log_with_screenshot(message, level=logging.INFO, region=None, stage_name=None, image=None,
+                        image_origin=(0, 0), annotations=None):
     """
     Log a message and capture a screenshot at each program stage.
     
+    Only the capture happens on the calling thread; the frame is then handed
+    to the background writer, which buffers it in the flight recorder or
+    saves it. Stage, time and message labels are recorded as annotations
+    instead of being drawn on the frame.
+    
     Args:
         message: Log message
         level: Logging level (default: INFO)
         region: Optional region to capture (x, y, width, height)
         stage_name: Name of the current execution stage (used in filename)
+        image: Optional frame the caller already captured, used instead of
+               taking a new screenshot
+        image_origin: Screen position of the top-left corner of image
+        annotations: Optional extra annotations in frame coordinates
     """
     # Log the message
     logging.log(level, message)
     
     try:
-        # Create screenshots directory for this run
-        timestamp_run = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_dir = os.path.join("logs", f"run_{timestamp_run}", "screenshots")
-        os.makedirs(screenshot_dir, exist_ok=True)
-        
-        # Generate timestamp for this specific screenshot
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        
-        # Include stage name in filename if provided
-        stage_prefix = f"{stage_name}_" if stage_name else ""
-        filename = os.path.join(screenshot_dir, f"{stage_prefix}screenshot_{timestamp}.png")
-        
-        # Log before attempting to capture
-        logging.debug(f"Attempting to capture screenshot for stage: {stage_name or 'unnamed'}")
+        time_info = f"Time: {datetime.now().strftime('%H:%M:%S.%f')[:-3]}"
         
-        # Capture screenshot (full screen or region)
-        try:
-            screenshot = pyautogui.screenshot(region=region)
-            logging.debug(f"Screenshot captured successfully")
-        except Exception as screenshot_error:
-            logging.error(f"Failed to capture screenshot: {screenshot_error}", exc_info=True)
-            return
+        # Capture screenshot (full screen or region) unless the caller has one
+        if image is None:
+            logging.debug(f"Attempting to capture screenshot for stage: {stage_name or 'unnamed'}")
+            try:
+                image = pyautogui.screenshot(region=region)
+                image_origin = (region[0], region[1]) if region else (0, 0)
+                logging.debug(f"Screenshot captured successfully")
+            except Exception as screenshot_error:
+                logging.error(f"Failed to capture screenshot: {screenshot_error}", exc_info=True)
+                return
         
-        # Save the screenshot
-        try:
-            screenshot.save(filename)
-            logging.debug(f"Screenshot saved to {filename}")
-        except Exception as save_error:
-            logging.error(f"Failed to save screenshot: {save_error}", exc_info=True)
-            return
-        
-        # Create an annotated version with timestamp and stage info
-        try:
-            # Convert to OpenCV format
-            img = np.array(screenshot)
-            img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-            
-            # Add timestamp and stage information
-            stage_info = f"Stage: {stage_name}" if stage_name else "Unnamed stage"
-            time_info = f"Time: {datetime.now().strftime('%H:%M:%S.%f')[:-3]}"
-            
-            # Add text to top of image
-            cv2.putText(
-                img, 
-                f"{stage_info} | {time_info}",
-                (10, 30),  # Position at top-left with padding
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.7,  # Font size
-                (0, 0, 255),  # Red color
-                2  # Thickness
-            )
-            
-            # Add message text
-            cv2.putText(
-                img, 
-                message[:100] + "..." if len(message) > 100 else message,
-                (10, 70),  # Position below stage info
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.6,  # Font size
-                (0, 255, 0),  # Green color
-                1  # Thickness
-            )
-            
-            # If region is specified, draw rectangle
-            if region:
-                x, y, w, h = region
-                cv2.rectangle(img, (x, y), (x + w, y + h), (255, 0, 0), 3)
-            
-            # Save the annotated screenshot
-            annotated_filename = os.path.join(screenshot_dir, f"{stage_prefix}annotated_{timestamp}.png")
-            cv2.imwrite(annotated_filename, img)
-            logging.debug(f"Annotated screenshot saved to {annotated_filename}")
-            
-        except Exception as annotation_error:
-            logging.error(f"Failed to create annotated screenshot: {annotation_error}", exc_info=True)
+        record_frame(
+            image, stage_name, message, level=level, region=region,
+            annotations=stage_annotations(stage_name, time_info, message, region, image_origin) + (annotations or [])
+        )
         
     except Exception as e:
-        logging.error(f"Failed in log_with_screenshot: {e}", exc_info=True)
\ No newline at end of file
+        logging.error(f"Failed in log_with_screenshot: {e}", exc_info=True)
+
+def _save_screenshot(screenshot, directory, filename, metadata, run_context, policy=None):
+    """
+    Save a screenshot and list it in the run manifest (runs on the writer thread).
+    
+    Args:
+        screenshot: Captured PIL Image
+        directory: Directory to write to
+        filename: Base filename without extension
+        metadata: Frame metadata recorded in the run manifest
+        run_context: RunContext whose manifest lists the saved file
+        policy: EncodingPolicy for the frame (default: the store's policy)
+    """
+    img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+    
+    # Save the screenshot unless an identical frame is already stored
+    try:
+        stored = get_frame_store(run_context).save(directory, filename, pixels=img,
+                                                   frame_id=metadata["frame_id"], policy=policy)
+    except Exception as save_error:
+        logging.error(f"Failed to save screenshot: {save_error}", exc_info=True)
+        return
+    
+    if stored["duplicate_of"] is not None:
+        logging.debug(f"Screenshot {filename} duplicates frame {stored['duplicate_of']}")
+    else:
+        logging.debug(f"Screenshot saved to {stored['file'] or stored['delta_file']}")
+    
+    entry = {key: value for key, value in metadata.items() if key != "file_timestamp"}
+    entry.update(stored)
+    run_context.append_manifest(entry)
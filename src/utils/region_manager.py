@@ -230,7 +230,10 @@ class RegionManager:
                     if len(values) == 4:
                         return tuple(values)
             
-            # Linux approach would require tools like xwininfo or wmctrl
+            else:  # Linux: EWMH client list (or root children) via xprop and xwininfo
+                from src.automation.readiness import find_x11_window, x11_supported
+                if x11_supported():
+                    return find_x11_window(title=window_title)
             
             return None
             
@@ -0,0 +1,135 @@
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+
+MANIFEST_NAME = "manifest.jsonl"
+
+class RunContext:
+    """
+    Directory and screenshot manifest of a single automation run.
+    
+    Every screenshot written during the run goes below run_dir and gets one
+    JSON line in manifest.jsonl describing its stage, element, region and
+    file, so tools can index a run without globbing filenames.
+    """
+    
+    def __init__(self, run_dir):
+        """
+        Initialize the run context.
+        
+        Args:
+            run_dir: Directory of this run (created if missing)
+        """
+        self.run_dir = run_dir
+        self.screenshot_dir = os.path.join(run_dir, "screenshots")
+        self.manifest_path = os.path.join(run_dir, MANIFEST_NAME)
+        self._frame_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        os.makedirs(run_dir, exist_ok=True)
+    
+    @classmethod
+    def create(cls, base_dir="logs"):
+        """
+        Create a context for a new run in a timestamped directory.
+        
+        Args:
+            base_dir: Parent directory for run directories
+        
+        Returns:
+            RunContext instance
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_dir = os.path.join(base_dir, f"run_{timestamp}")
+        suffix = 1
+        os.makedirs(base_dir, exist_ok=True)
+        # Claim the directory atomically; parallel workers may start in the same second
+        while True:
+            try:
+                os.mkdir(run_dir)
+                break
+            except FileExistsError:
+                suffix += 1
+                run_dir = os.path.join(base_dir, f"run_{timestamp}_{suffix}")
+        return cls(run_dir)
+    
+    def next_frame_id(self):
+        """Get the next frame id of this run."""
+        return next(self._frame_ids)
+    
+    def relative(self, path):
+        """Get a path relative to the run directory."""
+        return os.path.relpath(path, self.run_dir)
+    
+    def append_manifest(self, entry):
+        """
+        Append an entry to the run manifest.
+        
+        Args:
+            entry: JSON-serializable dictionary
+        """
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            with open(self.manifest_path, "a") as f:
+                f.write(line + "\n")
+
+_run_context = None
+
+def get_run_context():
+    """Get the current run context, creating one if the run has not set it up."""
+    global _run_context
+    if _run_context is None:
+        _run_context = RunContext.create()
+    return _run_context
+
+def set_run_context(context):
+    """Set the current run context."""
+    global _run_context
+    _run_context = context
+
+def read_manifest(run_dir):
+    """
+    Read the screenshot manifest of a run.
+    
+    Args:
+        run_dir: Run directory
+    
+    Returns:
+        List of manifest entries (empty if the run has no manifest)
+    """
+    path = os.path.join(run_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return []
+    
+    entries = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                logging.warning(f"Skipping malformed manifest line {line_number} in {path}")
+    return entries
+
+def element_from_stage(stage_name):
+    """
+    Get the UI element name from a stage name such as SEARCH_<element>_START,
+    FOUND_<element>, NOT_FOUND_<element> or CLICK_<element>.
+    
+    Args:
+        stage_name: Stage name
+    
+    Returns:
+        Element name or None
+    """
+    if not stage_name:
+        return None
+    match = re.match(r"(?:SEARCH_(\w+)_START|NOT_FOUND_(\w+)|FOUND_(\w+)|CLICK_(\w+))$", stage_name)
+    if not match:
+        return None
+    return next(group for group in match.groups() if group)
@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from collections import deque
+
+class ScreenshotWriter:
+    """
+    Background writer for debug screenshots.
+    
+    Callers only capture the frame and submit a job; encoding, annotation
+    and disk writes run on a single worker thread fed by a bounded queue.
+    When the queue is full the overflow policy decides which frame to lose:
+    
+    - "drop_oldest": discard the oldest pending job
+    - "coalesce": replace a pending job with the same key (e.g. the same
+      stage) with the new one, falling back to dropping the oldest
+    """
+    
+    POLICIES = ("drop_oldest", "coalesce")
+    
+    def __init__(self, max_queue=64, policy="drop_oldest"):
+        """
+        Initialize and start the writer thread.
+        
+        Args:
+            max_queue: Maximum number of pending jobs
+            policy: Overflow policy ("drop_oldest" or "coalesce")
+        """
+        if policy not in self.POLICIES:
+            logging.warning(f"Unknown screenshot queue policy '{policy}', using drop_oldest")
+            policy = "drop_oldest"
+        
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self._pending = deque()  # Entries of [key, job, droppable]
+        self._condition = threading.Condition()
+        self._busy = False
+        self._closed = False
+        
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.failed = 0
+        
+        self._thread = threading.Thread(target=self._run, name="ScreenshotWriter", daemon=True)
+        self._thread.start()
+    
+    def submit(self, job, key=None, droppable=True):
+        """
+        Queue a job for the writer thread.
+        
+        Args:
+            job: Callable taking no arguments
+            key: Optional key used by the coalesce policy
+            droppable: Whether the job may be discarded when the queue is full
+        
+        Returns:
+            True if the job was queued, False if the writer is closed
+        """
+        with self._condition:
+            if self._closed:
+                return False
+            
+            self.submitted += 1
+            droppable_count = sum(1 for entry in self._pending if entry[2])
+            if droppable and droppable_count >= self.max_queue:
+                if self.policy == "coalesce" and key is not None:
+                    for entry in reversed(self._pending):
+                        if entry[2] and entry[0] == key:
+                            entry[1] = job
+                            self.dropped += 1
+                            self._condition.notify()
+                            return True
+                
+                for entry in self._pending:
+                    if entry[2]:
+                        self._pending.remove(entry)
+                        self.dropped += 1
+                        break
+            
+            self._pending.append([key, job, droppable])
+            self._condition.notify()
+            return True
+    
+    def flush(self, timeout=None):
+        """
+        Wait until all queued jobs have been processed.
+        
+        Args:
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+        
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+    
+    def close(self, timeout=10):
+        """
+        Finish pending jobs and stop the writer thread.
+        
+        Args:
+            timeout: Maximum time to wait for pending jobs in seconds
+        """
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        
+        if self.dropped:
+            logging.info(f"Screenshot writer dropped {self.dropped} of {self.submitted} frames")
+    
+    def _run(self):
+        """Worker loop."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                _, job, _ = self._pending.popleft()
+                self._busy = True
+            
+            try:
+                job()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logging.error(f"Screenshot writer job failed: {e}", exc_info=True)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
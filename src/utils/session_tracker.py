@@ -1,11 +1,30 @@
 # src/utils/session_tracker.py
 import os
 import json
+import hashlib
 import logging
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 class SessionTracker:
-    """Tracks which sessions have been completed and when."""
+    """
+    Tracks which sessions have been completed and when.
+    
+    Several processes may share the status file (parallel workers), so
+    every save takes an exclusive lock on a sibling .lock file, reloads the
+    file, applies only the sessions this tracker changed and replaces the
+    file atomically.
+    
+    Within a session, every prompt that was sent is checkpointed the same
+    way, so an interrupted session can resume after the last prompt sent
+    instead of sending its prompts again.
+    """
     
     def __init__(self, tracker_file="config/session_status.json"):
         """
@@ -15,36 +34,117 @@ class SessionTracker:
             tracker_file: Path to the JSON file tracking session status
         """
         self.tracker_file = tracker_file
+        self.lock_file = tracker_file + ".lock"
         self.session_status = {}
         self._load_status()
     
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive lock on the status file across processes."""
+        directory = os.path.dirname(self.tracker_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.lock_file, 'a+') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+                else:
+                    lock.seek(0)
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def _read_file(self):
+        """Read the status file, returning an empty status if it is missing or unreadable."""
+        if not os.path.exists(self.tracker_file):
+            return {}
+        try:
+            with open(self.tracker_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(f"Error loading session status: {e}")
+            return {}
+    
     def _load_status(self):
         """Load the session status from file."""
         if os.path.exists(self.tracker_file):
-            try:
-                with open(self.tracker_file, 'r') as f:
-                    self.session_status = json.load(f)
-                logging.debug(f"Loaded session status from {self.tracker_file}")
-            except Exception as e:
-                logging.error(f"Error loading session status: {e}")
-                self.session_status = {}
+            with self._locked():
+                self.session_status = self._read_file()
+            logging.debug(f"Loaded session status from {self.tracker_file}")
         else:
             logging.info(f"No existing session status file found at {self.tracker_file}")
             # Create the directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.tracker_file), exist_ok=True)
+            directory = os.path.dirname(self.tracker_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
             self.session_status = {}
     
-    def _save_status(self):
-        """Save the session status to file."""
+    def reload(self):
+        """Reload the session status written by other processes."""
+        self._load_status()
+        return self.session_status
+    
+    def _save_status(self, session_ids=None):
+        """
+        Save the session status to file.
+        
+        Args:
+            session_ids: Sessions whose entries this tracker changed (default: all);
+                         entries of other sessions are kept as they are on disk
+        """
         try:
-            with open(self.tracker_file, 'w') as f:
-                json.dump(self.session_status, f, indent=2)
+            with self._locked():
+                merged = self._read_file()
+                for session_id in (self.session_status if session_ids is None else session_ids):
+                    if session_id in self.session_status:
+                        merged[session_id] = self.session_status[session_id]
+                self._write_file(merged)
             logging.debug(f"Saved session status to {self.tracker_file}")
             return True
         except Exception as e:
             logging.error(f"Error saving session status: {e}")
             return False
     
+    def _write_file(self, status):
+        """Replace the status file atomically (the lock must be held)."""
+        temp_path = f"{self.tracker_file}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(status, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.tracker_file)
+        self.session_status = status
+    
+    def _update_session(self, session_id, update):
+        """
+        Change one session's entry as it is on disk now and save it.
+        
+        Unlike _save_status this starts from the file's entry, so fields
+        written by other processes (e.g. the checkpoints of a worker's
+        sender process) are kept.
+        
+        Args:
+            session_id: The session identifier
+            update: Callable modifying the entry dictionary in place
+            
+        Returns:
+            bool: True if status was successfully saved
+        """
+        try:
+            with self._locked():
+                status = self._read_file()
+                update(status.setdefault(session_id, {}))
+                self._write_file(status)
+            return True
+        except Exception as e:
+            logging.error(f"Error saving session status: {e}")
+            return False
+    
     def is_completed(self, session_id):
         """
         Check if a session has been completed.
@@ -69,17 +169,18 @@ class SessionTracker:
         Returns:
             bool: True if status was successfully saved
         """
-        if session_id not in self.session_status:
-            self.session_status[session_id] = {}
-        
-        self.session_status[session_id].update({
-            'completed': True,
-            'success': success,
-            'completion_time': datetime.now().isoformat(),
-            'notes': notes or ""
-        })
+        def update(entry):
+            entry.update({
+                'completed': True,
+                'success': success,
+                'completion_time': datetime.now().isoformat(),
+                'notes': notes or ""
+            })
+            # A successful session needs no resume point; a failed one keeps it
+            if success:
+                entry.pop('prompt_checkpoint', None)
         
-        return self._save_status()
+        return self._update_session(session_id, update)
     
     def reset_session(self, session_id):
         """
@@ -112,8 +213,9 @@ class SessionTracker:
             if 'completion_time' in self.session_status[session_id]:
                 del self.session_status[session_id]['completion_time']
             self.session_status[session_id]['notes'] = "Reset on " + datetime.now().isoformat()
+            self.session_status[session_id].pop('prompt_checkpoint', None)
             
-            return self._save_status()
+            return self._save_status([session_id])
         return False
     
     def reset_all_sessions(self):
@@ -127,6 +229,81 @@ class SessionTracker:
             self.reset_session(session_id)
         return True
     
+    @staticmethod
+    def _prompts_hash(prompts):
+        """Fingerprint a prompt list, so a checkpoint is not applied to changed prompts."""
+        return hashlib.sha1(json.dumps(list(prompts)).encode("utf-8")).hexdigest()
+    
+    def record_prompt_sent(self, session_id, prompt_index, prompts):
+        """
+        Checkpoint a prompt that was sent (and acknowledged, where the sender can tell).
+        
+        The checkpoint only advances over a contiguous run of prompts: a
+        prompt sent while an earlier one is not checkpointed does not move
+        the resume point past the earlier one. Only the resume point and the
+        prompt fingerprint are kept, so the entry stays the same size however
+        many prompts a session sends.
+        
+        Args:
+            session_id: The session identifier
+            prompt_index: Zero-based index of the sent prompt
+            prompts: The session's prompt list
+            
+        Returns:
+            bool: True if the checkpoint was saved and covers the prompt
+        """
+        prompts_hash = self._prompts_hash(prompts)
+        covered = []
+        
+        def update(entry):
+            checkpoint = entry.get('prompt_checkpoint') or {}
+            if checkpoint.get('prompts_hash') != prompts_hash:
+                checkpoint = {'prompts_hash': prompts_hash, 'prompts_sent': 0}
+            if prompt_index == checkpoint['prompts_sent']:
+                checkpoint['prompts_sent'] += 1
+            covered.append(prompt_index < checkpoint['prompts_sent'])
+            checkpoint['prompt_count'] = len(prompts)
+            checkpoint['updated'] = datetime.now().isoformat()
+            checkpoint.pop('log', None)
+            entry['prompt_checkpoint'] = checkpoint
+        
+        if not self._update_session(session_id, update):
+            return False
+        if not covered[0]:
+            logging.warning(f"Prompt {prompt_index + 1} of session {session_id} was sent before an earlier "
+                            f"unsent prompt; the session still resumes at the earlier prompt")
+        return covered[0]
+    
+    def get_resume_index(self, session_id, prompts):
+        """
+        Get the index of the first prompt not sent by an earlier run of the session.
+        
+        Args:
+            session_id: The session identifier
+            prompts: The session's prompt list; a checkpoint for different prompts is ignored
+            
+        Returns:
+            int: Index to resume at (0 if there is nothing to resume)
+        """
+        checkpoint = self.reload().get(session_id, {}).get('prompt_checkpoint')
+        if not checkpoint:
+            return 0
+        if checkpoint.get('prompts_hash') != self._prompts_hash(prompts):
+            logging.info(f"Prompts of session {session_id} changed since its checkpoint; starting from the first prompt")
+            return 0
+        return min(checkpoint.get('prompts_sent', 0), len(prompts))
+    
+    def clear_prompt_checkpoint(self, session_id):
+        """
+        Forget the sent prompts of a session, so its next run starts from the first prompt.
+        
+        Returns:
+            bool: True if status was successfully saved
+        """
+        if 'prompt_checkpoint' not in self.reload().get(session_id, {}):
+            return True
+        return self._update_session(session_id, lambda entry: entry.pop('prompt_checkpoint', None))
+    
     def get_session_status(self, session_id=None):
         """
         Get the status of a specific session or all sessions.
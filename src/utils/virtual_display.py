@@ -0,0 +1,160 @@
+import logging
+import os
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+
+class VirtualDisplay:
+    """
+    A private Xvfb X server.
+    
+    Processes started with env() see only this display, so their
+    pyautogui input, screen captures and browser windows stay isolated
+    from the desktop and from other virtual displays.
+    """
+    
+    def __init__(self, number, width=1920, height=1080, depth=24):
+        """
+        Initialize the virtual display.
+        
+        Args:
+            number: X display number (":<number>")
+            width, height: Screen size in pixels
+            depth: Color depth in bits
+        """
+        self.number = number
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.process = None
+    
+    @property
+    def name(self):
+        """DISPLAY value of this display."""
+        return f":{self.number}"
+    
+    @property
+    def socket_path(self):
+        return f"/tmp/.X11-unix/X{self.number}"
+    
+    def in_use(self):
+        """Check whether another X server already holds this display number."""
+        return os.path.exists(self.socket_path) or os.path.exists(f"/tmp/.X{self.number}-lock")
+    
+    def start(self, timeout=10):
+        """
+        Start Xvfb and wait until it accepts connections.
+        
+        Args:
+            timeout: Maximum time to wait for the server in seconds
+        
+        Returns:
+            self
+        """
+        if shutil.which("Xvfb") is None:
+            raise RuntimeError("Xvfb is not installed")
+        if self.in_use():
+            raise RuntimeError(f"Display {self.name} is already in use")
+        
+        self.process = subprocess.Popen(
+            ["Xvfb", self.name, "-screen", "0", f"{self.width}x{self.height}x{self.depth}", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.time() + timeout
+        while not os.path.exists(self.socket_path):
+            if self.process.poll() is not None or time.time() > deadline:
+                self.stop()
+                raise RuntimeError(f"Xvfb {self.name} did not start")
+            time.sleep(0.05)
+        logging.info(f"Started Xvfb on {self.name} ({self.width}x{self.height})")
+        return self
+    
+    def stop(self):
+        """Stop the X server."""
+        if self.process is None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.process = None
+        logging.info(f"Stopped Xvfb on {self.name}")
+    
+    def env(self, base=None):
+        """
+        Get an environment for processes running on this display.
+        
+        Args:
+            base: Environment to extend (default: os.environ)
+        
+        Returns:
+            Environment dictionary with DISPLAY set
+        """
+        env = dict(os.environ if base is None else base)
+        env["DISPLAY"] = self.name
+        # A Wayland session would otherwise take precedence for toolkits
+        env.pop("WAYLAND_DISPLAY", None)
+        return env
+    
+    @contextmanager
+    def active(self):
+        """
+        Point $DISPLAY of this process at the display while the block runs.
+        
+        For imports that connect to $DISPLAY (pyautogui does); the previous
+        value is restored afterwards, so later child processes still get
+        their display only through env().
+        """
+        previous = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = self.name
+        try:
+            yield self
+        finally:
+            if previous is None:
+                os.environ.pop("DISPLAY", None)
+            else:
+                os.environ["DISPLAY"] = previous
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def parse_screen(screen):
+    """Parse a "WIDTHxHEIGHT[xDEPTH]" screen size into (width, height, depth)."""
+    parts = [int(part) for part in str(screen).lower().split("x")]
+    if len(parts) == 2:
+        parts.append(24)
+    if len(parts) != 3:
+        raise ValueError(f"Invalid screen size '{screen}', expected WIDTHxHEIGHT or WIDTHxHEIGHTxDEPTH")
+    return tuple(parts)
+
+def start_displays(count, first=100, screen="1920x1080x24"):
+    """
+    Start virtual displays on the first free display numbers from first.
+    
+    Args:
+        count: Number of displays
+        first: Lowest display number to use
+        screen: Screen size of every display
+    
+    Returns:
+        List of started VirtualDisplay instances
+    """
+    width, height, depth = parse_screen(screen)
+    displays = []
+    number = first
+    try:
+        while len(displays) < count:
+            display = VirtualDisplay(number, width, height, depth)
+            number += 1
+            if display.in_use():
+                continue
+            displays.append(display.start())
+    except Exception:
+        for display in displays:
+            display.stop()
+        raise
+    return displays
@@ -0,0 +1,98 @@
+"""Tests for the append-only frame container."""
+
+import os
+import cv2
+import numpy as np
+from src.utils.frame_container import INDEX_DTYPE, FrameContainerReader, FrameContainerWriter, chunk_path, read_index
+
+def payload(number, size=60):
+    return bytes([number]) * size
+
+def read_all(directory):
+    reader = FrameContainerReader(directory)
+    try:
+        return [bytes(reader.read(record)[0]) for record in range(len(reader))]
+    finally:
+        reader.close()
+
+def test_frames_read_back_with_their_format(tmp_path):
+    writer = FrameContainerWriter(str(tmp_path))
+    assert writer.append(payload(1), "png") == 0
+    assert writer.append(payload(2, 10), "npz") == 1
+    writer.close()
+    
+    reader = FrameContainerReader(str(tmp_path))
+    assert len(reader) == 2
+    data, format = reader.read(1)
+    assert (bytes(data), format) == (payload(2, 10), "npz")
+    assert reader.length(0) == 60
+    reader.close()
+
+def test_chunk_rollover(tmp_path):
+    writer = FrameContainerWriter(str(tmp_path), chunk_size=150)
+    for number in range(5):
+        writer.append(payload(number))
+    # A frame larger than a chunk still goes into the (empty) next chunk on its own
+    writer.append(payload(9, 400))
+    writer.close()
+    
+    index = read_index(os.path.join(str(tmp_path), "frames.idx"))
+    assert list(index["chunk"]) == [0, 0, 1, 1, 2, 3]
+    assert list(index["offset"]) == [0, 60, 0, 60, 0, 0]
+    assert all(os.path.getsize(chunk_path(str(tmp_path), "frames", chunk)) <= 150 for chunk in range(3))
+    assert read_all(str(tmp_path)) == [payload(number) for number in range(5)] + [payload(9, 400)]
+
+def test_reopened_writer_continues_the_last_chunk(tmp_path):
+    writer = FrameContainerWriter(str(tmp_path), chunk_size=150)
+    for number in range(3):
+        writer.append(payload(number))
+    writer.close()
+    
+    writer = FrameContainerWriter(str(tmp_path), chunk_size=150)
+    assert (writer.count, writer.chunk) == (3, 1)
+    assert writer.append(payload(3)) == 3
+    writer.close()
+    assert read_all(str(tmp_path)) == [payload(number) for number in range(4)]
+
+def test_truncated_index_record_is_dropped(tmp_path):
+    writer = FrameContainerWriter(str(tmp_path))
+    writer.append(payload(1))
+    writer.append(payload(2))
+    writer.close()
+    index_path = os.path.join(str(tmp_path), "frames.idx")
+    with open(index_path, "ab") as f:
+        f.write(b"\x01\x02\x03\x04\x05")  # Crash in the middle of a record
+    
+    assert len(read_index(index_path)) == 2
+    writer = FrameContainerWriter(str(tmp_path))
+    assert os.path.getsize(index_path) == 2 * INDEX_DTYPE.itemsize
+    assert writer.append(payload(3)) == 2
+    writer.close()
+    assert read_all(str(tmp_path)) == [payload(1), payload(2), payload(3)]
+
+def test_reader_picks_up_appended_frames(tmp_path):
+    writer = FrameContainerWriter(str(tmp_path))
+    writer.append(payload(1))
+    reader = FrameContainerReader(str(tmp_path))
+    assert bytes(reader.read(0)[0]) == payload(1)
+    
+    writer.append(payload(2))
+    assert bytes(reader.read(1)[0]) == payload(2)
+    assert reader.length(1) == 60
+    reader.close()
+    writer.close()
+
+def test_missing_index_is_empty(tmp_path):
+    index = read_index(os.path.join(str(tmp_path), "frames.idx"))
+    assert len(index) == 0 and index.dtype == INDEX_DTYPE
+
+def test_image_frames_decode(tmp_path):
+    image = np.zeros((8, 12, 3), dtype=np.uint8)
+    image[2:5, 3:9] = (10, 200, 30)
+    writer = FrameContainerWriter(str(tmp_path))
+    writer.append(cv2.imencode(".png", image)[1].tobytes())
+    writer.close()
+    
+    reader = FrameContainerReader(str(tmp_path))
+    assert np.array_equal(reader.decode(0), image)
+    reader.close()
@@ -0,0 +1,68 @@
+"""Tests for the deduplication keys and index of FrameStore."""
+
+import numpy as np
+import pytest
+from src.utils.frame_store import EncodingPolicy, FrameStore, frame_key, load_frame
+from src.utils.run_context import RunContext
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(3)
+    return rng.integers(0, 256, size=(72, 128, 3), dtype=np.uint8)
+
+@pytest.fixture
+def run(tmp_path):
+    return RunContext(str(tmp_path / "run"))
+
+def test_exact_key_changes_with_any_pixel(frame):
+    changed = frame.copy()
+    changed[10, 20, 1] ^= 1
+    assert frame_key(frame) == frame_key(frame.copy())
+    assert frame_key(frame) != frame_key(changed)
+
+def test_key_includes_the_shape(frame):
+    reshaped = frame.reshape(36, 256, 3)
+    assert frame_key(frame) != frame_key(reshaped)
+    assert frame_key(frame, "signature") != frame_key(reshaped, "signature")
+
+def test_signature_key_ignores_tiny_changes(frame):
+    flat = np.full((72, 128, 3), 128, dtype=np.uint8)
+    cursor = flat.copy()
+    cursor[30:32, 60] = 140
+    assert frame_key(flat, "signature") == frame_key(cursor, "signature")
+    assert frame_key(flat, "signature") != frame_key(frame, "signature")
+
+def test_off_mode_has_no_key(frame):
+    assert frame_key(frame, "off") is None
+
+def test_identical_frame_references_the_first(run, frame):
+    store = FrameStore(run)
+    first = store.save(run.screenshot_dir, "a", pixels=frame, frame_id=1)
+    second = store.save(run.screenshot_dir, "b", pixels=frame.copy(), frame_id=2)
+    assert second["file"] == first["file"]
+    assert second["duplicate_of"] == 1
+    assert store.stats()["duplicates"] == 1
+    assert np.array_equal(load_frame(run.run_dir, second), frame)
+
+def test_other_policy_is_not_a_duplicate(run, frame):
+    store = FrameStore(run)
+    full = store.save(run.screenshot_dir, "a", pixels=frame)
+    thumbnail = store.save(run.screenshot_dir, "b", pixels=frame, policy=EncodingPolicy(scale=0.5))
+    assert thumbnail["file"] != full["file"]
+    assert store.stats()["duplicates"] == 0
+
+def test_evicted_key_is_stored_again(run, frame):
+    store = FrameStore(run, index_size=1)
+    other = 255 - frame
+    first = store.save(run.screenshot_dir, "a", pixels=frame)
+    store.save(run.screenshot_dir, "b", pixels=other)
+    again = store.save(run.screenshot_dir, "c", pixels=frame)
+    assert again["file"] != first["file"]
+    assert store.stats()["duplicates"] == 0
+
+def test_dedupe_off_stores_every_frame(run, frame):
+    store = FrameStore(run, dedupe="off")
+    first = store.save(run.screenshot_dir, "a", pixels=frame)
+    second = store.save(run.screenshot_dir, "b", pixels=frame)
+    assert first["file"] != second["file"]
+    assert store.stats()["duplicates"] == 0
@@ -0,0 +1,71 @@
+"""Tests for the band hashing and transcript splicing of IncrementalOCR."""
+
+import numpy as np
+import pytest
+from src.automation.ocr import IncrementalOCR
+
+LINE_HEIGHT = 8
+LINE_PITCH = 16
+
+def render_lines(line_numbers, height=LINE_PITCH * 6, width=200):
+    """
+    Draw text-like lines whose ink position identifies the line number.
+    
+    The same line renders to the same pixels wherever it appears, like a
+    text line scrolling through a response area.
+    """
+    image = np.full((height, width), 255, dtype=np.uint8)
+    for row, number in enumerate(line_numbers):
+        top = 4 + row * LINE_PITCH
+        left = 10 + number * 7
+        image[top:top + LINE_HEIGHT, left:left + 4] = 0
+    return image
+
+def line_number(band):
+    """Read the line number back from a band drawn by render_lines."""
+    return (int(np.flatnonzero((band < 128).any(axis=0))[0]) - 10) // 7
+
+@pytest.fixture
+def ocr():
+    incremental = IncrementalOCR((0, 0, 200, LINE_PITCH * 6))
+    incremental.recognized = []
+    
+    def recognize(band):
+        incremental.recognized.append(line_number(band))
+        return f"line {line_number(band)}"
+    
+    incremental._recognize_band = recognize
+    return incremental
+
+def expected(numbers):
+    return "\n".join(f"line {number}" for number in numbers)
+
+def test_unchanged_view_is_not_recognized_again(ocr):
+    image = render_lines([0, 1, 2])
+    assert ocr.update(image) == expected([0, 1, 2])
+    assert ocr.update(image) == expected([0, 1, 2])
+    assert ocr.recognized == [0, 1, 2]
+    assert ocr.bands_seen == 6
+
+def test_scrolled_lines_are_kept(ocr):
+    ocr.update(render_lines([0, 1, 2, 3, 4]))
+    ocr.update(render_lines([2, 3, 4, 5, 6]))
+    assert ocr.transcript == expected(range(7))
+    # Only the newly revealed lines were sent to OCR
+    assert ocr.recognized == [0, 1, 2, 3, 4, 5, 6]
+
+def test_growing_response_replaces_the_visible_window(ocr):
+    ocr.update(render_lines([0, 1]))
+    ocr.update(render_lines([0, 1, 2]))
+    ocr.update(render_lines([1, 2, 3, 4]))
+    assert ocr.transcript == expected(range(5))
+
+def test_view_past_the_previous_window_is_appended(ocr):
+    ocr.update(render_lines([0, 1, 2]))
+    ocr.update(render_lines([7, 8]))
+    assert ocr.transcript == expected([0, 1, 2, 7, 8])
+
+def test_reset_forgets_the_transcript(ocr):
+    ocr.update(render_lines([0, 1]))
+    ocr.reset()
+    assert ocr.update(render_lines([3])) == expected([3])
@@ -0,0 +1,92 @@
+"""Tests for the removal order and protection of LogRetentionManager."""
+
+import os
+import time
+import pytest
+from src.utils.log_retention import LogRetentionManager
+
+DAY = 24 * 60 * 60
+KB = 1024
+
+@pytest.fixture
+def logs(tmp_path):
+    return str(tmp_path / "logs")
+
+def make_run(base_dir, name, size_kb, age_days, error=False):
+    """Create a run directory of size_kb KB last modified age_days ago."""
+    path = os.path.join(base_dir, name)
+    os.makedirs(path)
+    with open(os.path.join(path, "frame.png"), "wb") as f:
+        f.write(b"\0" * size_kb * KB)
+    if error:
+        with open(os.path.join(path, "flight_error.json"), "w") as f:
+            f.write("{}")
+    mtime = time.time() - age_days * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+def candidates(manager):
+    manager.refresh()
+    return manager._candidates(time.time())
+
+def test_expired_artifacts_come_first_oldest_first(logs):
+    make_run(logs, "run_new", 1, 1)
+    make_run(logs, "run_old", 1, 30)
+    make_run(logs, "run_older", 1, 40, error=True)
+    manager = LogRetentionManager(logs, max_bytes=None, max_age_days=14)
+    assert candidates(manager) == ["run_older", "run_old"]
+
+def test_over_budget_removes_oldest_runs_without_errors_first(logs):
+    make_run(logs, "run_a", 10, 5, error=True)
+    make_run(logs, "run_b", 10, 4)
+    make_run(logs, "run_c", 10, 3)
+    make_run(logs, "run_d", 10, 2)
+    manager = LogRetentionManager(logs, max_bytes=25 * KB, max_age_days=None)
+    assert candidates(manager) == ["run_b", "run_c"]
+
+def test_runs_with_errors_are_not_spared_without_keep_errors(logs):
+    make_run(logs, "run_a", 10, 5, error=True)
+    make_run(logs, "run_b", 10, 4)
+    manager = LogRetentionManager(logs, max_bytes=15 * KB, max_age_days=None, keep_errors=False)
+    assert candidates(manager) == ["run_a"]
+
+def test_expired_size_counts_towards_the_budget(logs):
+    make_run(logs, "run_a", 10, 30)
+    make_run(logs, "run_b", 10, 3)
+    make_run(logs, "run_c", 10, 2)
+    manager = LogRetentionManager(logs, max_bytes=20 * KB, max_age_days=14)
+    assert candidates(manager) == ["run_a"]
+
+def test_protected_runs_are_never_candidates(logs):
+    current = make_run(logs, "run_current", 50, 30)
+    make_run(logs, "run_b", 10, 3)
+    manager = LogRetentionManager(logs, max_bytes=KB, max_age_days=14, protected=[current])
+    assert candidates(manager) == ["run_b"]
+
+def test_directory_containing_a_protected_path_is_kept(logs):
+    make_run(logs, "run_a", 10, 30)
+    manager = LogRetentionManager(logs, max_bytes=None, max_age_days=14,
+                                  protected=[os.path.join(logs, "run_a", "frame.png")])
+    assert candidates(manager) == []
+
+def test_files_of_debug_directories_are_pruned_one_by_one(logs):
+    directory = os.path.join(logs, "screenshots")
+    os.makedirs(directory)
+    for name, age_days in (("old.png", 30), ("new.png", 1)):
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(b"\0" * KB)
+        mtime = time.time() - age_days * DAY
+        os.utime(path, (mtime, mtime))
+    manager = LogRetentionManager(logs, max_bytes=None, max_age_days=14)
+    assert candidates(manager) == [os.path.join("screenshots", "old.png")]
+
+def test_prune_removes_at_most_max_deletions(logs):
+    for number in range(5):
+        make_run(logs, f"run_{number}", 1, 30 + number)
+    manager = LogRetentionManager(logs, max_bytes=None, max_age_days=14, max_deletions=2)
+    assert manager.prune() == (2, 2 * KB)
+    assert sorted(os.listdir(logs)) == [".retention_index.json", "run_0", "run_1", "run_2"]
+    assert manager.prune()[0] == 2
+    assert manager.prune()[0] == 1
+    assert manager.prune()[0] == 0
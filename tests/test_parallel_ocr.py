@@ -0,0 +1,91 @@
+"""Tests for planning and merging the bands of parallel OCR."""
+
+import numpy as np
+import pytest
+from src.automation import ocr
+from src.automation.ocr import WORD_BOX_DTYPE, find_line_bands, plan_parallel_bands, recognize_parallel, word_boxes_to_text
+
+LINE_HEIGHT = 10
+LINE_PITCH = 18
+
+def render_lines(count, width=300):
+    """Draw count text-like lines; the ink position identifies each line."""
+    image = np.full((count * LINE_PITCH + 6, width), 255, dtype=np.uint8)
+    for number in range(count):
+        top = 5 + number * LINE_PITCH
+        image[top:top + LINE_HEIGHT, 10 + number * 5:14 + number * 5] = 0
+    return image
+
+def fake_band_ocr(band, ocr_config, structured):
+    """Stand-in for _ocr_band_task: one word per line, at band coordinates."""
+    lines = find_line_bands(band, padding=0)
+    boxes = np.zeros(len(lines), dtype=WORD_BOX_DTYPE)
+    for i, (top, bottom) in enumerate(lines):
+        left = int(np.flatnonzero((band[top:bottom] < 128).any(axis=0))[0])
+        boxes[i] = (f"line{(left - 10) // 5}", left, top, 4, bottom - top, 95.0)
+    return boxes if structured else word_boxes_to_text(boxes)
+
+class ImmediatePool:
+    """Process pool stand-in that runs tasks in the calling process."""
+    
+    class Result:
+        def __init__(self, value):
+            self.value = value
+        
+        def result(self):
+            return self.value
+    
+    def submit(self, task, *args):
+        return self.Result(task(*args))
+
+@pytest.fixture
+def immediate_pool(monkeypatch):
+    monkeypatch.setattr(ocr, "_get_ocr_pool", lambda workers: ImmediatePool())
+    monkeypatch.setattr(ocr, "_ocr_band_task", fake_band_ocr)
+
+def test_bands_own_the_image_without_gaps():
+    image = render_lines(8)
+    bands = plan_parallel_bands(image, 4, overlap_lines=1)
+    assert len(bands) == 4
+    assert bands[0][2] == 0 and bands[-1][3] == image.shape[0]
+    for (_, _, _, own_bottom), (_, _, next_own_top, _) in zip(bands, bands[1:]):
+        assert own_bottom == next_own_top
+    for top, bottom, own_top, own_bottom in bands:
+        assert top <= own_top < own_bottom <= bottom
+
+def test_bands_are_cut_between_lines():
+    image = render_lines(8)
+    lines = find_line_bands(image, padding=0)
+    for band in plan_parallel_bands(image, 3, overlap_lines=1):
+        for cut in band:
+            assert not any(top < cut < bottom for top, bottom in lines)
+
+def test_bands_overlap_by_whole_lines():
+    image = render_lines(8)
+    lines = find_line_bands(image, padding=0)
+    first, second = plan_parallel_bands(image, 2, overlap_lines=1)
+    # Each band reaches one line into its neighbour's range
+    assert [line for line in lines if first[3] <= line[0] and line[1] <= first[1]] == [lines[4]]
+    assert [line for line in lines if second[0] <= line[0] and line[1] <= second[2]] == [lines[3]]
+
+def test_band_count_is_limited_by_lines():
+    image = render_lines(3)
+    assert len(plan_parallel_bands(image, 8)) == 3
+    assert plan_parallel_bands(render_lines(1), 4) == [(0, render_lines(1).shape[0], 0, render_lines(1).shape[0])]
+    assert plan_parallel_bands(image, 1) == [(0, image.shape[0], 0, image.shape[0])]
+
+@pytest.mark.parametrize("workers", [2, 3, 5])
+def test_merge_keeps_each_line_once(immediate_pool, workers):
+    image = render_lines(10)
+    expected = "\n".join(f"line{number}" for number in range(10))
+    assert recognize_parallel(image, {"parallel_overlap_lines": 1}, workers=workers) == expected
+
+def test_merged_boxes_use_image_coordinates(immediate_pool):
+    image = render_lines(6)
+    boxes = recognize_parallel(image, {"parallel_overlap_lines": 2}, structured=True, workers=3)
+    assert list(boxes["text"]) == [f"line{number}" for number in range(6)]
+    assert list(boxes["y"]) == [top for top, _ in find_line_bands(image, padding=0)]
+
+def test_single_band_is_recognized_directly(immediate_pool):
+    image = render_lines(4)
+    assert recognize_parallel(image, {}, workers=1) == "\n".join(f"line{number}" for number in range(4))
@@ -0,0 +1,51 @@
+"""Tests for the frame alignment and stitching of scrolling response capture."""
+
+import numpy as np
+import pytest
+from src.automation import response_capture
+from src.automation.response_capture import ScrollCapture, find_scroll_offset
+
+FRAME_HEIGHT = 120
+
+@pytest.fixture
+def page():
+    """A tall page whose rows are distinguishable from each other."""
+    rng = np.random.default_rng(7)
+    return rng.integers(0, 256, size=(600, 80), dtype=np.uint8)
+
+@pytest.mark.parametrize("offset", [1, 17, 60, FRAME_HEIGHT - 20])
+def test_offset_of_scrolled_frame(page, offset):
+    previous = page[100:100 + FRAME_HEIGHT]
+    current = page[100 + offset:100 + offset + FRAME_HEIGHT]
+    assert find_scroll_offset(previous, current) == offset
+
+def test_unchanged_frame_has_no_offset(page):
+    frame = page[:FRAME_HEIGHT]
+    assert find_scroll_offset(frame, frame.copy()) == 0
+
+def test_unrelated_frames_have_no_offset(page):
+    assert find_scroll_offset(page[:FRAME_HEIGHT], page[300:300 + FRAME_HEIGHT]) is None
+
+def test_overlap_below_minimum_is_not_matched(page):
+    previous = page[:FRAME_HEIGHT]
+    current = page[FRAME_HEIGHT - 10:2 * FRAME_HEIGHT - 10]
+    assert find_scroll_offset(previous, current, min_overlap=20) is None
+
+def test_capture_stitches_the_whole_page(monkeypatch, page):
+    step = 45
+    position = {"top": 0}
+    
+    def grab(region):
+        return page[position["top"]:position["top"] + FRAME_HEIGHT].copy()
+    
+    def scroll(clicks, target=None):
+        position["top"] = min(position["top"] + step, page.shape[0] - FRAME_HEIGHT)
+        return True
+    
+    monkeypatch.setattr(response_capture, "grab_gray", grab)
+    monkeypatch.setattr(response_capture, "scroll", scroll)
+    capture = ScrollCapture((0, 0, 80, FRAME_HEIGHT), {"response_capture": {"settle_time": 0}})
+    monkeypatch.setattr(capture, "_ocr_complete_lines", lambda final: None)
+    
+    capture.capture()
+    assert np.array_equal(capture.stitched, page)
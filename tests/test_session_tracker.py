@@ -0,0 +1,66 @@
+"""Tests for the prompt checkpoints of SessionTracker."""
+
+import json
+import pytest
+from src.utils.session_tracker import SessionTracker
+
+PROMPTS = ["first", "second", "third", "fourth"]
+
+@pytest.fixture
+def tracker(tmp_path):
+    return SessionTracker(str(tmp_path / "session_status.json"))
+
+def test_contiguous_prompts_advance_the_resume_point(tracker):
+    assert tracker.get_resume_index("s1", PROMPTS) == 0
+    assert tracker.record_prompt_sent("s1", 0, PROMPTS)
+    assert tracker.record_prompt_sent("s1", 1, PROMPTS)
+    assert tracker.get_resume_index("s1", PROMPTS) == 2
+
+def test_prompt_after_a_gap_does_not_move_the_resume_point(tracker):
+    tracker.record_prompt_sent("s1", 0, PROMPTS)
+    assert not tracker.record_prompt_sent("s1", 2, PROMPTS)
+    assert tracker.get_resume_index("s1", PROMPTS) == 1
+    # Filling the gap only covers the gap; the earlier out-of-order prompt is sent again
+    assert tracker.record_prompt_sent("s1", 1, PROMPTS)
+    assert tracker.get_resume_index("s1", PROMPTS) == 2
+
+def test_repeated_prompt_is_covered_once(tracker):
+    tracker.record_prompt_sent("s1", 0, PROMPTS)
+    assert tracker.record_prompt_sent("s1", 0, PROMPTS)
+    assert tracker.get_resume_index("s1", PROMPTS) == 1
+
+def test_changed_prompts_start_over(tracker):
+    tracker.record_prompt_sent("s1", 0, PROMPTS)
+    tracker.record_prompt_sent("s1", 1, PROMPTS)
+    changed = PROMPTS[:2] + ["other"]
+    assert tracker.get_resume_index("s1", changed) == 0
+    assert not tracker.record_prompt_sent("s1", 2, changed)
+    assert tracker.record_prompt_sent("s1", 0, changed)
+    assert tracker.get_resume_index("s1", changed) == 1
+
+def test_checkpoint_stays_the_same_size(tracker):
+    for index in range(len(PROMPTS)):
+        tracker.record_prompt_sent("s1", index, PROMPTS)
+    with open(tracker.tracker_file) as f:
+        checkpoint = json.load(f)["s1"]["prompt_checkpoint"]
+    assert set(checkpoint) == {"prompts_hash", "prompts_sent", "prompt_count", "updated"}
+    assert checkpoint["prompts_sent"] == len(PROMPTS)
+
+def test_checkpoint_is_shared_through_the_file(tracker):
+    tracker.record_prompt_sent("s1", 0, PROMPTS)
+    other = SessionTracker(tracker.tracker_file)
+    assert other.record_prompt_sent("s1", 1, PROMPTS)
+    assert tracker.get_resume_index("s1", PROMPTS) == 2
+
+def test_completion_and_clearing_forget_the_checkpoint(tracker):
+    tracker.record_prompt_sent("s1", 0, PROMPTS)
+    tracker.record_prompt_sent("s2", 0, PROMPTS)
+    assert tracker.clear_prompt_checkpoint("s1")
+    assert tracker.get_resume_index("s1", PROMPTS) == 0
+    tracker.mark_completed("s2", True)
+    assert tracker.get_resume_index("s2", PROMPTS) == 0
+
+def test_failed_session_keeps_its_checkpoint(tracker):
+    tracker.record_prompt_sent("s1", 0, PROMPTS)
+    tracker.mark_completed("s1", False)
+    assert tracker.get_resume_index("s1", PROMPTS) == 1
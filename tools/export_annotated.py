@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Export screenshots for Claude GUI Automation.
+Renders the annotations recorded in a run manifest onto the stored frames
+and writes them as individual PNG files, or exports the raw frames from the
+run's frame container with --raw.
+"""
+
+import os
+import sys
+import logging
+import argparse
+import cv2
+
+# Add project root to path
+sys.path.append('.')
+
+from src.utils.annotations import render_frame
+from src.utils.frame_store import load_frame
+from src.utils.run_context import read_manifest
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def select_entries(entries, element=None, stage=None, category=None, frame_ids=None):
+    """
+    Filter manifest entries.
+    
+    Args:
+        entries: Manifest entries
+        element: Only keep entries of this UI element
+        stage: Only keep entries whose stage contains this text
+        category: Only keep entries of this category ("stage" or "click_debug")
+        frame_ids: Only keep entries with these frame ids
+    
+    Returns:
+        List of matching entries
+    """
+    selected = []
+    for entry in entries:
+        if element and entry.get("element") != element:
+            continue
+        if stage and stage not in (entry.get("stage") or ""):
+            continue
+        if category and entry.get("category") != category:
+            continue
+        if frame_ids and entry.get("frame_id") not in frame_ids:
+            continue
+        selected.append(entry)
+    return selected
+
+def export_run(run_dir, output_dir, raw=False, **filters):
+    """
+    Render and write the annotated frames of a run.
+    
+    Args:
+        run_dir: Run directory
+        output_dir: Directory to write the PNG files to
+        raw: Write the frames without annotations
+        **filters: Filters passed to select_entries
+    
+    Returns:
+        Number of frames written
+    """
+    entries = select_entries(read_manifest(run_dir), **filters)
+    if not entries:
+        logging.warning(f"No matching frames in {run_dir}")
+        return 0
+    
+    os.makedirs(output_dir, exist_ok=True)
+    written = 0
+    for entry in entries:
+        img = load_frame(run_dir, entry) if raw else render_frame(run_dir, entry)
+        if img is None:
+            logging.warning(f"Frame {entry.get('frame_id')} is not available")
+            continue
+        
+        stage = entry.get("stage") or "unnamed"
+        suffix = "screenshot" if raw else "annotated"
+        path = os.path.join(output_dir, f"{entry.get('frame_id', 0):05d}_{stage}_{suffix}.png")
+        cv2.imwrite(path, img)
+        written += 1
+    
+    logging.info(f"Exported {written} {'raw' if raw else 'annotated'} frames to {output_dir}")
+    return written
+
+def main():
+    """Main function to export annotated frames."""
+    parser = argparse.ArgumentParser(description="Render annotated screenshots of a run")
+    parser.add_argument("run", help="Run directory (e.g. logs/run_20250101_120000)")
+    parser.add_argument("--output", help="Output directory (default: <run>/annotated or <run>/export)", default=None)
+    parser.add_argument("--raw", action="store_true", help="Export the frames without annotations")
+    parser.add_argument("--element", help="Only export frames of this UI element", default=None)
+    parser.add_argument("--stage", help="Only export frames whose stage contains this text", default=None)
+    parser.add_argument("--category", choices=["stage", "click_debug"], default=None,
+                        help="Only export frames of this category")
+    parser.add_argument("--frames", type=int, nargs="+", default=None, help="Only export these frame ids")
+    args = parser.parse_args()
+    
+    output_dir = args.output or os.path.join(args.run, "export" if args.raw else "annotated")
+    written = export_run(args.run, output_dir, raw=args.raw, element=args.element, stage=args.stage,
+                         category=args.category, frame_ids=args.frames)
+    return 0 if written else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
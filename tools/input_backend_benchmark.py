@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Input backend benchmark for Claude GUI Automation.
+Measures events per second (single calls and batches) and click-to-screen
+latency of each input backend against a small target window, optionally on
+a private Xvfb display.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+import subprocess
+
+# Add project root to path
+sys.path.append('.')
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+# Window that flips between black and white on every click or key press
+TARGET_SCRIPT = """
+import sys, tkinter
+x, y, size = (int(v) for v in sys.argv[1:4])
+root = tkinter.Tk()
+root.overrideredirect(True)
+root.geometry(f"{size}x{size}+{x}+{y}")
+canvas = tkinter.Canvas(root, width=size, height=size, bg="black", highlightthickness=0)
+canvas.pack()
+def flip(event=None):
+    canvas.configure(bg="white" if canvas.cget("bg") == "black" else "black")
+canvas.bind("<Button>", flip)
+root.bind("<Key>", flip)
+root.focus_force()
+root.mainloop()
+"""
+
+def start_target(x=100, y=100, size=200):
+    """Start the target window and wait until it is shown."""
+    from src.automation.input_ack import grab
+    process = subprocess.Popen([sys.executable, "-c", TARGET_SCRIPT, str(x), str(y), str(size)])
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if grab((x, y, size, size)).mean() < 10:
+            return process
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Target window did not appear")
+
+def events_per_second(backend, count):
+    """
+    Measure mouse move throughput of a backend.
+    
+    Returns:
+        Tuple of (events/s sent one call each, events/s sent as one batch)
+    """
+    points = [(300 + (i % 2) * 50, 400) for i in range(count)]
+    
+    start_time = time.perf_counter()
+    for x, y in points:
+        backend.move(x, y)
+    single = count / (time.perf_counter() - start_time)
+    
+    start_time = time.perf_counter()
+    with backend.batch():
+        for x, y in points:
+            backend.move(x, y)
+    batched = count / (time.perf_counter() - start_time)
+    return single, batched
+
+def input_latency(backend, target, samples, action="click"):
+    """
+    Measure the time from sending an event to the target window changing.
+    
+    Args:
+        backend: InputBackend to measure
+        target: Target window region (x, y, size, size)
+        samples: Number of measurements
+        action: "click" or "key"
+    
+    Returns:
+        List of latencies in seconds (missing responses are left out)
+    """
+    from src.automation.input_ack import InputAck
+    x, y, size, _ = target
+    latencies = []
+    for _ in range(samples):
+        watcher = InputAck(target, min_changed=0.5)
+        watcher.mark()
+        if action == "click":
+            backend.click(x + size // 2, y + size // 2)
+        else:
+            backend.key("a")
+        ack = watcher.wait(timeout=1.0, poll_interval=0.001)
+        if ack:
+            latencies.append(ack.latency)
+        time.sleep(0.05)
+    return latencies
+
+def report_latency(name, action, latencies, samples):
+    """Print latency statistics of one backend and action."""
+    if len(latencies) < 2:
+        print(f"{name:<10} {action:<6} {'no response':>33}")
+        return
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(f"{name:<10} {action:<6} {statistics.median(latencies) * 1000:>9.1f} {p95 * 1000:>9.1f} "
+          f"{len(latencies):>6}/{samples}")
+
+def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark input backend throughput and latency")
+    parser.add_argument("--backends", nargs="+", default=["pyautogui", "xdotool", "xtest"],
+                        help="Backends to measure")
+    parser.add_argument("--events", type=int, default=500, help="Mouse moves per throughput measurement")
+    parser.add_argument("--samples", type=int, default=50, help="Latency measurements per backend and action")
+    parser.add_argument("--xvfb", action="store_true", help="Run on a private Xvfb display")
+    parser.add_argument("--display", type=int, default=99, help="Display number for --xvfb")
+    args = parser.parse_args()
+    
+    xvfb = None
+    if args.xvfb:
+        from src.utils.virtual_display import VirtualDisplay
+        xvfb = VirtualDisplay(args.display, 1280, 800).start()
+        os.environ["DISPLAY"] = xvfb.name
+    target_process = None
+    try:
+        # pyautogui connects to the display on import, so import after Xvfb is up
+        import pyautogui
+        from src.automation.input_backend import BACKENDS
+        pyautogui.PAUSE = 0
+        
+        target = (100, 100, 200, 200)
+        target_process = start_target(*target[:3])
+        
+        throughput = {}
+        latency = {}
+        for name in args.backends:
+            try:
+                backend = BACKENDS[name]()
+            except Exception as e:
+                logging.warning(f"Skipping {name}: {e}")
+                continue
+            throughput[name] = events_per_second(backend, args.events)
+            latency[name] = {action: input_latency(backend, target, args.samples, action)
+                             for action in ("click", "key")}
+        
+        print("\n=== EVENTS PER SECOND (mouse moves) ===")
+        print(f"{'Backend':<10} {'Single':>10} {'Batched':>10}")
+        for name, (single, batched) in throughput.items():
+            print(f"{name:<10} {single:>10.0f} {batched:>10.0f}")
+        
+        print("\n=== INPUT-TO-SCREEN LATENCY ===")
+        print(f"{'Backend':<10} {'Action':<6} {'Median ms':>9} {'P95 ms':>9} {'Acked':>13}")
+        for name, actions in latency.items():
+            for action, values in actions.items():
+                report_latency(name, action, values, args.samples)
+        return 0
+    finally:
+        if target_process is not None:
+            target_process.terminate()
+        if xvfb is not None:
+            xvfb.stop()
+
+if __name__ == "__main__":
+    sys.exit(main())
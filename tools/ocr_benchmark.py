@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+OCR benchmark script for Claude GUI Automation.
+Measures per-call OCR latency on locally rendered text images.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+from PIL import Image, ImageDraw, ImageFont
+
+# Add project root to path
+sys.path.append('.')
+
+from src.automation import ocr
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+SAMPLE_LINES = [
+    "Using the Resume Point Evaluation Framework, please analyze this point.",
+    "Identify the 3 most critical success factors for candidates.",
+    "Provide before/after examples showing the exact language changes.",
+    "Delivered comprehensive AI risk analysis to the Board of Directors.",
+    "Rating: 4/5 - strong quantified impact, clear ownership and scope.",
+    "def reverse_string(s): return s[::-1]  # 100% test coverage",
+]
+
+def render_text_image(lines, width=900, line_height=28, font_size=18, margin=12,
+                      background=(255, 255, 255), foreground=(30, 30, 30)):
+    """
+    Render lines of text the way a browser shows them.
+    
+    Args:
+        lines: List of text lines
+        width: Image width in pixels
+        line_height: Height of each line in pixels
+        font_size: Font size in points (if a TrueType font is available)
+        margin: Margin around the text in pixels
+        background: Background RGB colour
+        foreground: Text RGB colour
+    
+    Returns:
+        PIL Image in RGB mode
+    """
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", font_size)
+    except OSError:
+        font = ImageFont.load_default()
+    
+    height = margin * 2 + line_height * len(lines)
+    image = Image.new("RGB", (width, height), background)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((margin, margin + i * line_height), line, fill=foreground, font=font)
+    return image
+
+def build_corpus(lines_per_image=8):
+    """
+    Build a labelled corpus of rendered text images.
+    
+    Covers the light and dark themes, a small font, and degraded captures
+    (sensor-like noise and heavy JPEG compression).
+    
+    Returns:
+        List of (name, PIL Image, expected text) tuples
+    """
+    import cv2
+    import numpy as np
+    
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(lines_per_image)]
+    truth = "\n".join(lines)
+    
+    light = render_text_image(lines)
+    corpus = [
+        ("light", light, truth),
+        ("dark", render_text_image(lines, background=(33, 33, 33), foreground=(230, 230, 230)), truth),
+        ("small", render_text_image(lines, line_height=18, font_size=12), truth),
+    ]
+    
+    rng = np.random.default_rng(0)
+    noisy = np.array(light).astype(np.float32) + rng.normal(0, 12, (light.height, light.width, 1))
+    corpus.append(("noisy", Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)), truth))
+    
+    _, encoded = cv2.imencode(".jpg", np.array(light), [cv2.IMWRITE_JPEG_QUALITY, 30])
+    corpus.append(("jpeg", Image.fromarray(cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED)), truth))
+    
+    return corpus
+
+def character_accuracy(expected, actual):
+    """
+    Character accuracy as 1 - (edit distance / expected length), ignoring whitespace runs.
+    
+    Returns:
+        Accuracy between 0.0 and 1.0
+    """
+    expected = " ".join(expected.split())
+    actual = " ".join(actual.split())
+    if not expected:
+        return 1.0 if not actual else 0.0
+    
+    previous = list(range(len(actual) + 1))
+    for i, expected_char in enumerate(expected, 1):
+        current = [i]
+        for j, actual_char in enumerate(actual, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (expected_char != actual_char)
+            ))
+        previous = current
+    
+    return max(0.0, 1.0 - previous[-1] / len(expected))
+
+def benchmark_profiles(ocr_config, iterations, corpus_dir=None):
+    """Measure latency and character accuracy of each preprocessing profile on the corpus."""
+    corpus = build_corpus()
+    engine = ocr.get_ocr_engine(ocr_config)
+    tesseract_config = ocr_config.get("config", "--psm 6")
+    
+    if corpus_dir:
+        os.makedirs(corpus_dir, exist_ok=True)
+        for name, image, truth in corpus:
+            image.save(os.path.join(corpus_dir, f"{name}.png"))
+            with open(os.path.join(corpus_dir, f"{name}.txt"), 'w') as f:
+                f.write(truth)
+        logging.info(f"Saved corpus of {len(corpus)} images to {corpus_dir}")
+    
+    for profile in ocr.PREPROCESS_PROFILES:
+        preprocess_ms, ocr_ms, accuracies = [], [], []
+        for name, image, truth in corpus:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                processed = ocr.preprocess_image(image, profile=profile)
+                middle = time.perf_counter()
+                text = engine.image_to_string(processed, tesseract_config)
+                end = time.perf_counter()
+                preprocess_ms.append((middle - start) * 1000)
+                ocr_ms.append((end - middle) * 1000)
+            accuracies.append(character_accuracy(truth, text))
+            logging.debug(f"{profile}/{name}: accuracy {accuracies[-1]:.1%}")
+        
+        logging.info(f"{profile:<8} preprocess {statistics.mean(preprocess_ms):7.1f} ms   "
+                     f"ocr {statistics.mean(ocr_ms):7.1f} ms   "
+                     f"accuracy {statistics.mean(accuracies):6.1%} (worst {min(accuracies):6.1%})")
+
+def time_calls(func, iterations):
+    """
+    Time repeated calls to a function.
+    
+    Returns:
+        List of per-call durations in milliseconds
+    """
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+def report(name, durations):
+    """Log summary statistics for a list of durations."""
+    logging.info(f"{name:<24} mean {statistics.mean(durations):8.1f} ms   "
+                 f"median {statistics.median(durations):8.1f} ms   "
+                 f"min {min(durations):8.1f} ms")
+
+def benchmark_engine(image, ocr_config, iterations):
+    """Compare the per-call engine construction path against the shared engine."""
+    import pytesseract
+    
+    processed = ocr.preprocess_image(image)
+    tesseract_config = ocr_config.get("config", "--psm 6")
+    
+    def legacy_call():
+        ocr.OCREngine(dict(ocr_config, in_process=False))
+        pytesseract.image_to_string(processed, config=tesseract_config)
+    
+    engine = ocr.get_ocr_engine(ocr_config)
+    
+    def shared_call():
+        engine.image_to_string(processed, tesseract_config)
+    
+    # Warm up both paths so model loading is not counted
+    legacy_call()
+    shared_call()
+    
+    report("per-call engine", time_calls(legacy_call, iterations))
+    report(f"shared engine ({engine.backend})", time_calls(shared_call, iterations))
+
+def benchmark_parallel(image, ocr_config, iterations, worker_counts):
+    """Compare serial OCR of a whole image against banded OCR on a process pool."""
+    def serial_call():
+        ocr._ocr_band_task(image, ocr_config, False)
+    
+    serial = time_calls(serial_call, iterations)
+    report("serial", serial)
+    
+    for workers in worker_counts:
+        def parallel_call():
+            ocr.recognize_parallel(image, ocr_config, workers=workers)
+        
+        # Warm up so pool start-up is not counted
+        parallel_call()
+        durations = time_calls(parallel_call, iterations)
+        report(f"parallel ({workers} workers)", durations)
+        logging.info(f"{'':<24} speedup {statistics.mean(serial) / statistics.mean(durations):.2f}x")
+    
+    ocr.shutdown_ocr_pool()
+
+def main():
+    """Main function to run the OCR benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark OCR latency")
+    parser.add_argument("--iterations", type=int, default=20, help="Number of calls per measurement")
+    parser.add_argument("--lines", type=int, default=12, help="Number of text lines in the test image")
+    parser.add_argument("--tesseract-cmd", help="Path to the tesseract executable", default=None)
+    parser.add_argument("--parallel", action="store_true", help="Measure parallel band OCR speedup")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8],
+                        help="Worker counts to measure with --parallel")
+    parser.add_argument("--profiles", action="store_true",
+                        help="Measure latency and accuracy of each preprocessing profile")
+    parser.add_argument("--save-corpus", metavar="DIR", default=None,
+                        help="Also write the labelled profile corpus to DIR")
+    args = parser.parse_args()
+    
+    # Disable the result cache so every call really runs OCR
+    ocr_config = {"config": "--psm 6", "cache": {"enabled": False}}
+    if args.tesseract_cmd:
+        ocr_config["tesseract_cmd"] = args.tesseract_cmd
+    
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(args.lines)]
+    image = render_text_image(lines)
+    logging.info(f"Benchmarking OCR on a {image.width}x{image.height} image with {len(lines)} lines")
+    
+    benchmark_engine(image, ocr_config, args.iterations)
+    
+    if args.parallel:
+        logging.info(f"Measuring parallel OCR on {os.cpu_count()} cores")
+        benchmark_parallel(image, ocr_config, args.iterations, args.workers)
+    
+    if args.profiles:
+        logging.info("Measuring preprocessing profiles on the rendered corpus")
+        benchmark_profiles(ocr_config, max(1, args.iterations // 5), args.save_corpus)
+
+if __name__ == "__main__":
+    main()
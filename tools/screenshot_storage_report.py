@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Screenshot storage report for Claude GUI Automation.
+Summarizes how much disk space and write time the screenshot store used for
+recorded runs, replays their frames through each storage mode to compare, and
+measures encoding throughput and size of each encoding policy.
+"""
+
+import os
+import sys
+import glob
+import shutil
+import tempfile
+import time
+import logging
+import argparse
+import yaml
+import numpy as np
+import cv2
+
+# Add project root to path
+sys.path.append('.')
+
+from src.utils.frame_store import FrameStore, EncodingPolicy, load_frame, get_container_reader
+from src.utils.run_context import RunContext, read_manifest
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def file_size(run_dir, relative):
+    """Get the size of a run file in bytes (0 if missing)."""
+    path = os.path.join(run_dir, relative)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+def summarize_run(run_dir):
+    """
+    Summarize the screenshot storage of a recorded run from its manifest.
+    
+    Args:
+        run_dir: Run directory
+    
+    Returns:
+        Dictionary of statistics, or None if the run has no manifest
+    """
+    entries = read_manifest(run_dir)
+    if not entries:
+        return None
+    
+    stored_files = set()
+    stored_records = set()
+    naive_bytes = 0
+    write_ms = 0.0
+    duplicates = deltas = 0
+    
+    for entry in entries:
+        if entry.get("duplicate_of") is not None:
+            duplicates += 1
+        elif entry.get("delta_file") or entry.get("delta_record") is not None:
+            deltas += 1
+        write_ms += entry.get("write_ms") or 0.0
+        
+        # Without deduplication or deltas every frame would be a full image
+        full_file = entry.get("file") or entry.get("keyframe")
+        full_record = entry.get("record")
+        if full_record is None:
+            full_record = entry.get("keyframe_record")
+        if full_file:
+            naive_bytes += file_size(run_dir, full_file)
+        elif full_record is not None:
+            naive_bytes += get_container_reader(run_dir).length(full_record)
+        
+        for key in ("file", "delta_file", "keyframe"):
+            if entry.get(key):
+                stored_files.add(entry[key])
+        for key in ("record", "delta_record", "keyframe_record"):
+            if entry.get(key) is not None:
+                stored_records.add(entry[key])
+    
+    stored_bytes = sum(file_size(run_dir, relative) for relative in stored_files)
+    if stored_records:
+        reader = get_container_reader(run_dir)
+        stored_bytes += sum(reader.length(record) for record in stored_records)
+    return {
+        "frames": len(entries),
+        "duplicates": duplicates,
+        "deltas": deltas,
+        "stored_bytes": stored_bytes,
+        "naive_bytes": naive_bytes,
+        "write_ms": write_ms
+    }
+
+ENCODING_PRESETS = {
+    "png/0": {"format": "png", "compression": 0},
+    "png/1": {"format": "png", "compression": 1},
+    "png/3": {"format": "png", "compression": 3},
+    "png/6": {"format": "png", "compression": 6},
+    "webp/q80": {"format": "webp", "quality": 80},
+    "jpeg/q85": {"format": "jpeg", "quality": 85},
+    "webp/q80@0.5": {"format": "webp", "quality": 80, "scale": 0.5},
+    "png/1@0.5": {"format": "png", "compression": 1, "scale": 0.5}
+}
+
+def load_run_frames(run_dirs):
+    """Load every logged frame of the given runs, including deduplicated ones."""
+    frames = []
+    for run_dir in run_dirs:
+        for entry in read_manifest(run_dir):
+            frame = load_frame(run_dir, entry)
+            if frame is not None:
+                frames.append(frame)
+    return frames
+
+def synthetic_frames(count=20, width=1920, height=1080):
+    """
+    Render screen-like frames (text on a light background) for benchmarks
+    when no recorded run is available.
+    """
+    frames = []
+    for i in range(count):
+        frame = np.full((height, width, 3), 245, dtype=np.uint8)
+        cv2.rectangle(frame, (0, 0), (280, height), (230, 226, 220), -1)
+        for line in range(i % 5 + 20):
+            y = 80 + line * 36
+            cv2.putText(frame, f"Line {line} of response {i}: the quick brown fox jumps over the lazy dog",
+                        (320, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (40, 40, 40), 1, cv2.LINE_AA)
+        frames.append(frame)
+    return frames
+
+def benchmark_encoding(frames, policies):
+    """
+    Measure encoding throughput and size of each encoding policy.
+    
+    Args:
+        frames: BGR frames to encode
+        policies: Dictionary mapping names to policy configuration dictionaries
+    
+    Returns:
+        Dictionary mapping policy names to (frames per second, mean bytes per frame)
+    """
+    results = {}
+    for name, settings in policies.items():
+        policy = EncodingPolicy.from_config(settings)
+        total_bytes = 0
+        start_time = time.perf_counter()
+        for frame in frames:
+            data, _ = policy.encode(frame)
+            total_bytes += len(data)
+        elapsed = time.perf_counter() - start_time
+        results[name] = (len(frames) / elapsed if elapsed else 0.0, total_bytes / len(frames))
+    return results
+
+def configured_policies(config_path):
+    """Read the screenshot encoding policies from a configuration file."""
+    try:
+        with open(config_path) as f:
+            config = yaml.safe_load(f) or {}
+    except Exception as e:
+        logging.warning(f"Could not read {config_path}: {e}")
+        return {}
+    encoding = (config.get("screenshot_logging") or {}).get("encoding") or {}
+    return {f"config:{category}": policy for category, policy in encoding.items()}
+
+def report_encoding(frames, policies):
+    """Print encoding throughput and disk footprint per policy."""
+    results = benchmark_encoding(frames, policies)
+    height, width = frames[0].shape[:2]
+    print(f"\n=== ENCODING POLICIES ({len(frames)} frames, {width}x{height}) ===")
+    print(f"{'Policy':<22} {'Frames/s':>9} {'KB/frame':>9}")
+    for name, (fps, mean_bytes) in results.items():
+        print(f"{name:<22} {fps:>9.1f} {mean_bytes / 1e3:>9.1f}")
+
+def replay_runs(run_dirs, modes):
+    """
+    Store the frames of recorded runs again under each storage mode.
+    
+    Args:
+        run_dirs: Run directories to replay (frames are concatenated in order)
+        modes: Mode names ("off", "exact", "signature", "delta")
+    
+    Returns:
+        Dictionary mapping mode names to FrameStore statistics
+    """
+    frames = load_run_frames(run_dirs)
+    if not frames:
+        return {}
+    
+    logging.info(f"Replaying {len(frames)} frames from {len(run_dirs)} runs")
+    results = {}
+    for mode in modes:
+        temp_dir = tempfile.mkdtemp(prefix="frame_store_")
+        try:
+            context = RunContext(temp_dir)
+            if mode == "delta":
+                store = FrameStore(context, dedupe="exact", delta=True)
+            else:
+                store = FrameStore(context, dedupe=mode)
+            
+            start_time = time.perf_counter()
+            for i, frame in enumerate(frames):
+                store.save(context.screenshot_dir, f"frame_{i:05d}", pixels=frame, frame_id=i)
+            stats = store.stats()
+            stats["total_time"] = time.perf_counter() - start_time
+            results[mode] = stats
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    return results
+
+def report(run_dirs, replay=False, modes=None):
+    """Print storage statistics for the given runs."""
+    print("\n=== SCREENSHOT STORAGE ===")
+    print(f"{'Run':<32} {'Frames':>7} {'Dupes':>7} {'Deltas':>7} {'Stored MB':>10} {'Naive MB':>10} {'Write s':>8}")
+    for run_dir in run_dirs:
+        summary = summarize_run(run_dir)
+        if summary is None:
+            continue
+        print(f"{os.path.basename(run_dir):<32} {summary['frames']:>7} {summary['duplicates']:>7} "
+              f"{summary['deltas']:>7} {summary['stored_bytes'] / 1e6:>10.2f} "
+              f"{summary['naive_bytes'] / 1e6:>10.2f} {summary['write_ms'] / 1000:>8.2f}")
+    
+    if not replay:
+        return
+    
+    results = replay_runs(run_dirs, modes or ["off", "exact", "signature", "delta"])
+    if not results:
+        print("No frames found to replay")
+        return
+    
+    baseline = results.get("off")
+    print("\n=== REPLAY BY STORAGE MODE ===")
+    print(f"{'Mode':<10} {'Frames':>7} {'Dupes':>7} {'Deltas':>7} {'MB':>8} {'Write s':>8} {'Size':>7} {'Time':>7}")
+    for mode, stats in results.items():
+        size_ratio = stats["bytes_written"] / baseline["bytes_written"] if baseline and baseline["bytes_written"] else 0
+        time_ratio = stats["total_time"] / baseline["total_time"] if baseline and baseline["total_time"] else 0
+        print(f"{mode:<10} {stats['frames']:>7} {stats['duplicates']:>7} {stats['deltas']:>7} "
+              f"{stats['bytes_written'] / 1e6:>8.2f} {stats['total_time']:>8.2f} "
+              f"{size_ratio:>6.0%} {time_ratio:>6.0%}")
+
+def main():
+    """Main function to run the storage report."""
+    parser = argparse.ArgumentParser(description="Report screenshot storage usage of recorded runs")
+    parser.add_argument("runs", nargs="*", help="Run directories (default: all logs/run_*)")
+    parser.add_argument("--replay", action="store_true",
+                        help="Store the recorded frames again under each storage mode and compare")
+    parser.add_argument("--modes", nargs="+", default=["off", "exact", "signature", "delta"],
+                        help="Storage modes to compare with --replay")
+    parser.add_argument("--encoding", action="store_true",
+                        help="Measure encoding throughput and size of each encoding policy")
+    parser.add_argument("--config", default="config/default_config.yaml",
+                        help="Configuration whose screenshot encoding policies are measured too")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="Use N rendered screen-like frames instead of recorded runs for --encoding")
+    args = parser.parse_args()
+    
+    run_dirs = args.runs or sorted(glob.glob("logs/run_*"))
+    
+    if args.encoding:
+        frames = synthetic_frames(args.synthetic) if args.synthetic else load_run_frames(run_dirs)
+        if not frames:
+            logging.error("No frames to encode (record a run or use --synthetic N)")
+            return 1
+        policies = dict(ENCODING_PRESETS)
+        policies.update(configured_policies(args.config))
+        report_encoding(frames, policies)
+        if args.synthetic:
+            return 0
+    
+    if not run_dirs:
+        logging.error("No run directories found")
+        return 1
+    
+    report(run_dirs, args.replay, args.modes)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,9 @@ try:
     from src.utils.region_manager import RegionManager
     from src.models.ui_element import UIElement
     from src.automation.recognition import find_element
+    from src.utils.run_context import read_manifest
+    from src.utils.annotations import render_frame
+    from src.utils.frame_store import load_frame
 except ImportError as e:
     print(f"Error importing project modules: {e}")
     print("Make sure you're running from the project root directory.")
@@ -72,6 +75,7 @@ class UnifiedCalibrationTool:
         self.selection_box = None
         self.capture_mode = False
         self.debug_images = {}  # Dictionary to store debug images by element
+        self.manifest_frames = {}  # Frame references from run manifests -> (run_dir, entry)
         
         # Set up the UI
         self.setup_ui()
@@ -227,9 +231,27 @@ class UnifiedCalibrationTool:
         
         for run_dir in run_dirs:
             run_name = os.path.basename(run_dir)
+            
+            # Runs with a manifest list their screenshots and elements directly
+            entries = read_manifest(run_dir)
+            if entries:
+                log_screenshots[run_name] = {"all": [], "elements": {}}
+                for entry in entries:
+                    frame_ref = self.register_manifest_frame(run_dir, entry)
+                    if not frame_ref:
+                        continue
+                    log_screenshots[run_name]["all"].append(frame_ref)
+                    if entry.get("element"):
+                        log_screenshots[run_name]["elements"].setdefault(entry["element"], []).append(frame_ref)
+                continue
+            
             screenshot_dir = os.path.join(run_dir, "screenshots")
             
-            if not os.path.exists(screenshot_dir):
+            # Screenshots are either written directly or dumped by the flight recorder
+            screenshots = glob.glob(os.path.join(screenshot_dir, "*.png"))
+            screenshots += sorted(glob.glob(os.path.join(run_dir, "flight_*", "*.png")))
+            
+            if not screenshots:
                 continue
                 
             log_screenshots[run_name] = {
@@ -238,7 +260,6 @@ class UnifiedCalibrationTool:
             }
             
             # Scan all screenshots in this run directory
-            screenshots = glob.glob(os.path.join(screenshot_dir, "*.png"))
             log_screenshots[run_name]["all"] = screenshots
             
             # Categorize by UI element
@@ -262,6 +283,44 @@ class UnifiedCalibrationTool:
         
         return log_screenshots
     
+    def register_manifest_frame(self, run_dir, entry):
+        """
+        Register a frame listed in a run manifest.
+        
+        Returns:
+            Reference of the form "<file>#<frame id>" used in place of an image
+            path, or None if the entry has no stored frame. Frames are read
+            from the memory-mapped frame container when they are in one.
+        """
+        stored_file = entry.get("file") or entry.get("delta_file")
+        if not stored_file and entry.get("record") is None and entry.get("delta_record") is None:
+            return None
+        # Frames in the run's frame container are shown by stage name
+        stored_file = stored_file or f"{entry.get('stage') or 'frame'}.frame"
+        frame_ref = f"{os.path.join(run_dir, stored_file)}#{entry.get('frame_id')}"
+        self.manifest_frames[frame_ref] = (run_dir, entry)
+        return frame_ref
+    
+    def open_log_image(self, path, annotated=True):
+        """
+        Open a logged screenshot as a PIL image.
+        
+        Frames from run manifests are loaded from the frame store and their
+        annotations are drawn on demand; other paths are opened directly.
+        
+        Args:
+            path: Image path or manifest frame reference
+            annotated: Whether to draw the recorded annotations
+        """
+        if path not in self.manifest_frames:
+            return Image.open(path)
+        
+        run_dir, entry = self.manifest_frames[path]
+        img = render_frame(run_dir, entry) if annotated else load_frame(run_dir, entry)
+        if img is None:
+            raise FileNotFoundError(f"Frame {entry.get('frame_id')} not found in {run_dir}")
+        return Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    
     def show_log_screenshots(self):
         """Show a dialog with log screenshots organized by run and element."""
         # Scan for log screenshots
@@ -441,7 +500,7 @@ class UnifiedCalibrationTool:
             
             # Load and display image
             try:
-                img = Image.open(screenshot_path)
+                img = self.open_log_image(screenshot_path)
                 
                 # Get canvas dimensions
                 canvas_width = preview_canvas.winfo_width()
@@ -499,9 +558,9 @@ class UnifiedCalibrationTool:
                 self.show_status(f"Path for {filename} not found")
                 return
             
-            # Load the screenshot
+            # Load the screenshot without annotations
             try:
-                self.screenshot = Image.open(screenshot_path)
+                self.screenshot = self.open_log_image(screenshot_path, annotated=False)
                 
                 # Update canvases
                 current_tab = self.notebook.index("current")
@@ -1384,6 +1443,21 @@ class UnifiedCalibrationTool:
         
         # Process each run directory
         for run_dir in run_dirs:
+            # Runs with a manifest list their screenshots and elements directly
+            entries = read_manifest(run_dir)
+            if entries:
+                for entry in entries:
+                    element_name = entry.get("element")
+                    if not element_name:
+                        continue
+                    if element_name not in self.debug_images:
+                        self.debug_images[element_name] = {"recognition": [], "click": []}
+                    kind = "click" if entry.get("category") == "click_debug" else "recognition"
+                    frame_ref = self.register_manifest_frame(run_dir, entry)
+                    if frame_ref:
+                        self.debug_images[element_name][kind].append(frame_ref)
+                continue
+            
             screenshot_dir = os.path.join(run_dir, "screenshots")
             if not os.path.exists(screenshot_dir):
                 continue
@@ -1523,7 +1597,7 @@ class UnifiedCalibrationTool:
         """Display a debug image on the analyze canvas."""
         try:
             # Load the image
-            img = Image.open(image_path)
+            img = self.open_log_image(image_path)
             
             # Get canvas dimensions
             canvas_width = self.analyze_canvas.winfo_width()
@@ -1579,7 +1653,9 @@ class UnifiedCalibrationTool:
             
             # Extract element name
             element_name = None
-            if image_type == "recognition":
+            if image_path in self.manifest_frames:
+                element_name = self.manifest_frames[image_path][1].get("element")
+            elif image_type == "recognition":
                 match = re.match(r"(\w+)_matches_\d+\.png", filename)
                 if match:
                     element_name = match.group(1)
@@ -1630,6 +1706,11 @@ class UnifiedCalibrationTool:
     
     def analyze_recognition_debug(self, image_path):
         """Analyze a recognition debug image to extract match regions."""
+        # Frames from a manifest carry their match boxes as annotations
+        if image_path in self.manifest_frames:
+            annotations = self.manifest_frames[image_path][1].get("annotations", [])
+            return [tuple(a["box"]) for a in annotations if a.get("role") == "match"]
+        
         try:
             # Load the image using OpenCV to detect marked regions
             img = cv2.imread(image_path)
@@ -1683,6 +1764,11 @@ class UnifiedCalibrationTool:
     
     def analyze_click_debug(self, image_path):
         """Analyze a click debug image to extract click locations."""
+        # Frames from a manifest carry their click points as annotations
+        if image_path in self.manifest_frames:
+            annotations = self.manifest_frames[image_path][1].get("annotations", [])
+            return [tuple(a["point"]) for a in annotations if a.get("role") == "click"]
+        
         try:
             # Load the image using OpenCV
             img = cv2.imread(image_path)